@@ -1,15 +1,167 @@
 import copy
 import json
+import logging
 import os
 import re
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Set, Tuple, Union
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple, Union
+
+import numpy as np
+
+from app.codes import AREA_CODE, PACE_TARGETS
+from app.edit_command import parse_edit_command
+from app.geo import balanced_groups, farthest_point_seeds
+from app.json_stream import ArrayItemStreamParser
+from app.llm_cache import get_llm_cache, make_llm_cache_key
+from app.metrics import Counter, Histogram
+from app.model_client import ModelClient
+from app.planner import plan_locally
+from app.prompts import system_prompt
+from app.relevance import get_index, relevance_query
+from app.route import day_budget_km, insertion_costs, optimize_day_routes
+from app.schemas import ModelPlanResponse, PlaceCandidate, ResponseDto, TravelDay, strict_json_schema
+from app.singleflight import SingleFlight
+from app.title_index import SubstringIndex, TitleResolver, get_place_term_index
+from app.tokens import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+# 연결 풀/마감 시간/동시 호출 상한/헤징은 model_client 참고 (OPENAI_DEADLINE_SECONDS, OPENAI_MAX_CONCURRENCY, OPENAI_HEDGE)
+# OPENAI_BASE_URL로 OpenAI 호환 서버(로컬 stubs.fake_openai, 프록시 등)에 붙일 수 있음
+client = ModelClient("openai", api_key=os.getenv("OPENAI_API_KEY", ""), base_url=os.getenv("OPENAI_BASE_URL") or None)
+MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+TEMPERATURE = float(os.getenv("OPENAI_TEMPERATURE", "0.35"))
+# 프롬프트(system + payload) 입력 토큰 상한(추정치). 넘으면 우선순위 낮은 후보부터 제외
+PROMPT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", "6000"))
+# 응답 형식을 JSON schema(strict)로 강제. structured output을 지원하지 않는 모델/프록시면 0으로 끄고 자유 형식 JSON 파싱
+STRUCTURED_OUTPUT = os.getenv("OPENAI_STRUCTURED_OUTPUT", "1") not in ("0", "false", "False", "")
+RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {"name": "travel_plan", "strict": True, "schema": strict_json_schema(ModelPlanResponse)},
+}
+
+# 모델에 보내는 후보 수 상한. travelType/companions 관련도(BM25) 상위부터 채우고 (같은 조건이면 같은 목록이라
+# 프롬프트 캐시 prefix가 유지됨) userInput 관련도는 뒤쪽 추가 후보와 relevantIds로만 전달
+CANDIDATE_LIMIT = int(os.getenv("PLAN_CANDIDATE_LIMIT", "60"))
+RELEVANCE_RANKING = os.getenv("PLAN_RELEVANCE_RANKING", "1") not in ("0", "false", "False", "")
+# 목록 밖에서 userInput에 맞는 장소를 붙이는 자리 수 (CANDIDATE_LIMIT의 1/4까지, 앞 목록에서 그만큼 뺌)
+FOCUS_EXTRA_LIMIT = int(os.getenv("PLAN_FOCUS_EXTRA_LIMIT", "10"))
+FOCUS_IDS_LIMIT = 20
+# 편집 추가 단어가 어떤 제목/주소에도 안 맞으면 자모 편집 거리로 가까운 제목을 고름 (오타/일부만 쓴 이름)
+FUZZY_PLACE_MATCH = os.getenv("PLAN_FUZZY_PLACE_MATCH", "1") not in ("0", "false", "False", "")
+
+# 여러 날 일정은 후보를 날짜별 지리 그룹으로 나눠 하루씩 동시에 생성 (일정이 길어져도 지연이 거의 그대로)
+PARALLEL_DAYS_MIN = int(os.getenv("PLAN_PARALLEL_MIN_DAYS", "3"))  # 이 일수 이상이면 날짜별 생성, 0이면 끔
+# 요청 하나가 동시에 보내는 날짜별 호출 수. 서버 전체 동시 호출 상한은 ModelClient 세마포어(OPENAI_MAX_CONCURRENCY)
+PLAN_DAY_CONCURRENCY = int(os.getenv("PLAN_DAY_CONCURRENCY", "4"))
+LODGING_CONTENT_TYPE_ID = "32"
+# 모델 응답을 기다리는 최대 시간(초). 넘으면 로컬 플래너 일정으로 응답, 0이면 제한 없음.
+# 모델 호출도 같은 시각에 취소됨(ModelClient deadline) -> 포기한 호출이 스레드/동시 호출 자리를 계속 잡지 않음
+PLAN_MODEL_BUDGET_SECONDS = float(os.getenv("PLAN_MODEL_BUDGET_SECONDS", "25"))
+# 단일 호출 일정 생성에서 모델 응답을 기다리는 스레드 수 (호출은 예산 시간에 끝나므로 동시 요청 수만큼이면 충분)
+PLAN_MODEL_MAX_WORKERS = int(os.getenv("PLAN_MODEL_MAX_WORKERS", "16"))
+_model_executor = ThreadPoolExecutor(max_workers=PLAN_MODEL_MAX_WORKERS, thread_name_prefix="plan-model")
+
+# 모델별 호출/파싱 실패/재시도 카운터 (/stats)
+_model_counts: Dict[str, Dict[str, int]] = {}
+_model_counts_lock = threading.Lock()
+
+
+def _count_model(name: str, amount: int = 1) -> None:
+    with _model_counts_lock:
+        counts = _model_counts.setdefault(
+            MODEL,
+            {"calls": 0, "parse_failures": 0, "refusals": 0, "retries": 0, "prompt_tokens": 0, "cached_prompt_tokens": 0},
+        )
+        counts[name] += amount
+
+
+# 모델 호출 지표 (GET /metrics). 라벨은 모드(new/edit/day)/모델/지역/페이스/후보 수 구간
+_CALL_LABELS = ("mode", "model", "region", "pace", "candidates")
+CANDIDATE_COUNT_BUCKETS = (25, 50, 100, 200)
+_model_calls_total = Counter(
+    "plan_model_calls_total", "모델 호출 시도 수 (outcome: ok|parse_failure|refusal|error|timeout)", _CALL_LABELS + ("outcome",)
+)
+_model_retries_total = Counter("plan_model_retries_total", "형식 오류/거절로 다시 보낸 모델 호출 수", _CALL_LABELS)
+_model_latency = Histogram(
+    "plan_model_latency_seconds", "모델 호출 지연(초, 스트림은 마지막 청크까지)", (0.5, 1, 2, 4, 8, 16, 32, 64), _CALL_LABELS
+)
+_model_prompt_tokens = Histogram(
+    "plan_model_prompt_tokens", "모델 입력 토큰 (응답 usage)", (250, 500, 1000, 2000, 3000, 4000, 6000, 8000, 12000), _CALL_LABELS
+)
+_model_cached_prompt_tokens = Histogram(
+    "plan_model_cached_prompt_tokens",
+    "모델 입력 토큰 중 프롬프트 캐시에서 읽은 토큰 (usage.prompt_tokens_details.cached_tokens)",
+    (0, 128, 256, 512, 1024, 2048, 4096, 8192),
+    _CALL_LABELS,
+)
+_model_completion_tokens = Histogram(
+    "plan_model_completion_tokens", "모델 출력 토큰 (응답 usage)", (50, 100, 250, 500, 1000, 2000, 4000), _CALL_LABELS
+)
+_model_payload_bytes = Histogram(
+    "plan_model_payload_bytes", "system + user 메시지 크기(UTF-8 바이트)", (1024, 2048, 4096, 8192, 16384, 32768, 65536), _CALL_LABELS
+)
+
 
-from openai import OpenAI
+def _call_labels(user_payload: Dict[str, Any]) -> Dict[str, str]:
+    """payload에서 지표 라벨을 뽑음. 자유 입력(region/pace)은 알려진 값 외에는 묶어서 카디널리티를 제한."""
+    if "baseSchedule" in user_payload:
+        mode = "edit"
+    elif "dayOfTrip" in user_payload:
+        mode = "day"
+    else:
+        mode = "new"
+    region = str(user_payload.get("region") or "")
+    pace = str(user_payload.get("pace") or "").strip()
+    n = len(user_payload.get("candidates") or [])
+    return {
+        "mode": mode,
+        "model": MODEL,
+        "region": next((name for name in AREA_CODE if name in region), "other"),
+        "pace": pace if pace in PACE_TARGETS else "",
+        "candidates": next((f"<={b}" for b in CANDIDATE_COUNT_BUCKETS if n <= b), f">{CANDIDATE_COUNT_BUCKETS[-1]}"),
+    }
+
+
+def _observe_usage(usage: Any, labels: Dict[str, str]) -> None:
+    if usage is None:
+        return
+    prompt_tokens = getattr(usage, "prompt_tokens", None)
+    completion_tokens = getattr(usage, "completion_tokens", None)
+    if isinstance(prompt_tokens, int):
+        _model_prompt_tokens.observe(prompt_tokens, **labels)
+        # 캐시 적중분은 응답에 있을 때만 (OpenAI 호환 서버/프록시는 안 줄 수 있음)
+        cached_tokens = getattr(getattr(usage, "prompt_tokens_details", None), "cached_tokens", None)
+        _count_model("prompt_tokens", prompt_tokens)
+        if isinstance(cached_tokens, int):
+            _model_cached_prompt_tokens.observe(cached_tokens, **labels)
+            _count_model("cached_prompt_tokens", cached_tokens)
+    if isinstance(completion_tokens, int):
+        _model_completion_tokens.observe(completion_tokens, **labels)
+
+
+def _payload_bytes(kwargs: Dict[str, Any]) -> int:
+    return sum(len(m["content"].encode("utf-8")) for m in kwargs["messages"])
+
+
+def model_stats() -> Dict[str, Dict[str, Any]]:
+    with _model_counts_lock:
+        out = {model: dict(counts) for model, counts in _model_counts.items()}
+    for counts in out.values():
+        calls = counts["calls"]
+        counts["retry_rate"] = round(counts["retries"] / calls, 4) if calls else 0.0
+        prompt_tokens = counts["prompt_tokens"]
+        counts["cached_prompt_ratio"] = round(counts["cached_prompt_tokens"] / prompt_tokens, 4) if prompt_tokens else 0.0
+    return out
 
-from app.schemas import PlaceCandidate, ResponseDto
 
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY", ""))
+# 같은 system + payload 동시 요청은 모델 호출 1회로 합침
+_model_flight = SingleFlight("model")
 
 
 def _normalize_date_str(s: str) -> str:
@@ -93,47 +245,242 @@ def _extract_json_object(text: str) -> Dict[str, Any]:
     return {}
 
 
-def _call_model_json(system: str, user_payload: Dict[str, Any], retry: int = 1) -> Dict[str, Any]:
-    for _ in range(retry + 1):
-        resp = client.chat.completions.create(
-            model="gpt-4o-mini",
-            temperature=0.35,
-            messages=[
-                {"role": "system", "content": system},
-                {"role": "user", "content": json.dumps(user_payload, ensure_ascii=False)},
-            ],
-        )
-        content = resp.choices[0].message.content or "{}"
-        parsed = _extract_json_object(content)
-        if parsed and isinstance(parsed.get("travelSchedule"), list):
+def _call_model_json(
+    system: str,
+    user_payload: Dict[str, Any],
+    retry: int = 1,
+    use_cache: bool = True,
+    deadline: Optional[float] = None,
+) -> Dict[str, Any]:
+    """
+    응답 캐시 -> 동시 호출 합치기 -> 모델 호출 순.
+    use_cache=False면 캐시를 건너뛰고 새로 생성(다양한 결과가 필요한 요청용).
+    deadline(time.monotonic 기준 시각)이 지나면 재시도 포함 모델 호출을 취소하고 TimeoutError.
+    """
+    key = make_llm_cache_key(system, user_payload, model=MODEL, temperature=TEMPERATURE)
+    flight_key = f"{key}:{retry}:{int(use_cache)}"
+
+    def load() -> Dict[str, Any]:
+        return _model_flight.do(flight_key, lambda: _request_model_json(system, user_payload, retry, deadline))
+
+    cache = get_llm_cache()
+    data = cache.get_or_load(key, load, use_cache=use_cache) if cache is not None else load()
+    # 결과 dict를 여러 요청/캐시가 공유하므로 각자 복사본 사용
+    return copy.deepcopy(data)
+
+
+def _completion_kwargs(system: str, user_payload: Dict[str, Any]) -> Dict[str, Any]:
+    kwargs: Dict[str, Any] = {
+        "model": MODEL,
+        "temperature": TEMPERATURE,
+        "messages": [
+            {"role": "system", "content": system},
+            {"role": "user", "content": _payload_json(user_payload)},
+        ],
+    }
+    if STRUCTURED_OUTPUT:
+        kwargs["response_format"] = RESPONSE_FORMAT
+    return kwargs
+
+
+def _parse_model_output(content: str) -> Optional[Dict[str, Any]]:
+    """모델 응답 텍스트 -> dict. 형식이 맞지 않으면 None."""
+    if STRUCTURED_OUTPUT:
+        try:
+            return ModelPlanResponse.model_validate_json(content or "").model_dump()
+        except ValueError:
+            return None
+    parsed = _extract_json_object(content)
+    if parsed and isinstance(parsed.get("travelSchedule"), list):
+        return parsed
+    return None
+
+
+def _request_model_json(
+    system: str, user_payload: Dict[str, Any], retry: int, deadline: Optional[float] = None
+) -> Dict[str, Any]:
+    labels = _call_labels(user_payload)
+    kwargs = _completion_kwargs(system, user_payload)
+    payload_bytes = _payload_bytes(kwargs)
+    for attempt in range(retry + 1):
+        if attempt:
+            _count_model("retries")
+            _model_retries_total.inc(**labels)
+        _count_model("calls")
+        _model_payload_bytes.observe(payload_bytes, **labels)
+        started = time.perf_counter()
+        try:
+            resp = client.complete(deadline=_remaining(deadline), **kwargs)
+        except Exception as e:
+            _model_latency.observe(time.perf_counter() - started, **labels)
+            _model_calls_total.inc(outcome="timeout" if isinstance(e, TimeoutError) else "error", **labels)
+            raise
+        _model_latency.observe(time.perf_counter() - started, **labels)
+        _observe_usage(getattr(resp, "usage", None), labels)
+
+        message = resp.choices[0].message
+        if getattr(message, "refusal", None):
+            _count_model("refusals")
+            _model_calls_total.inc(outcome="refusal", **labels)
+            continue
+        parsed = _parse_model_output(message.content or "")
+        if parsed is not None:
+            _model_calls_total.inc(outcome="ok", **labels)
             return parsed
+        _count_model("parse_failures")
+        _model_calls_total.inc(outcome="parse_failure", **labels)
     raise ValueError("Failed to parse model JSON response")
 
 
-def _build_candidates(places: List[PlaceCandidate], limit: int = 100) -> List[Dict[str, Any]]:
-    out: List[Dict[str, Any]] = []
+def _dedup_candidates(places: List[PlaceCandidate]) -> List[PlaceCandidate]:
+    """이미지 우선 + 제목 중복 제거."""
+    ordered: List[PlaceCandidate] = []
     seen: Set[str] = set()
-
     for p in _sort_candidates(places):
-        title = (p.title or "").strip()
-        if not title or title in seen:
+        # TourAPI/저장소에서 온 후보는 이미 정규화된 값(title strip, 좌표 float)
+        if not p.title or p.title in seen:
             continue
-        seen.add(title)
-        out.append(
-            {
-                "title": title,
-                "address": p.addr1 or "",
-                "image": p.firstimage or "",
-                "latitude": _to_float(p.mapy),
-                "longitude": _to_float(p.mapx),
-            }
-        )
-        if len(out) >= limit:
+        seen.add(p.title)
+        ordered.append(p)
+    return ordered
+
+
+def _build_candidates(
+    places: List[PlaceCandidate], limit: int = 100, query: str = "", min_lodging: int = 0, focus: str = ""
+) -> List[Dict[str, Any]]:
+    """
+    모델에 보낼 후보 (앞쪽이 우선순위 높음).
+    - query(여행 유형/동행처럼 대화 중 거의 안 바뀌는 조건) 관련도(BM25) 순 상위 후보. 동점은 이미지 우선 순서.
+      min_lodging: 숙소가 그보다 적게 뽑히면 뒤쪽 숙소로 하위 일반 장소를 바꿔 넣음(박 수만큼 숙소 확보)
+    - focus(사용자 입력)는 이 목록(프롬프트 캐시 prefix)을 바꾸지 않음: 목록 밖에서 focus에 맞는 장소만 최대
+      FOCUS_EXTRA_LIMIT개(limit의 1/4까지) 뒤에 붙이고, 그 자리만큼 앞 목록을 항상 줄여 둠. 후보마다 focus 점수 포함
+    """
+    ordered = _dedup_candidates(places)
+    ranking = RELEVANCE_RANKING and bool(ordered)
+    index = get_index(ordered) if ranking and (query.strip() or focus.strip()) else None
+    ranked = ordered
+    if index is not None and query.strip():
+        ranked = [ordered[i] for i in index.top_k(query, len(ordered))]
+    extra_slots = min(FOCUS_EXTRA_LIMIT, limit // 4) if ranking else 0
+    base_limit = limit - extra_slots
+
+    selected = ranked[:base_limit]
+    is_lodging = [p.contenttypeid == LODGING_CONTENT_TYPE_ID for p in selected]
+    missing = min_lodging - sum(is_lodging)
+    if missing > 0:
+        extra = [p for p in ranked[base_limit:] if p.contenttypeid == LODGING_CONTENT_TYPE_ID][:missing]
+        # 자리가 모자라면 뒤에서부터 일반 장소를 빼서 숙소 자리를 만듦
+        overflow = len(selected) + len(extra) - base_limit
+        drop = set([i for i in reversed(range(len(selected))) if not is_lodging[i]][:max(0, overflow)])
+        selected = [p for i, p in enumerate(selected) if i not in drop] + extra
+
+    focus_scores: Dict[str, float] = {}
+    if index is not None and focus.strip():
+        scores = index.scores(focus)
+        focus_scores = {p.title: float(scores[i]) for i, p in enumerate(ordered) if scores[i] > 0}
+        chosen = {p.title for p in selected}
+        outside = [p for p in ordered if p.title in focus_scores and p.title not in chosen]
+        outside.sort(key=lambda p: -focus_scores[p.title])  # 안정 정렬: 동점은 기존 순서
+        selected = selected + outside[:extra_slots]
+
+    return [
+        {
+            "title": p.title,
+            "address": p.addr1 or "",
+            "image": p.firstimage or "",
+            "latitude": p.mapy,
+            "longitude": p.mapx,
+            "lodging": p.contenttypeid == LODGING_CONTENT_TYPE_ID,
+            "focus": focus_scores.get(p.title, 0.0),
+        }
+        for p in selected
+    ]
+
+
+def _relevant_ids(candidates: List[Dict[str, Any]]) -> List[int]:
+    """focus(사용자 입력) 점수가 있는 후보 id, 점수 높은 순 (동점은 id 순) 최대 FOCUS_IDS_LIMIT개."""
+    scored = [(-c["focus"], i) for i, c in enumerate(candidates, start=1) if c.get("focus")]
+    return [i for _, i in sorted(scored)[:FOCUS_IDS_LIMIT]]
+
+
+def _payload_json(user_payload: Dict[str, Any]) -> str:
+    # 공백 없는 구분자로 보내서 입력 토큰 절약
+    return json.dumps(user_payload, ensure_ascii=False, separators=(",", ":"))
+
+
+def _short_address(address: str) -> str:
+    # "부산광역시 해운대구 우동 1234-5" -> "부산광역시 해운대구" (시/군/구까지만)
+    return " ".join((address or "").split()[:2])
+
+
+def _encode_candidates(candidates: List[Dict[str, Any]], budget_tokens: int) -> List[Dict[str, Any]]:
+    """
+    모델에 보낼 압축 후보 목록. id는 1부터 순번(candidates 순서), 이미지 URL 대신 img 플래그,
+    주소는 시/구까지, 좌표는 소수 3자리(약 100m)의 [위도, 경도].
+    budget_tokens를 넘기면 그 뒤(우선순위 낮은) 후보는 제외.
+    """
+    out: List[Dict[str, Any]] = []
+    used = 0
+    for i, c in enumerate(candidates, start=1):
+        item = {
+            "id": i,
+            "title": c["title"],
+            "addr": _short_address(c["address"]),
+            "img": 1 if c["image"] else 0,
+            "pos": [round(c["latitude"], 3), round(c["longitude"], 3)],
+        }
+        cost = estimate_tokens(_payload_json(item)) + 1
+        if out and used + cost > budget_tokens:
             break
+        out.append(item)
+        used += cost
+    return out
 
+
+def _encode_base_schedule(
+    base_schedule: List[Dict[str, Any]], title_to_id: Dict[str, int]
+) -> List[Dict[str, Any]]:
+    """수정 모드 baseSchedule 압축본. 주소/이미지/좌표는 서버가 다시 채우므로 보내지 않음."""
+    out = []
+    for day in base_schedule:
+        plans = []
+        for item in day.get("plan", []):
+            title = (item.get("place") or "").strip()
+            if not title:
+                continue
+            if title not in title_to_id:
+                title_to_id[title] = len(title_to_id) + 1
+            plans.append(
+                {
+                    "id": title_to_id[title],
+                    "title": title,
+                    "description": item.get("description") or "",
+                    "activity": item.get("activity") or "",
+                }
+            )
+        out.append({"day": day.get("day") or "", "date": day.get("date") or "", "plan": plans})
     return out
 
 
+def _resolve_candidate_ids(schedule: Any, id_to_title: Dict[int, str]) -> Any:
+    """모델 응답 plan 항목의 id를 장소 title(place)로 되돌림. id가 없거나 모르는 값이면 place 그대로 둠."""
+    if not isinstance(schedule, list):
+        return schedule
+    for day in schedule:
+        if not isinstance(day, dict) or not isinstance(day.get("plan"), list):
+            continue
+        for item in day["plan"]:
+            if not isinstance(item, dict):
+                continue
+            try:
+                title = id_to_title.get(int(item.get("id")))
+            except (TypeError, ValueError):
+                title = None
+            if title:
+                item["place"] = title
+    return schedule
+
+
 def _build_schedule_place_map(current_schedule: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
     place_map: Dict[str, Dict[str, Any]] = {}
     for day in current_schedule:
@@ -150,27 +497,12 @@ def _build_schedule_place_map(current_schedule: List[Dict[str, Any]]) -> Dict[st
     return place_map
 
 
-def _resolve_place_title(raw_title: str, allowed_titles: Set[str]) -> str:
-    title = (raw_title or "").strip()
-    if not title:
-        return ""
-    if title in allowed_titles:
-        return title
-
-    normalized = title.replace(" ", "")
-    for t in allowed_titles:
-        tn = t.replace(" ", "")
-        if normalized == tn or normalized in tn or tn in normalized:
-            return t
-    return ""
-
-
 def _clean_schedule(
     *,
     source_schedule: List[Dict[str, Any]],
     dates: List[str],
     fallback_schedule: List[Dict[str, Any]],
-    allowed_titles: Set[str],
+    allowed_titles: TitleResolver,
     place_map: Dict[str, Dict[str, Any]],
 ) -> List[Dict[str, Any]]:
     cleaned_schedule: List[Dict[str, Any]] = []
@@ -189,7 +521,7 @@ def _clean_schedule(
             if not isinstance(plan, dict):
                 continue
 
-            resolved_title = _resolve_place_title(plan.get("place", ""), allowed_titles)
+            resolved_title = allowed_titles.resolve(plan.get("place", ""))
             if not resolved_title or resolved_title in seen_titles:
                 continue
             seen_titles.add(resolved_title)
@@ -235,7 +567,7 @@ def _clean_schedule(
             for plan in raw_plans:
                 if not isinstance(plan, dict):
                     continue
-                resolved_title = _resolve_place_title(plan.get("place", ""), allowed_titles)
+                resolved_title = allowed_titles.resolve(plan.get("place", ""))
                 if not resolved_title or resolved_title in seen_titles:
                     continue
                 seen_titles.add(resolved_title)
@@ -273,13 +605,6 @@ def _clean_schedule(
     return cleaned_schedule
 
 
-PACE_TARGETS: Dict[str, Tuple[int, int]] = {
-    "여유롭게": (2, 3),
-    "보통": (3, 4),
-    "알차게": (4, 5),
-}
-
-
 def _build_plan_item_from_title(title: str, place_map: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
     ref = place_map.get(title, {})
     return {
@@ -300,14 +625,24 @@ def _enforce_pace_target(
     pace: str,
     candidates: List[Dict[str, Any]],
     place_map: Dict[str, Dict[str, Any]],
+    reserved: Optional[Set[str]] = None,
+    allow_repeat_days: bool = True,
 ) -> List[Dict[str, Any]]:
+    """
+    reserved: 이 schedule 밖에서 이미 쓴 장소(_normalize_text 키). 보충 시 가능하면 피함.
+    allow_repeat_days=False면 후보가 모자라도 다른 날 장소를 다시 쓰지 않음.
+    보충할 장소는 그 날 동선에 끼워 넣을 때 늘어나는 거리가 가장 작은 후보부터 고름.
+    """
     target = PACE_TARGETS.get((pace or "").strip())
     if not target:
         return schedule
 
     min_count, max_count = target
     adjusted = copy.deepcopy(schedule)
-    candidate_titles = [(c.get("title") or "").strip() for c in candidates if (c.get("title") or "").strip()]
+    pool = [c for c in candidates if (c.get("title") or "").strip()]
+    candidate_titles = [c["title"].strip() for c in pool]
+    candidate_lats = np.array([_to_float(c.get("latitude")) for c in pool], dtype=float)
+    candidate_lngs = np.array([_to_float(c.get("longitude")) for c in pool], dtype=float)
 
     # 하루 중복 제거 + 최대 개수 컷
     for day in adjusted:
@@ -333,7 +668,7 @@ def _enforce_pace_target(
         day["plan"] = compact[:max_count]
 
     # 현재 전체 사용 장소 집합
-    used_global: Set[str] = set()
+    used_global: Set[str] = set(reserved or ())
     for day in adjusted:
         for item in day.get("plan", []):
             if isinstance(item, dict):
@@ -350,16 +685,16 @@ def _enforce_pace_target(
         while len(plans) < min_count:
             chosen_title = ""
 
-            # 1순위: 전체 일정에서 아직 안 쓴 장소
-            for title in candidate_titles:
-                key = _normalize_text(title)
-                if key in seen_day or key in used_global:
-                    continue
-                chosen_title = title
-                break
+            # 1순위: 전체 일정에서 아직 안 쓴 장소 중 그 날 동선에서 가장 가까운 곳
+            free = [
+                i for i, title in enumerate(candidate_titles)
+                if _normalize_text(title) not in seen_day and _normalize_text(title) not in used_global
+            ]
+            if free:
+                chosen_title = candidate_titles[_nearest_fill(plans, free, candidate_lats, candidate_lngs)]
 
             # 2순위: 같은 날만 중복 아니면 허용
-            if not chosen_title:
+            if not chosen_title and allow_repeat_days:
                 for title in candidate_titles:
                     key = _normalize_text(title)
                     if key in seen_day:
@@ -381,110 +716,61 @@ def _enforce_pace_target(
     return adjusted
 
 
-ADD_KEYWORDS = (
-    "추가",
-    "추가해",
-    "추가해줘",
-    "넣어",
-    "넣어줘",
-    "넣어줘요",
-    "넣고",
-    "배치",
-    "포함",
-)
-REMOVE_KEYWORDS = (
-    "빼줘",
-    "빼주고",
-    "빼고",
-    "빼",
-    "삭제",
-    "삭제해",
-    "제거",
-    "제외",
-    "없애",
-    "지워",
-)
-EDIT_INTENT_KEYWORDS = tuple(
-    dict.fromkeys(
-        ADD_KEYWORDS
-        + REMOVE_KEYWORDS
-        + ("수정", "변경", "교체", "바꿔", "옮겨", "순서")
-    )
-)
-REPLAN_INTENT_KEYWORDS = (
-    "처음부터",
-    "완전히새로",
-    "전부새로",
-    "다시만들",
-    "다시짜",
-    "재생성",
-    "새일정",
-)
-
-
 def _normalize_text(s: str) -> str:
     return re.sub(r"\s+", "", (s or "").lower())
 
 
-def _strip_trailing_particle(s: str) -> str:
-    return re.sub(r"(은|는|이|가|을|를|와|과)$", "", s.strip())
-
-
-def _match_term(term: str, place: str, address: str) -> bool:
+def _term_variants(term: str) -> List[str]:
+    """편집 단어 정규화 + '해운대지역' -> '해운대'도 함께."""
     term_n = _normalize_text(term)
-    if not term_n:
-        return False
-
-    place_n = _normalize_text(place)
-    addr_n = _normalize_text(address)
-    variants = [term_n]
+    variants = [term_n] if term_n else []
     if term_n.endswith("지역") and len(term_n) > 2:
         variants.append(term_n[:-2])
+    return variants
 
-    for v in variants:
-        if not v:
-            continue
-        if v in place_n or place_n in v:
-            return True
-        if addr_n and v in addr_n:
-            return True
-    return False
+
+def _items_matching_term(term: str, places: SubstringIndex, addresses: SubstringIndex) -> Set[int]:
+    """
+    일정 항목(색인 번호) 중 단어와 장소명이 서로 포함 관계이거나 주소에 단어가 들어 있는 것.
+    places/addresses는 항목 순서대로 정규화한 장소명/주소 색인.
+    """
+    matched: Set[int] = set()
+    for v in _term_variants(term):
+        matched.update(places.all_containing(v))
+        matched.update(places.all_within(v))
+        matched.update(addresses.all_containing(v))
+    return matched
 
 
-def _pick_candidate_for_term(term: str, places: List[PlaceCandidate]) -> Optional[PlaceCandidate]:
+def _pick_candidate_for_term(term: str, places: List[PlaceCandidate], fuzzy: bool = True) -> Optional[PlaceCandidate]:
+    """
+    제목과 같음 > 제목과 서로 포함 > 주소에 포함 > (fuzzy and FUZZY_PLACE_MATCH) 자모 편집 거리가 가까운 제목,
+    같은 등급이면 이미지 있는 장소 -> 목록 앞쪽.
+    """
     if not places:
         return None
+    index = get_place_term_index(places)
+    variants = _term_variants(term)
+    candidate = index.best(variants)
+    if candidate is None and fuzzy and FUZZY_PLACE_MATCH:
+        candidate = index.closest(variants)
+    return candidate
 
-    term_n = _normalize_text(term)
-    variants = [term_n]
-    if term_n.endswith("지역") and len(term_n) > 2:
-        variants.append(term_n[:-2])
-
-    ranked: List[Tuple[int, int, PlaceCandidate]] = []
-    for p in places:
-        title = (p.title or "").strip()
-        if not title:
-            continue
-        title_n = _normalize_text(title)
-        addr_n = _normalize_text(p.addr1 or "")
-        score = 0
-        for v in variants:
-            if not v:
-                continue
-            if v == title_n:
-                score = max(score, 100)
-            elif v in title_n or title_n in v:
-                score = max(score, 80)
-            elif addr_n and v in addr_n:
-                score = max(score, 60)
-        if score > 0:
-            ranked.append((score, 1 if p.firstimage else 0, p))
-
-    if not ranked:
-        return None
 
-    ranked.sort(key=lambda x: (x[0], x[1]), reverse=True)
-    return ranked[0][2]
+def _nearest_fill(plans: List[Dict[str, Any]], free: List[int], lats: np.ndarray, lngs: np.ndarray) -> int:
+    """
+    free(후보 인덱스) 중 그 날 동선(plans)에 끼워 넣을 때 늘어나는 거리가 가장 작은 후보.
+    그 날 좌표 있는 장소가 없으면 후보 순서(우선순위)대로. 좌표 없는 후보는 맨 뒤.
+    """
+    stops = [p for p in plans if isinstance(p, dict) and p.get("latitude") and p.get("longitude")]
+    if not stops:
+        return free[0]
+    idx = np.asarray(free)
+    costs = insertion_costs(
+        [p["latitude"] for p in stops], [p["longitude"] for p in stops], lats[idx], lngs[idx]
+    )
+    costs[(lats[idx] == 0) | (lngs[idx] == 0)] = np.inf
+    return free[int(np.argmin(costs))]
 
 
 def _reindex_day_plans(schedule: List[Dict[str, Any]]) -> None:
@@ -498,172 +784,59 @@ def _reindex_day_plans(schedule: List[Dict[str, Any]]) -> None:
                 plan["order"] = i + 1
 
 
-def has_add_intent(user_input: str) -> bool:
-    text = (user_input or "").strip()
-    if not text:
-        return False
-    return any(k in text for k in ADD_KEYWORDS)
-
-
-def has_edit_intent(user_input: str) -> bool:
-    text = (user_input or "").strip()
-    if not text:
-        return False
-    return any(k in text for k in EDIT_INTENT_KEYWORDS)
-
-
-def has_replan_intent(user_input: str) -> bool:
-    text_n = _normalize_text(user_input or "")
-    if not text_n:
-        return False
-    return any(k in text_n for k in REPLAN_INTENT_KEYWORDS)
-
-
-def _split_edit_chunks(text: str) -> List[str]:
-    normalized = text
-    replacements = {
-        "빼고": "빼,",
-        "빼주고": "빼,",
-        "제외하고": "제외,",
-        "삭제하고": "삭제,",
-        "제거하고": "제거,",
-        "없애고": "없애,",
-        "넣고": "넣어,",
-        "추가하고": "추가,",
-        "배치하고": "배치,",
-    }
-    for src, dst in replacements.items():
-        normalized = normalized.replace(src, dst)
-
-    return [
-        chunk.strip()
-        for chunk in re.split(r"(?:,|;|\n|그리고|또한|또|및|/)", normalized)
-        if chunk.strip()
-    ]
-
-
-def _extract_day_index(chunk: str) -> Optional[int]:
-    day_match = re.search(r"([1-9][0-9]*)\s*(?:일차|일째|째날|일)\s*(?:에|날에)?", chunk)
-    if not day_match:
-        return None
-    try:
-        day_idx = int(day_match.group(1)) - 1
-    except (TypeError, ValueError):
-        return None
-    return max(day_idx, 0)
-
-
-def _clean_edit_target(text: str) -> str:
-    target = re.sub(r"[0-9]+\s*(?:일차|일째|째날|일)\s*(?:에|날에)?", " ", text)
-    for k in REMOVE_KEYWORDS + ADD_KEYWORDS:
-        target = target.replace(k, " ")
-    target = re.sub(r"(해줘요|해줘|해주세요|줘요|줘|좀|해주고|해주시고|하고)", " ", target)
-    target = re.sub(r"[\"'`]", " ", target)
-    target = _strip_trailing_particle(" ".join(target.split()))
-    return target
-
-
 def apply_schedule_edit_locally(
     *,
     user_input: str,
     current_schedule: List[Dict[str, Any]],
     places: List[PlaceCandidate],
 ) -> Optional[ResponseDto]:
+    """
+    삭제/추가 요청을 모델 없이 바로 반영. 알아듣지 못한 요청이면 None.
+    근사 검색(오타/일부만 쓴 이름)으로 맞춘 장소가 이미 추가할 날 일정에 있으면 옮길 게 없으니
+    다른(새) 장소를 말한 것으로 보고 "추가 후보를 찾지 못함" 처리 (호출한 쪽에서 후보를 더 가져와 다시 찾음).
+    """
     if not current_schedule:
         return None
 
-    text = (user_input or "").strip()
-    if not text:
-        return None
-
-    chunks = _split_edit_chunks(text)
-    remove_terms: List[str] = []
-    add_requests: List[Tuple[Optional[int], str]] = []
-
-    for chunk in chunks:
-        # "A를 B로 바꿔줘/교체해줘" 형태를 우선 처리
-        replace_match = re.search(
-            r"(.+?)\s*(?:을|를)\s*(.+?)\s*로\s*(?:바꿔|교체|변경)",
-            chunk,
-        )
-        if replace_match:
-            old_target = _clean_edit_target(replace_match.group(1))
-            new_target = _clean_edit_target(replace_match.group(2))
-            day_idx = _extract_day_index(chunk)
-            if old_target:
-                remove_terms.append(old_target)
-            if new_target:
-                add_requests.append((day_idx, new_target))
-            continue
-
-        has_remove = any(k in chunk for k in REMOVE_KEYWORDS)
-        has_add = any(k in chunk for k in ADD_KEYWORDS)
-
-        if has_remove:
-            target = _clean_edit_target(chunk)
-            if target:
-                remove_terms.append(target)
-
-        if has_add:
-            day_idx = _extract_day_index(chunk)
-            target = _clean_edit_target(chunk)
-            if target:
-                add_requests.append((day_idx, target))
-
-    # 중복 요청 정리
-    seen_remove = set()
-    compact_remove_terms = []
-    for term in remove_terms:
-        key = _normalize_text(term)
-        if not key or key in seen_remove:
-            continue
-        seen_remove.add(key)
-        compact_remove_terms.append(term)
-    remove_terms = compact_remove_terms
-
-    seen_add = set()
-    compact_add_requests: List[Tuple[Optional[int], str]] = []
-    for day_idx, term in add_requests:
-        key = (day_idx, _normalize_text(term))
-        if not key[1] or key in seen_add:
-            continue
-        seen_add.add(key)
-        compact_add_requests.append((day_idx, term))
-    add_requests = compact_add_requests
-
-    recognized = bool(remove_terms or add_requests)
-    if not recognized:
+    command = parse_edit_command(user_input)
+    if not command.recognized:
         return None
+    remove_terms, add_requests = command.remove_terms, command.add_requests
 
     edited = copy.deepcopy(current_schedule)
     removed_notes: List[str] = []
     add_notes: List[str] = []
     miss_notes: List[str] = []
 
-    for term in remove_terms:
-        removed = 0
+    if remove_terms:
+        # 일정 항목 장소명/주소를 한 번만 정규화해서 색인 (단어마다 항목 전체를 다시 훑지 않음)
+        items: List[Dict[str, Any]] = []
         for day in edited:
             plans = day.get("plan", [])
-            if not isinstance(plans, list):
-                day["plan"] = []
-                continue
-            filtered = []
-            for item in plans:
-                if not isinstance(item, dict):
-                    continue
-                if _match_term(term, item.get("place", ""), item.get("address", "")):
-                    removed += 1
-                    continue
-                filtered.append(item)
-            day["plan"] = filtered
-
-        if removed > 0:
-            removed_notes.append(f"'{term}' {removed}개 삭제")
-        else:
-            miss_notes.append(f"'{term}' 삭제 대상을 찾지 못함")
+            day["plan"] = [item for item in plans if isinstance(item, dict)] if isinstance(plans, list) else []
+            items.extend(day["plan"])
+        place_index = SubstringIndex([_normalize_text(item.get("place", "")) for item in items])
+        address_index = SubstringIndex([_normalize_text(item.get("address", "")) for item in items])
+
+        alive = set(range(len(items)))
+        for term in remove_terms:
+            matched = _items_matching_term(term, place_index, address_index) & alive
+            alive -= matched
+            if matched:
+                removed_notes.append(f"'{term}' {len(matched)}개 삭제")
+            else:
+                miss_notes.append(f"'{term}' 삭제 대상을 찾지 못함")
+
+        position = 0
+        for day in edited:
+            kept = []
+            for item in day["plan"]:
+                if position in alive:
+                    kept.append(item)
+                position += 1
+            day["plan"] = kept
 
     for day_idx, term in add_requests:
-        candidate = _pick_candidate_for_term(term, places)
         target_idx = day_idx if day_idx is not None else (len(edited) - 1)
         if target_idx < 0:
             target_idx = 0
@@ -672,6 +845,18 @@ def apply_schedule_edit_locally(
         else:
             target_idx = 0
 
+        candidate = _pick_candidate_for_term(term, places, fuzzy=False)
+        if candidate is None and edited:
+            candidate = _pick_candidate_for_term(term, places)
+            target_plans = edited[target_idx].get("plan")
+            target_titles = {
+                _normalize_text(item.get("place", ""))
+                for item in (target_plans if isinstance(target_plans, list) else [])
+                if isinstance(item, dict)
+            }
+            if candidate is not None and _normalize_text(candidate.title) in target_titles:
+                candidate = None
+
         if not candidate:
             miss_notes.append(f"'{term}' 추가 후보를 찾지 못함")
             continue
@@ -725,6 +910,7 @@ def apply_schedule_edit_locally(
             target_day["plan"] = target_plans
             add_notes.append(f"{target_idx + 1}일차에 '{title}' 추가")
 
+    optimize_day_routes(edited, reorder=False)
     _reindex_day_plans(edited)
 
     text_parts: List[str] = []
@@ -741,7 +927,28 @@ def apply_schedule_edit_locally(
     )
 
 
-def build_plan_from_front(
+@dataclass
+class _PlanContext:
+    """모델 호출 전 준비물 + 결과 정리에 필요한 값 (일반/스트리밍 경로 공용)."""
+
+    system: str
+    user_payload: Dict[str, Any]
+    dates: List[str]
+    base_schedule: List[Dict[str, Any]]
+    is_edit_mode: bool
+    allowed_titles: TitleResolver
+    place_map: Dict[str, Dict[str, Any]]
+    candidates: List[Dict[str, Any]]
+    pace: str
+    id_to_title: Dict[int, str]
+    unique_across_days: bool = False  # 날짜별 병렬 생성: 날짜 간 장소 중복 금지
+    region: str = ""
+    places: List[PlaceCandidate] = field(default_factory=list)  # 로컬 플래너 대체 응답용 전체 후보
+    transportation: str = ""
+    lodging_titles: Set[str] = field(default_factory=set)  # 숙소 후보 (동선 최적화 시 그 날 마지막)
+
+
+def _prepare_plan_context(
     *,
     user_input: str,
     date_str: str,
@@ -752,10 +959,7 @@ def build_plan_from_front(
     pace: str = "",
     places: List[PlaceCandidate],
     current_schedule: Optional[List[Dict[str, Any]]] = None,
-) -> ResponseDto:
-    if not os.getenv("OPENAI_API_KEY"):
-        raise RuntimeError("OPENAI_API_KEY is not set")
-
+) -> _PlanContext:
     start_date, end_date = _parse_date_range(date_str)
     dates = _date_list(start_date, end_date)
 
@@ -767,8 +971,13 @@ def build_plan_from_front(
     base_schedule = current_schedule or []
     is_edit_mode = len(base_schedule) > 0
 
-    candidates = _build_candidates(places, limit=100)
-    candidate_titles = {c["title"] for c in candidates}
+    candidates = _build_candidates(
+        places,
+        limit=CANDIDATE_LIMIT,
+        query=relevance_query(travel_types, companions),
+        min_lodging=max(0, len(dates) - 1),
+        focus=user_input,
+    )
 
     place_map: Dict[str, Dict[str, Any]] = {}
     for p in places:
@@ -786,144 +995,112 @@ def build_plan_from_front(
     for title, info in schedule_place_map.items():
         place_map.setdefault(title, info)
 
-    allowed_titles = set(candidate_titles) | set(schedule_place_map.keys())
-
-    response_schema = {
-        "text": "string",
-        "travelSchedule": [
-            {
-                "day": "Day 1",
-                "date": "YYYY-MM-DD",
-                "plan": [
-                    {
-                        "order": 1,
-                        "place": "string",
-                        "description": "string",
-                        "activity": "string",
-                        "address": "string",
-                        "image": "string",
-                        "latitude": 0.0,
-                        "longitude": 0.0,
-                    }
-                ],
-            }
-        ],
+    # 후보 id는 candidates 순번, baseSchedule에만 있는 장소는 그 뒤 번호
+    title_to_id: Dict[str, int] = {c["title"]: i for i, c in enumerate(candidates, start=1)}
+
+    # 고정 지시/규칙은 system(app.prompts, import 시 직렬화)에, 요청마다 다른 값은 payload에만.
+    # payload도 요청 간 자주 같은 값(지역/날짜/조건) -> 후보 -> 사용자 입력 관련 id -> 사용자 입력 순으로 둠
+    # (후보 앞부분은 사용자 입력과 무관하게 같은 목록/순서라 프롬프트 캐시 prefix에 들어감)
+    system = system_prompt("edit" if is_edit_mode else "new", with_schema=not STRUCTURED_OUTPUT)
+    user_payload: Dict[str, Any] = {
+        "region": region,
+        "date_range": {"start": start_date, "end": end_date},
+        "date_hint_list": dates,
+        "travelTypes": travel_types,
+        "transportation": transportation,
+        "companions": companions,
+        "pace": pace,
     }
+    relevant_ids = _relevant_ids(candidates)
+    if is_edit_mode:
+        user_payload["baseSchedule"] = _encode_base_schedule(base_schedule, title_to_id)
+        user_payload["candidates"] = []
+        user_payload["relevantIds"] = relevant_ids
+        user_payload["editRequest"] = user_input
+    else:
+        user_payload["candidates"] = []
+        user_payload["relevantIds"] = relevant_ids
+        user_payload["userInput"] = user_input
+
+    # 후보를 뺀 나머지 프롬프트 크기를 먼저 재고 남는 예산만큼 후보를 채움
+    base_tokens = estimate_tokens(system) + estimate_tokens(_payload_json(user_payload))
+    user_payload["candidates"] = _encode_candidates(candidates, PROMPT_TOKEN_BUDGET - base_tokens)
+
+    # 예산에서 빠진 후보는 모델이 볼 수 없으니 id/제목 해석에서도 제외 (보낸 후보 + baseSchedule 장소만)
+    sent_ids = {c["id"] for c in user_payload["candidates"]}
+    user_payload["relevantIds"] = [i for i in relevant_ids if i in sent_ids]
+    sent_ids.update(p["id"] for day in user_payload.get("baseSchedule", []) for p in day["plan"])
+    id_to_title = {i: title for title, i in title_to_id.items() if i in sent_ids}
+    # 모델이 제목을 조금 다르게 돌려줄 때 여러 개가 맞으면 후보 순위가 높은 쪽 -> 기존 일정 장소 순
+    allowed_titles = TitleResolver(
+        [c["title"] for c in candidates if title_to_id[c["title"]] in sent_ids] + list(schedule_place_map)
+    )
 
-    companion_rules = {
-        "혼자": "혼자 여행에 적합한 장소 선택 — 혼밥 가능 식당, 산책로, 문화공간, 혼자 즐기기 좋은 명소 우선",
-        "커플": "커플 여행에 적합한 장소 선택 — 야경 명소, 감성 카페, 로맨틱한 분위기의 소규모 장소 우선",
-        "가족": "가족(어린이 동반) 여행에 적합한 장소 선택 — 어린이 친화 명소, 체험 프로그램, 넓고 안전한 공간 우선",
-        "친구들": "친구들과의 여행에 적합한 장소 선택 — 활동적이고 재미있는 명소, 단체 식사 가능한 식당 우선",
-    }
-    pace_rules = {
-        "여유롭게": "하루 2~3곳만 방문하고 각 장소에 충분한 시간을 배분할 것",
-        "보통": "하루 3~4곳을 균형 있게 배분할 것",
-        "알차게": "하루 4~5곳까지 방문하되 이동 시간을 고려해 동선을 최적화할 것",
-    }
+    return _PlanContext(
+        system=system,
+        user_payload=user_payload,
+        dates=dates,
+        base_schedule=base_schedule,
+        is_edit_mode=is_edit_mode,
+        allowed_titles=allowed_titles,
+        place_map=place_map,
+        candidates=candidates,
+        pace=pace,
+        id_to_title=id_to_title,
+        region=region,
+        places=places,
+        transportation=transportation,
+        lodging_titles={c["title"] for c in candidates if c["lodging"]},
+    )
 
-    extra_rules = []
-    if companions and companions in companion_rules:
-        extra_rules.append(companion_rules[companions])
-    if pace and pace in pace_rules:
-        extra_rules.append(pace_rules[pace])
 
-    if is_edit_mode:
-        system = (
-            "너는 여행 일정 수정 전문가다.\n"
-            "baseSchedule을 기준으로 editRequest를 반영해 일정을 수정한다.\n"
-            "사용자가 언급하지 않은 장소/날짜는 최대한 유지한다.\n"
-            "새로 추가하는 장소는 반드시 candidates.title 중 하나를 사용한다.\n"
-            "삭제 요청된 장소/키워드/지역은 결과 일정에서 제거한다.\n"
-            "반환은 오직 JSON만 출력한다(설명 문장/마크다운 금지).\n"
-            "JSON 스키마는 response_schema를 따른다.\n"
+def _fallback_response(ctx: _PlanContext) -> ResponseDto:
+    """모델 실패/지연 시 응답. 수정 모드면 기존 일정 유지, 새 일정이면 로컬 플래너 일정."""
+    if ctx.is_edit_mode:
+        return ResponseDto(
+            text="요청을 반영하는 중 오류가 발생해 기존 일정을 유지했어요. 다시 시도해주세요.",
+            travelSchedule=ctx.base_schedule,
         )
+    return plan_locally(
+        ctx.places,
+        ctx.dates,
+        pace=ctx.pace,
+        region=ctx.region,
+        transportation=ctx.transportation,
+        text="AI 일정 생성이 늦어지거나 실패해 가까운 장소끼리 묶은 기본 일정으로 준비했어요. 다시 시도하면 AI 추천 일정을 받을 수 있어요.",
+        reason="fallback",
+    )
 
-        user_payload = {
-            "region": region,
-            "date_range": {"start": start_date, "end": end_date},
-            "travelTypes": travel_types,
-            "transportation": transportation,
-            "companions": companions,
-            "pace": pace,
-            "editRequest": user_input,
-            "baseSchedule": base_schedule,
-            "candidates": candidates,
-            "response_schema": response_schema,
-            "rules": [
-                "baseSchedule의 day/date 구조는 가능하면 유지",
-                "place는 baseSchedule의 기존 장소 또는 candidates.title 중 하나",
-                "삭제 요청된 장소/지역은 결과 plan에서 제거",
-                "추가 요청은 해당 날짜(day/date 표현 포함)에 반영",
-                "order는 각 day 기준 1부터 연속 정수",
-                "text에는 어떤 수정이 반영됐는지 짧게 요약",
-            ] + extra_rules,
-            "date_hint_list": dates,
-        }
-    else:
-        system = (
-            "너는 감성 힐링 여행 플래너다.\n"
-            "반드시 입력 받은 지역(region)과 날짜(date_range)를 지켜서 일정을 만든다.\n"
-            "반드시 candidates 목록 안의 title만 장소로 사용한다(목록 밖 장소 금지).\n"
-            "반환은 오직 JSON만 출력한다(설명 문장/마크다운 금지).\n"
-            "JSON 스키마는 response_schema를 따른다.\n"
-        )
 
-        user_payload = {
-            "region": region,
-            "date_range": {"start": start_date, "end": end_date},
-            "travelTypes": travel_types,
-            "transportation": transportation,
-            "companions": companions,
-            "pace": pace,
-            "userInput": user_input,
-            "candidates": candidates,
-            "response_schema": response_schema,
-            "rules": [
-                "place는 candidates.title 중 하나여야 함",
-                "latitude/longitude는 해당 후보의 좌표를 그대로 사용",
-                "1박 이상이면 숙소 1개 포함",
-                "userInput의 키워드와 분위기를 최우선으로 반영하여 place를 선택할 것",
-                "travelTypes에 맞지 않는 장소는 제외할 것",
-                "image 필드가 비어 있는 candidates는 image가 있는 candidates보다 낮은 우선순위로 선택",
-                "transportation이 '대중교통'이면 이동 거리가 짧고 접근성 좋은 장소 우선 선택",
-                "transportation이 '자가용'이면 드라이브 코스, 외곽 명소도 포함 가능",
-                "pace가 '여유롭게'면 하루 2~3곳, '보통'이면 3~4곳, '알차게'면 4~5곳으로 구성",
-            ] + extra_rules,
-            "date_hint_list": dates,
-        }
+def _budget_deadline() -> Optional[float]:
+    return time.monotonic() + PLAN_MODEL_BUDGET_SECONDS if PLAN_MODEL_BUDGET_SECONDS > 0 else None
 
-    try:
-        data = _call_model_json(system=system, user_payload=user_payload, retry=1)
-    except Exception:
-        if is_edit_mode:
-            return ResponseDto(
-                text="요청을 반영하는 중 오류가 발생해 기존 일정을 유지했어요. 다시 시도해주세요.",
-                travelSchedule=base_schedule,
-            )
-        return ResponseDto(
-            text="AI 일정 생성 중 오류가 발생했습니다. 다시 시도해주세요.",
-            travelSchedule=[],
-        )
 
+def _remaining(deadline: Optional[float]) -> Optional[float]:
+    return None if deadline is None else max(0.0, deadline - time.monotonic())
+
+
+def _finalize_plan(ctx: _PlanContext, data: Dict[str, Any]) -> ResponseDto:
     cleaned_schedule = _clean_schedule(
-        source_schedule=data.get("travelSchedule", []),
-        dates=dates,
-        fallback_schedule=base_schedule,
-        allowed_titles=allowed_titles,
-        place_map=place_map,
+        source_schedule=_resolve_candidate_ids(data.get("travelSchedule", []), ctx.id_to_title),
+        dates=ctx.dates,
+        fallback_schedule=ctx.base_schedule,
+        allowed_titles=ctx.allowed_titles,
+        place_map=ctx.place_map,
     )
-    if not is_edit_mode:
+    if not ctx.is_edit_mode:
         cleaned_schedule = _enforce_pace_target(
             schedule=cleaned_schedule,
-            pace=pace,
-            candidates=candidates,
-            place_map=place_map,
+            pace=ctx.pace,
+            candidates=ctx.candidates,
+            place_map=ctx.place_map,
+            allow_repeat_days=not ctx.unique_across_days,
         )
+    _optimize_routes(ctx, cleaned_schedule)
 
     text = data.get("text")
     if not isinstance(text, str) or not text.strip():
-        text = "요청을 반영해 일정을 수정했어요." if is_edit_mode else "요청을 반영해 일정을 생성했어요."
+        text = "요청을 반영해 일정을 수정했어요." if ctx.is_edit_mode else "요청을 반영해 일정을 생성했어요."
 
     return ResponseDto.model_validate(
         {
@@ -931,3 +1108,414 @@ def build_plan_from_front(
             "travelSchedule": cleaned_schedule,
         }
     )
+
+
+def _optimize_routes(ctx: _PlanContext, schedule: List[Dict[str, Any]]) -> None:
+    """새 일정은 날짜별 동선 재배치 + 이동 수단별 거리 예산 적용, 수정 모드는 순서 유지하고 거리만 계산."""
+    min_stops = PACE_TARGETS.get((ctx.pace or "").strip(), (0, 0))[0]
+    optimize_day_routes(
+        schedule,
+        lodging_titles=ctx.lodging_titles,
+        reorder=not ctx.is_edit_mode,
+        budget_km=None if ctx.is_edit_mode else day_budget_km(ctx.transportation),
+        min_stops=min_stops,
+    )
+    _reindex_day_plans(schedule)
+
+
+def _use_parallel_days(ctx: _PlanContext) -> bool:
+    return (
+        PARALLEL_DAYS_MIN > 0
+        and not ctx.is_edit_mode
+        and len(ctx.dates) >= PARALLEL_DAYS_MIN
+        and len(ctx.user_payload["candidates"]) >= 2 * len(ctx.dates)
+    )
+
+
+def _day_requests(ctx: _PlanContext) -> List[Tuple[Dict[str, Any], Set[int]]]:
+    """
+    후보를 날짜 수만큼 지리 그룹으로 나눠 날짜별 (payload, 허용 id) 목록을 만듦.
+    숙소(contenttypeid 32)는 박 수만큼 서로 먼 것부터 골라 그룹 앵커로 쓰고 나머지 숙소는 뺌(하루 숙소 1곳).
+    그룹끼리 겹치지 않으므로 모델 응답에서 날짜 간 장소 중복이 생기지 않음.
+    """
+    encoded = ctx.user_payload["candidates"]
+    n_days = len(ctx.dates)
+    lats = [c["pos"][0] for c in encoded]
+    lngs = [c["pos"][1] for c in encoded]
+
+    lodging = [i for i, c in enumerate(encoded) if ctx.candidates[c["id"] - 1].get("lodging")]
+    anchors: List[int] = []
+    if lodging and n_days > 1:
+        picked = farthest_point_seeds(
+            np.array([lats[i] for i in lodging]), np.array([lngs[i] for i in lodging]), min(n_days - 1, len(lodging)), [0]
+        )
+        anchors = [lodging[i] for i in picked]
+    skipped = set(lodging) - set(anchors)
+    pool = [i for i in range(len(encoded)) if i not in skipped]
+    position = {i: j for j, i in enumerate(pool)}
+    anchor_positions = [position[i] for i in anchors]
+    groups = balanced_groups(
+        [lats[i] for i in pool],
+        [lngs[i] for i in pool],
+        n_days,
+        anchors=anchor_positions,
+    )
+    # balanced_groups는 가장 앞선 인덱스 순이라 숙소 앵커가 밤 순서와 맞지 않음 ->
+    # 앵커 그룹을 앵커 순서대로 1..n-1일(그날 밤 숙소)에, 앵커 없는 그룹은 뒤(마지막 날 = 출발일)에 둠
+    group_of = {j: g for g, group in enumerate(groups) for j in group}
+    anchored = [group_of[j] for j in anchor_positions]
+    groups = [groups[g] for g in anchored] + [group for g, group in enumerate(groups) if g not in anchored]
+
+    requests = []
+    for day_index, group in enumerate(groups):
+        day_candidates = [encoded[pool[j]] for j in group]
+        day_ids = {c["id"] for c in day_candidates}
+        date = ctx.dates[day_index]
+        # 키 순서는 전체 payload와 같게 두고 dayOfTrip은 후보 앞에 (하루 생성 규칙은 system_prompt("day"))
+        payload: Dict[str, Any] = {}
+        for key, value in ctx.user_payload.items():
+            if key == "candidates":
+                payload["dayOfTrip"] = {"day": day_index + 1, "totalDays": n_days}
+                value = day_candidates
+            elif key == "date_range":
+                value = {"start": date, "end": date}
+            elif key == "date_hint_list":
+                value = [date]
+            elif key == "relevantIds":
+                value = [i for i in value if i in day_ids]
+            payload[key] = value
+        requests.append((payload, day_ids))
+    return requests
+
+
+def _day_from_result(index: int, allowed_ids: Set[int], data: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """날짜별 응답에서 day 1개를 꺼내고 그 날 그룹 밖 id는 버림."""
+    days = (data or {}).get("travelSchedule") or []
+    day = dict(days[0]) if days and isinstance(days[0], dict) else {}
+    plans = day.get("plan") if isinstance(day.get("plan"), list) else []
+    kept = []
+    for item in plans:
+        try:
+            if isinstance(item, dict) and int(item.get("id")) in allowed_ids:
+                kept.append(item)
+        except (TypeError, ValueError):
+            continue
+    day["plan"] = kept
+    day["day"] = f"Day {index + 1}"
+    return day
+
+
+def _merge_day_results(
+    requests: List[Tuple[Dict[str, Any], Set[int]]], results: List[Optional[Dict[str, Any]]]
+) -> Dict[str, Any]:
+    schedule = []
+    texts = []
+    for i, ((_, allowed_ids), data) in enumerate(zip(requests, results)):
+        schedule.append(_day_from_result(i, allowed_ids, data))
+        text = (data or {}).get("text")
+        if isinstance(text, str) and text.strip():
+            texts.append(f"Day {i + 1}: {text.strip()}")
+    return {"text": "\n".join(texts), "travelSchedule": schedule}
+
+
+def _fill_missing_days(
+    ctx: _PlanContext, requests: List[Tuple[Dict[str, Any], Set[int]]], results: List[Optional[Dict[str, Any]]]
+) -> None:
+    """예산 안에 응답이 없거나 실패한 날은 그 날 후보 그룹만으로 만든 로컬 플래너 일정으로 채움 (모델 응답과 같은 id 형식)."""
+    for i, ((_, allowed_ids), data) in enumerate(zip(requests, results)):
+        if data is not None:
+            continue
+        title_to_id = {ctx.id_to_title[j]: j for j in allowed_ids if j in ctx.id_to_title}
+        day = plan_locally(
+            [p for p in ctx.places if p.title in title_to_id],
+            ctx.dates[i:i + 1],
+            pace=ctx.pace,
+            region=ctx.region,
+            transportation=ctx.transportation,
+            reason="fallback",
+        ).travelSchedule[0]
+        plan = [{"id": title_to_id[p.place], "description": p.description, "activity": p.activity} for p in day.plan]
+        results[i] = {"travelSchedule": [{"day": day.day, "date": day.date, "plan": plan}]}
+
+
+def _day_executor(n_requests: int) -> ThreadPoolExecutor:
+    """요청마다 새로 만드는 날짜별 호출 풀 (다른 요청의 날짜 호출 뒤에 줄 서지 않도록)."""
+    return ThreadPoolExecutor(max_workers=max(1, min(n_requests, PLAN_DAY_CONCURRENCY)), thread_name_prefix="plan-day")
+
+
+def _submit_day_requests(
+    executor: ThreadPoolExecutor, requests, use_cache: bool, deadline: Optional[float]
+) -> List[Future]:
+    system = system_prompt("day", with_schema=not STRUCTURED_OUTPUT)
+    return [executor.submit(_call_model_json, system, payload, 1, use_cache, deadline) for payload, _ in requests]
+
+
+def _build_plan_parallel(ctx: _PlanContext, use_cache: bool) -> ResponseDto:
+    ctx.unique_across_days = True
+    requests = _day_requests(ctx)
+    deadline = _budget_deadline()
+    results: List[Optional[Dict[str, Any]]] = []
+    executor = _day_executor(len(requests))
+    try:
+        for future in _submit_day_requests(executor, requests, use_cache, deadline):
+            try:
+                results.append(future.result(timeout=_remaining(deadline)))
+            except FutureTimeoutError:
+                logger.warning("day generation exceeded %.1fs budget", PLAN_MODEL_BUDGET_SECONDS)
+                results.append(None)
+            except Exception:
+                logger.warning("day generation failed", exc_info=True)
+                results.append(None)
+    finally:
+        # 마감 시간이 지나 아직 시작하지 못한 날짜 호출은 취소
+        executor.shutdown(wait=False, cancel_futures=True)
+    if all(r is None for r in results):
+        return _fallback_response(ctx)
+    _fill_missing_days(ctx, requests, results)
+    return _finalize_plan(ctx, _merge_day_results(requests, results))
+
+
+def build_plan_from_front(
+    *,
+    user_input: str,
+    date_str: str,
+    region: str,
+    travel_type: Union[str, List[str]],
+    transportation: str,
+    companions: str = "",
+    pace: str = "",
+    places: List[PlaceCandidate],
+    current_schedule: Optional[List[Dict[str, Any]]] = None,
+    use_cache: bool = True,
+    fast: bool = False,
+) -> ResponseDto:
+    """fast=True면 (새 일정일 때) 모델 없이 로컬 플래너로 바로 만듦."""
+    if fast and not current_schedule:
+        return plan_locally(
+            places, _date_list(*_parse_date_range(date_str)), pace=pace, region=region, transportation=transportation
+        )
+    if not os.getenv("OPENAI_API_KEY"):
+        raise RuntimeError("OPENAI_API_KEY is not set")
+
+    ctx = _prepare_plan_context(
+        user_input=user_input,
+        date_str=date_str,
+        region=region,
+        travel_type=travel_type,
+        transportation=transportation,
+        companions=companions,
+        pace=pace,
+        places=places,
+        current_schedule=current_schedule,
+    )
+
+    if _use_parallel_days(ctx):
+        return _build_plan_parallel(ctx, use_cache)
+
+    deadline = _budget_deadline()
+    future = _model_executor.submit(_call_model_json, ctx.system, ctx.user_payload, 1, use_cache, deadline)
+    try:
+        data = future.result(timeout=_remaining(deadline))
+    except FutureTimeoutError:
+        logger.warning("model response exceeded %.1fs budget, using local plan", PLAN_MODEL_BUDGET_SECONDS)
+        return _fallback_response(ctx)
+    except Exception:
+        logger.warning("model call failed, using local plan", exc_info=True)
+        return _fallback_response(ctx)
+
+    return _finalize_plan(ctx, data)
+
+
+def _stream_model_text(system: str, user_payload: Dict[str, Any], deadline: Optional[float] = None) -> Iterator[str]:
+    """
+    모델 스트림의 텍스트 조각. 지연/토큰/실패는 여기서 기록하고,
+    결과 형식(ok/parse_failure)은 다 받은 뒤 호출하는 쪽에서 _model_calls_total에 기록.
+    """
+    labels = _call_labels(user_payload)
+    kwargs = _completion_kwargs(system, user_payload)
+    # 마지막 청크(choices 없음)에 usage를 받음
+    kwargs["stream_options"] = {"include_usage": True}
+    _count_model("calls")
+    _model_payload_bytes.observe(_payload_bytes(kwargs), **labels)
+    started = time.perf_counter()
+    try:
+        for chunk in client.stream(deadline=_remaining(deadline), **kwargs):
+            _observe_usage(getattr(chunk, "usage", None), labels)
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                yield delta
+    except Exception as e:
+        _model_calls_total.inc(outcome="timeout" if isinstance(e, TimeoutError) else "error", **labels)
+        raise
+    finally:
+        _model_latency.observe(time.perf_counter() - started, **labels)
+
+
+def _clean_streamed_day(ctx: _PlanContext, day: Any, index: int, used: Set[str]) -> Dict[str, Any]:
+    """
+    스트림에서 완성된 day 하나를 _finalize_plan과 같은 규칙으로 정리 + 검증.
+    페이스 보충은 앞서 보낸 day에서 쓴 장소(used)를 피해서 고름.
+    """
+    if not isinstance(day, dict):
+        day = {}
+    day = {**day, "day": day.get("day") or f"Day {index + 1}"}
+    _resolve_candidate_ids([day], ctx.id_to_title)
+    cleaned = _clean_schedule(
+        source_schedule=[day],
+        dates=ctx.dates[index:index + 1],
+        fallback_schedule=ctx.base_schedule[index:index + 1],
+        allowed_titles=ctx.allowed_titles,
+        place_map=ctx.place_map,
+    )
+    if not ctx.is_edit_mode:
+        cleaned = _enforce_pace_target(
+            schedule=cleaned,
+            pace=ctx.pace,
+            candidates=ctx.candidates,
+            place_map=ctx.place_map,
+            reserved=used,
+            allow_repeat_days=not ctx.unique_across_days,
+        )
+    _optimize_routes(ctx, cleaned)
+    result = TravelDay.model_validate(cleaned[0]).model_dump()
+    used.update(_normalize_text(item["place"]) for item in result["plan"])
+    return result
+
+
+def stream_plan_from_front(
+    *,
+    user_input: str,
+    date_str: str,
+    region: str,
+    travel_type: Union[str, List[str]],
+    transportation: str,
+    companions: str = "",
+    pace: str = "",
+    places: List[PlaceCandidate],
+    current_schedule: Optional[List[Dict[str, Any]]] = None,
+    use_cache: bool = True,
+    fast: bool = False,
+) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    build_plan_from_front의 스트리밍 버전. (event, data)를 순서대로 yield.
+
+    - ("model_started", {"cached": bool, "parallelDays": int})
+    - ("day", {"index": i, "day": TravelDay})  모델 스트림에서 day 객체가 완성될 때마다 정리/검증해서 전송
+      (날짜별 병렬 생성이면 끝나는 순서대로라 index가 순서대로 오지 않을 수 있음)
+    - ("done", ResponseDto)  최종 확정본. 이미 보낸 day와 다를 수 있으며(페이스 보충 등) 이 값이 기준
+
+    fast=True(새 일정)면 model_started 없이 로컬 플래너 결과를 day/done으로 바로 보냄.
+    모델이 실패하거나 PLAN_MODEL_BUDGET_SECONDS 안에 끝나지 않으면 done은 로컬 플래너 대체 일정(새 일정) 또는
+    기존 일정(수정 모드). 날짜별 병렬 생성이면 그때까지 못 받은 날만 로컬 플래너 일정으로 채움.
+    """
+    if fast and not current_schedule:
+        result = plan_locally(
+            places, _date_list(*_parse_date_range(date_str)), pace=pace, region=region, transportation=transportation
+        ).model_dump()
+        for i, day in enumerate(result["travelSchedule"]):
+            yield "day", {"index": i, "day": day}
+        yield "done", result
+        return
+    if not os.getenv("OPENAI_API_KEY"):
+        raise RuntimeError("OPENAI_API_KEY is not set")
+
+    ctx = _prepare_plan_context(
+        user_input=user_input,
+        date_str=date_str,
+        region=region,
+        travel_type=travel_type,
+        transportation=transportation,
+        companions=companions,
+        pace=pace,
+        places=places,
+        current_schedule=current_schedule,
+    )
+    if _use_parallel_days(ctx):
+        yield from _stream_plan_parallel(ctx, use_cache)
+        return
+
+    key = make_llm_cache_key(ctx.system, ctx.user_payload, model=MODEL, temperature=TEMPERATURE)
+    cache = get_llm_cache()
+    data = cache.lookup(key, use_cache=use_cache) if cache is not None else None
+    yield "model_started", {"cached": data is not None, "parallelDays": 0}
+
+    used: Set[str] = set()
+    if data is not None:
+        data = copy.deepcopy(data)
+        for i, day in enumerate(data.get("travelSchedule", [])):
+            yield "day", {"index": i, "day": _clean_streamed_day(ctx, day, i, used)}
+        yield "done", _finalize_plan(ctx, data).model_dump()
+        return
+
+    started = time.perf_counter()
+    deadline = _budget_deadline()
+    parser = ArrayItemStreamParser("travelSchedule")
+    sent = 0
+    try:
+        for delta in _stream_model_text(ctx.system, ctx.user_payload, deadline):
+            for day in parser.feed(delta):
+                yield "day", {"index": sent, "day": _clean_streamed_day(ctx, day, sent, used)}
+                sent += 1
+        data = _parse_model_output(parser.text)
+        if data is None:
+            _count_model("parse_failures")
+        _model_calls_total.inc(outcome="ok" if data is not None else "parse_failure", **_call_labels(ctx.user_payload))
+    except Exception:
+        logger.warning("model stream failed, falling back to a single request", exc_info=True)
+        data = None
+
+    if data is None:
+        if _remaining(deadline) == 0:
+            logger.warning("model stream exceeded %.1fs budget, using local plan", PLAN_MODEL_BUDGET_SECONDS)
+            yield "done", _fallback_response(ctx).model_dump()
+            return
+        # 스트림이 깨졌거나 형식이 맞지 않으면 남은 예산 안에서 일반 호출로 한 번 더 시도 (확정본은 done으로 전송)
+        _count_model("retries")
+        _model_retries_total.inc(**_call_labels(ctx.user_payload))
+        try:
+            data = _request_model_json(ctx.system, ctx.user_payload, retry=0, deadline=deadline)
+        except Exception:
+            yield "done", _fallback_response(ctx).model_dump()
+            return
+
+    if cache is not None:
+        cache.store(key, data, time.perf_counter() - started)
+    yield "done", _finalize_plan(ctx, copy.deepcopy(data)).model_dump()
+
+
+def _stream_plan_parallel(ctx: _PlanContext, use_cache: bool) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    ctx.unique_across_days = True
+    requests = _day_requests(ctx)
+    yield "model_started", {"cached": False, "parallelDays": len(requests)}
+
+    deadline = _budget_deadline()
+    results: List[Optional[Dict[str, Any]]] = [None] * len(requests)
+    used: Set[str] = set()
+    executor = _day_executor(len(requests))
+    try:
+        submitted = _submit_day_requests(executor, requests, use_cache, deadline)
+        futures = {future: i for i, future in enumerate(submitted)}
+        try:
+            for future in as_completed(futures, timeout=_remaining(deadline)):
+                i = futures[future]
+                try:
+                    results[i] = future.result()
+                except Exception:
+                    logger.warning("day generation failed", exc_info=True)
+                    continue
+                day = _day_from_result(i, requests[i][1], copy.deepcopy(results[i]))
+                yield "day", {"index": i, "day": _clean_streamed_day(ctx, day, i, used)}
+        except FutureTimeoutError:
+            # 남은 날은 done에서 로컬 플래너 일정으로 채움
+            logger.warning("day generation exceeded %.1fs budget", PLAN_MODEL_BUDGET_SECONDS)
+    finally:
+        # 클라이언트가 연결을 끊어 스트림이 닫혀도 남은 날짜 호출은 취소
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    if all(r is None for r in results):
+        yield "done", _fallback_response(ctx).model_dump()
+        return
+    _fill_missing_days(ctx, requests, results)
+    yield "done", _finalize_plan(ctx, _merge_day_results(requests, results)).model_dump()
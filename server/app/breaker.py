@@ -0,0 +1,123 @@
+import logging
+import threading
+import time
+from typing import Any, Dict
+
+logger = logging.getLogger(__name__)
+
+_registry: Dict[str, "CircuitBreaker"] = {}
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+# /metrics 게이지용 숫자 상태 (문자열 state는 app_stats로 나가지 않음)
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitOpenError(RuntimeError):
+    """회로가 열려 있어 업스트림 호출을 바로 거절함."""
+
+
+class CircuitBreaker:
+    """
+    연속 실패(또는 slow_call_seconds 이상 걸린 느린 응답) failure_threshold 회면 open.
+    open 상태에서는 호출을 즉시 거절하고, recovery_timeout 후 half_open으로 바꿔
+    최대 half_open_max_calls 개의 시험 호출만 통과시킴. 시험 호출이 성공하면 closed, 실패하면 다시 open.
+
+    사용법:
+        breaker.before_call()          # open이면 CircuitOpenError
+        ... 호출 ...
+        breaker.record_success(elapsed) / breaker.record_failure()
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        failure_threshold: int = 5,
+        slow_call_seconds: float = 5.0,
+        recovery_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._half_open_in_flight = 0
+        self._transitions: Dict[str, int] = {}
+        self._counts = {"success": 0, "failure": 0, "slow": 0, "rejected": 0}
+        _registry[name] = self
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def _transition(self, new_state: str) -> None:
+        # lock 보유 상태에서 호출
+        if new_state == self._state:
+            return
+        key = f"{self._state}->{new_state}"
+        self._transitions[key] = self._transitions.get(key, 0) + 1
+        logger.warning("circuit %s %s", self.name, key)
+        self._state = new_state
+        if new_state == OPEN:
+            self._opened_at = time.monotonic()
+            self._half_open_in_flight = 0
+        elif new_state == CLOSED:
+            self._consecutive_failures = 0
+            self._half_open_in_flight = 0
+
+    def before_call(self) -> None:
+        with self._lock:
+            if self._state == OPEN:
+                if time.monotonic() - self._opened_at < self.recovery_timeout:
+                    self._counts["rejected"] += 1
+                    raise CircuitOpenError(f"circuit '{self.name}' is open")
+                self._transition(HALF_OPEN)
+
+            if self._state == HALF_OPEN:
+                if self._half_open_in_flight >= self.half_open_max_calls:
+                    self._counts["rejected"] += 1
+                    raise CircuitOpenError(f"circuit '{self.name}' is half-open (probe in flight)")
+                self._half_open_in_flight += 1
+
+    def record_success(self, elapsed: float = 0.0) -> None:
+        if elapsed >= self.slow_call_seconds:
+            with self._lock:
+                self._counts["slow"] += 1
+            self.record_failure()
+            return
+
+        with self._lock:
+            self._counts["success"] += 1
+            self._consecutive_failures = 0
+            if self._state == HALF_OPEN:
+                self._transition(CLOSED)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._counts["failure"] += 1
+            self._consecutive_failures += 1
+            if self._state == HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+                self._transition(OPEN)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "state": self._state,
+                "state_value": STATE_VALUES[self._state],
+                "consecutive_failures": self._consecutive_failures,
+                "transitions": dict(self._transitions),
+                **self._counts,
+            }
+
+
+def breaker_stats() -> Dict[str, Dict[str, Any]]:
+    return {name: breaker.stats() for name, breaker in _registry.items()}
@@ -0,0 +1,162 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from app import fastjson
+
+logger = logging.getLogger(__name__)
+
+
+def make_cache_key(params: Dict[str, Any]) -> str:
+    """
+    쿼리 파라미터를 정규화한 캐시 키.
+    None/빈 값은 제외하고 키 정렬 + 값 문자열화해서 호출 순서/타입 차이를 흡수.
+    """
+    normalized = {
+        str(k): str(v).strip()
+        for k, v in params.items()
+        if v is not None and str(v).strip() != ""
+    }
+    return json.dumps(normalized, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+
+
+class SQLiteTTLCache:
+    """
+    SQLite 기반 디스크 캐시 (TTL + stale-while-revalidate).
+
+    - ttl 이내: fresh hit
+    - ttl 초과 ~ ttl + stale_ttl 이내: stale 값을 바로 반환하고 백그라운드에서 갱신
+    - 그 이후: miss (동기 로드)
+
+    파일 하나를 여러 uvicorn 워커가 함께 쓰므로 WAL 모드 + 스레드별 커넥션 사용.
+    """
+
+    def __init__(self, path: str, *, namespace: str = "default", ttl: float = 86400.0, stale_ttl: float = 86400.0):
+        self.path = path
+        self.namespace = namespace
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._refreshing: set = set()
+        self._stats: Dict[str, float] = {
+            "hits": 0,
+            "stale_hits": 0,
+            "misses": 0,
+            "refreshes": 0,
+            "refresh_errors": 0,
+            "load_seconds": 0.0,
+        }
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        conn = self._conn()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            " namespace TEXT NOT NULL,"
+            " key TEXT NOT NULL,"
+            " value TEXT NOT NULL,"
+            " stored_at REAL NOT NULL,"
+            " PRIMARY KEY (namespace, key))"
+        )
+        conn.commit()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _count(self, name: str, amount: float = 1) -> None:
+        with self._lock:
+            self._stats[name] += amount
+
+    def get_entry(self, key: str) -> Optional[Tuple[Any, float]]:
+        """(value, age_seconds) 반환. 없으면 None."""
+        row = self._conn().execute(
+            "SELECT value, stored_at FROM cache WHERE namespace = ? AND key = ?",
+            (self.namespace, key),
+        ).fetchone()
+        if row is None:
+            return None
+        try:
+            value = fastjson.loads(row[0])
+        except ValueError:
+            return None
+        return value, max(time.time() - row[1], 0.0)
+
+    def set(self, key: str, value: Any) -> None:
+        conn = self._conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO cache (namespace, key, value, stored_at) VALUES (?, ?, ?, ?)",
+            (self.namespace, key, fastjson.dumps(value), time.time()),
+        )
+        conn.commit()
+
+    def get_or_load(self, key: str, loader: Callable[[], Optional[Any]]) -> Any:
+        """
+        캐시에서 값을 찾고 없으면 loader()로 채움.
+        loader가 None을 반환하면(업스트림 오류 등) 캐시에 저장하지 않음.
+        """
+        entry = self.get_entry(key)
+        if entry is not None:
+            value, age = entry
+            if age <= self.ttl:
+                self._count("hits")
+                return value
+            if age <= self.ttl + self.stale_ttl:
+                self._count("stale_hits")
+                self._refresh_in_background(key, loader)
+                return value
+
+        self._count("misses")
+        return self._load(key, loader)
+
+    def _load(self, key: str, loader: Callable[[], Optional[Any]]) -> Any:
+        started = time.perf_counter()
+        value = loader()
+        self._count("load_seconds", time.perf_counter() - started)
+        if value is not None:
+            self.set(key, value)
+        return value
+
+    def _refresh_in_background(self, key: str, loader: Callable[[], Optional[Any]]) -> None:
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def run():
+            try:
+                self._count("refreshes")
+                self._load(key, loader)
+            except Exception:
+                self._count("refresh_errors")
+                logger.warning("cache background refresh failed namespace=%s key=%s", self.namespace, key, exc_info=True)
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=run, name=f"cache-refresh-{self.namespace}", daemon=True).start()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+        loads = stats["misses"] + stats["refreshes"]
+        avg_load = stats["load_seconds"] / loads if loads else 0.0
+        served = stats["hits"] + stats["stale_hits"]
+        lookups = served + stats["misses"]
+        stats["hit_rate"] = round(served / lookups, 4) if lookups else 0.0
+        stats["avg_load_seconds"] = round(avg_load, 4)
+        # 캐시로 응답한 횟수 x 평균 업스트림 지연 = 아낀 지연 추정치
+        stats["saved_seconds_estimate"] = round(served * avg_load, 3)
+        stats["load_seconds"] = round(stats["load_seconds"], 3)
+        return stats
@@ -0,0 +1,32 @@
+# TourAPI 지역/콘텐츠 유형 코드 (API 서버와 장소 동기화 스크립트가 함께 사용)
+from typing import Dict, Tuple
+
+AREA_CODE = {
+    "서울": 1, "인천": 2, "대전": 3, "대구": 4, "광주": 5, "부산": 6, "울산": 7, "세종": 8,
+    "경기": 31, "강원": 32, "충북": 33, "충남": 34, "경북": 35, "경남": 36, "전북": 37, "전남": 38, "제주": 39,
+}
+
+TYPE_TO_CONTENTTYPEID = {
+    "관광": 12,
+    "관광지": 12,
+    "문화시설": 14,
+    "문화": 14,
+    "축제공연행사": 15,
+    "축제": 15,
+    "공연": 15,
+    "행사": 15,
+    "쇼핑": 38,
+    "숙박": 32,
+    "음식점": 39,
+    "음식": 39,
+    "맛집": 39,
+}
+
+CONTENT_TYPE_IDS = sorted(set(TYPE_TO_CONTENTTYPEID.values()))
+
+# 여행 페이스별 하루 장소 수 (최소, 최대)
+PACE_TARGETS: Dict[str, Tuple[int, int]] = {
+    "여유롭게": (2, 3),
+    "보통": (3, 4),
+    "알차게": (4, 5),
+}
@@ -0,0 +1,228 @@
+"""
+사용자 메시지 -> 편집 명령 (다시 만들기/수정/추가 의도, 삭제 단어, 추가 요청(날짜 번호, 단어)).
+
+키워드 묶음(추가/삭제/수정/다시 만들기)과 요청 구분자("그리고", ",", "빼고" 같은 연결형)를
+import 시 정규식 하나로 컴파일해 두고 메시지를 한 번만 훑어 요청 단위(chunk)와 의도를 같이 뽑음.
+같은 메시지는 다시 파싱하지 않음 (parse_edit_command는 lru_cache, 결과는 불변).
+
+    cmd = parse_edit_command("광안리 빼고 2째날에 해운대 넣어줘")
+    cmd.remove_terms   # ("광안리",)
+    cmd.add_requests   # ((1, "해운대"),)
+"""
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+ADD_KEYWORDS = (
+    "추가",
+    "추가해",
+    "추가해줘",
+    "넣어",
+    "넣어줘",
+    "넣어줘요",
+    "넣고",
+    "배치",
+    "포함",
+)
+REMOVE_KEYWORDS = (
+    "빼줘",
+    "빼주고",
+    "빼고",
+    "빼",
+    "삭제",
+    "삭제해",
+    "제거",
+    "제외",
+    "없애",
+    "지워",
+)
+EDIT_INTENT_KEYWORDS = tuple(
+    dict.fromkeys(
+        ADD_KEYWORDS
+        + REMOVE_KEYWORDS
+        + ("수정", "변경", "교체", "바꿔", "옮겨", "순서")
+    )
+)
+# 공백을 무시하고 찾음 ("다시 만들어줘"도 해당)
+REPLAN_INTENT_KEYWORDS = (
+    "처음부터",
+    "완전히새로",
+    "전부새로",
+    "다시만들",
+    "다시짜",
+    "재생성",
+    "새일정",
+)
+# "A 빼고 B 넣어줘"처럼 이어진 요청의 연결형 -> 앞 요청의 끝 (앞 요청 안에서는 오른쪽 말로 바꿔 읽음)
+CHAIN_VERBS: Dict[str, str] = {
+    "빼고": "빼",
+    "빼주고": "빼",
+    "제외하고": "제외",
+    "삭제하고": "삭제",
+    "제거하고": "제거",
+    "없애고": "없애",
+    "넣고": "넣어",
+    "추가하고": "추가",
+    "배치하고": "배치",
+}
+SEPARATORS = (",", ";", "\n", "그리고", "또한", "또", "및", "/")
+
+_ADD, _REMOVE, _EDIT, _REPLAN = 1, 2, 4, 8
+
+
+def _alternation(words) -> str:
+    # 같은 위치에서는 긴 말부터 (예: "빼줘"가 "빼"보다 먼저)
+    return "|".join(re.escape(w) for w in sorted(set(words), key=len, reverse=True))
+
+
+def _keyword_flags() -> Dict[str, int]:
+    flags: Dict[str, int] = {}
+    for words, flag in ((ADD_KEYWORDS, _ADD), (REMOVE_KEYWORDS, _REMOVE), (EDIT_INTENT_KEYWORDS, _EDIT)):
+        for w in words:
+            flags[w] = flags.get(w, 0) | flag
+    return flags
+
+
+_KEYWORD_FLAGS = _keyword_flags()
+_CHAIN_FLAGS = {verb: _KEYWORD_FLAGS[stem] for verb, stem in CHAIN_VERBS.items()}
+
+# 메시지 전체를 한 번 훑는 정규식: 구분자 | 연결형 | 키워드 | 다시 만들기(글자 사이 공백 허용)
+_MESSAGE_RE = re.compile(
+    "(?P<sep>" + _alternation(SEPARATORS) + ")"
+    "|(?P<chain>" + _alternation(CHAIN_VERBS) + ")"
+    "|(?P<keyword>" + _alternation(_KEYWORD_FLAGS) + ")"
+    "|(?P<replan>" + "|".join(r"\s*".join(map(re.escape, w)) for w in REPLAN_INTENT_KEYWORDS) + ")"
+)
+# "A를 B로 바꿔줘/교체해줘"
+_REPLACE_RE = re.compile(r"(.+?)\s*(?:을|를)\s*(.+?)\s*로\s*(?:바꿔|교체|변경)")
+_DAY_RE = re.compile(r"([1-9][0-9]*)\s*(?:일차|일째|째날|일)\s*(?:에|날에)?")
+# 대상 단어만 남기려고 지우는 것: 날짜 표현 | 추가/삭제 키워드 | 요청 어미 | 따옴표.
+# 키워드는 목록 순서 그대로 (예: "추가해"에서 "추가"만 지워짐, 키워드별로 차례로 replace하던 것과 같은 결과)
+_TARGET_NOISE_RE = re.compile(
+    r"[0-9]+\s*(?:일차|일째|째날|일)\s*(?:에|날에)?"
+    "|" + "|".join(map(re.escape, REMOVE_KEYWORDS + ADD_KEYWORDS))
+    + "|해줘요|해줘|해주세요|줘요|줘|좀|해주고|해주시고|하고"
+    + r"|[\"'`]"
+)
+_TRAILING_PARTICLE_RE = re.compile(r"(은|는|이|가|을|를|와|과)$")
+
+
+@dataclass(frozen=True)
+class EditCommand:
+    replan: bool = False  # 처음부터 새로 만들어 달라는 요청
+    edit: bool = False  # 추가/삭제/수정 키워드가 있음
+    add: bool = False  # 추가 키워드가 있음
+    remove_terms: Tuple[str, ...] = ()
+    add_requests: Tuple[Tuple[Optional[int], str], ...] = ()  # (0부터 날짜 번호 또는 None, 단어)
+
+    @property
+    def recognized(self) -> bool:
+        """서버에서 바로 반영할 수 있는 삭제/추가 요청이 있음."""
+        return bool(self.remove_terms or self.add_requests)
+
+
+def _extract_day_index(chunk: str) -> Optional[int]:
+    day_match = _DAY_RE.search(chunk)
+    if not day_match:
+        return None
+    return max(int(day_match.group(1)) - 1, 0)
+
+
+def _clean_edit_target(text: str) -> str:
+    target = " ".join(_TARGET_NOISE_RE.sub(" ", text).split())
+    return _TRAILING_PARTICLE_RE.sub("", target.strip())
+
+
+def _chunks(text: str) -> Tuple[List[Tuple[str, int]], int]:
+    """(요청 단위 문자열, 그 안의 키워드 플래그) 목록과 메시지 전체 플래그."""
+    chunks: List[Tuple[str, int]] = []
+    parts: List[str] = []
+    chunk_flags = 0
+    message_flags = 0
+    pos = 0
+
+    def close() -> None:
+        nonlocal chunk_flags
+        chunk = "".join(parts).strip()
+        if chunk:
+            chunks.append((chunk, chunk_flags))
+        parts.clear()
+        chunk_flags = 0
+
+    for m in _MESSAGE_RE.finditer(text):
+        parts.append(text[pos:m.start()])
+        pos = m.end()
+        kind, word = m.lastgroup, m.group()
+        if kind == "sep":
+            close()
+        elif kind == "chain":
+            parts.append(CHAIN_VERBS[word])
+            chunk_flags |= _CHAIN_FLAGS[word]
+            message_flags |= _CHAIN_FLAGS[word]
+            close()
+        elif kind == "keyword":
+            parts.append(word)
+            chunk_flags |= _KEYWORD_FLAGS[word]
+            message_flags |= _KEYWORD_FLAGS[word]
+        else:
+            parts.append(word)
+            message_flags |= _REPLAN
+    parts.append(text[pos:])
+    close()
+    return chunks, message_flags
+
+
+@lru_cache(maxsize=1024)
+def parse_edit_command(user_input: str) -> EditCommand:
+    text = (user_input or "").strip()
+    if not text:
+        return EditCommand()
+
+    chunks, flags = _chunks(text)
+    remove_terms: List[str] = []
+    add_requests: List[Tuple[Optional[int], str]] = []
+    for chunk, chunk_flags in chunks:
+        # "A를 B로 바꿔줘/교체해줘" 형태를 우선 처리
+        replace_match = _REPLACE_RE.search(chunk)
+        if replace_match:
+            old_target = _clean_edit_target(replace_match.group(1))
+            new_target = _clean_edit_target(replace_match.group(2))
+            if old_target:
+                remove_terms.append(old_target)
+            if new_target:
+                add_requests.append((_extract_day_index(chunk), new_target))
+            continue
+
+        target = _clean_edit_target(chunk) if chunk_flags & (_ADD | _REMOVE) else ""
+        if chunk_flags & _REMOVE and target:
+            remove_terms.append(target)
+        if chunk_flags & _ADD and target:
+            add_requests.append((_extract_day_index(chunk), target))
+
+    # 중복 요청 정리 (공백/대소문자 무시)
+    seen_remove = set()
+    compact_remove_terms = []
+    for term in remove_terms:
+        key = "".join(term.lower().split())
+        if not key or key in seen_remove:
+            continue
+        seen_remove.add(key)
+        compact_remove_terms.append(term)
+
+    seen_add = set()
+    compact_add_requests = []
+    for day_idx, term in add_requests:
+        key = (day_idx, "".join(term.lower().split()))
+        if not key[1] or key in seen_add:
+            continue
+        seen_add.add(key)
+        compact_add_requests.append((day_idx, term))
+
+    return EditCommand(
+        replan=bool(flags & _REPLAN),
+        edit=bool(flags & _EDIT),
+        add=bool(flags & _ADD),
+        remove_terms=tuple(compact_remove_terms),
+        add_requests=tuple(compact_add_requests),
+    )
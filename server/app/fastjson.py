@@ -0,0 +1,21 @@
+import json
+from typing import Any, Union
+
+# orjson이 설치돼 있으면 사용 (없으면 표준 json으로 동작)
+try:
+    import orjson
+except ImportError:  # pragma: no cover - 선택 의존성
+    orjson = None
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """JSON 파싱. 형식이 잘못되면 ValueError (orjson.JSONDecodeError도 ValueError 하위 클래스)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any) -> str:
+    if orjson is not None:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj, ensure_ascii=False)
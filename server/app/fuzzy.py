@@ -0,0 +1,139 @@
+"""
+자모 단위 근사 검색: 오타/띄어쓰기/일부만 쓴 장소 이름("해운데", "감천마을")을 제목에 맞춤.
+
+- 한글 음절은 NFD로 초성/중성/종성 자모로 풀어서 비교 ("대" vs "데"는 음절 하나가 아니라 모음 하나 차이)
+- 후보 생성: 자모 2-gram 역색인(gram -> 키 번호 배열)에서 질의 gram을 많이 공유하는 키만 추림 (np.bincount)
+- 순위: 추린 후보만 numpy로 한꺼번에 편집 거리 계산. 질의가 제목 일부에 맞으면 되므로 제목 앞뒤는 건너뛰어도 0,
+  제목 중간에서 건너뛴 자모(질의에 없는 말, 예: "감천'문화'마을")는 GAP_COST, 바꾸기/빠뜨리기는 1.
+  행마다 최솟값이 한도(질의 자모 수 x MAX_COST_RATIO)를 넘은 후보는 바로 버림
+
+    index = JamoIndex(["해운대해수욕장", "감천문화마을"])
+    index.best("해운데")     # (1.0, 0)
+    index.best("감천마을")   # (2.5, 1)
+
+장소 이름은 "해수욕장/공원/시장"처럼 흔한 분류 꼬리가 길어서 이름 전체로 한도를 재면 다른 장소가 맞음
+("송도해수욕장" -> 송정해수욕장). split_category로 꼬리를 떼고 고유한 앞부분만 비교에 씀 (PlaceTermIndex.closest).
+"""
+import math
+import unicodedata
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+GRAM = 2
+GAP_COST = 0.5
+MAX_COST_RATIO = 0.25
+MIN_QUERY_JAMO = 4  # 한 음절짜리 질의는 아무 데나 맞아서 근사 검색 안 함
+MIN_SHARED_RATIO = 0.5  # 질의 gram 중 이만큼은 같이 가진 키만 후보
+CANDIDATE_LIMIT = 64
+# 흔한 분류 꼬리 (긴 것부터 봄). 고유한 앞부분이 2글자 이상 남을 때만 뗌 ("부산"의 "산" 같은 건 두지 않음)
+CATEGORY_SUFFIXES = tuple(
+    sorted(
+        (
+            "해수욕장", "문화마을", "테마파크", "아쿠아리움", "수목원", "식물원", "동물원", "박물관", "미술관",
+            "기념관", "전시관", "체험관", "전망대", "해변", "해안", "공원", "시장", "마을", "거리", "카페",
+            "호텔", "타워", "대교", "폭포",
+        ),
+        key=len,
+        reverse=True,
+    )
+)
+
+
+def to_jamo(text: str) -> str:
+    """한글 음절 -> 조합형 자모 (그 밖의 글자는 그대로)."""
+    return unicodedata.normalize("NFD", text)
+
+
+def split_category(key: str) -> Tuple[str, str]:
+    """정규화 키 -> (고유한 앞부분, 분류 꼬리). 꼬리가 없으면 (key, "")."""
+    for suffix in CATEGORY_SUFFIXES:
+        if key.endswith(suffix) and len(key) - len(suffix) >= 2:
+            return key[: -len(suffix)], suffix
+    return key, ""
+
+
+def _codes(text: str) -> np.ndarray:
+    return np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32).astype(np.int64)
+
+
+def _grams(codes: np.ndarray) -> np.ndarray:
+    """연속한 자모 2개를 정수 하나로 (유니코드 코드 포인트는 21비트). 마지막 축 기준."""
+    return (codes[..., :-1] << 21) | codes[..., 1:]
+
+
+class JamoIndex:
+    def __init__(self, keys: Sequence[str]):
+        self.keys = list(keys)
+        jamo = [to_jamo(k) for k in self.keys]
+        self._lengths = np.asarray([len(s) for s in jamo], dtype=np.int64)
+        # 키별 자모 코드 (뒤는 -1로 채움)
+        width = int(self._lengths.max()) if jamo else 0
+        self._codes = np.full((len(jamo), max(width, 1)), -1, dtype=np.int64)
+        self._codes[np.arange(self._codes.shape[1]) < self._lengths[:, None]] = _codes("".join(jamo))
+        # 역색인: gram 순 안정 정렬 (같은 gram 안에서는 키 번호 순) -> 같은 (gram, 키) 중복을 빼고 gram마다 구간을 잘라 둠
+        grams = _grams(self._codes)
+        valid = np.arange(grams.shape[1]) < self._lengths[:, None] - 1
+        gram, doc = grams[valid], np.broadcast_to(np.arange(len(jamo))[:, None], grams.shape)[valid]
+        order = np.argsort(gram, kind="stable")
+        gram, doc = gram[order], doc[order]
+        new_gram = np.ones(len(gram), dtype=bool)
+        new_gram[1:] = gram[1:] != gram[:-1]
+        keep = new_gram.copy()
+        keep[1:] |= doc[1:] != doc[:-1]
+        gram, doc, new_gram = gram[keep], doc[keep], new_gram[keep]
+        bounds = np.r_[np.flatnonzero(new_gram), len(gram)].tolist()
+        self._postings: Dict[int, np.ndarray] = {
+            int(gram[lo]): doc[lo:hi] for lo, hi in zip(bounds[:-1], bounds[1:])
+        }
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def _candidates(self, grams: List[int]) -> np.ndarray:
+        lists = [self._postings[g] for g in grams if g in self._postings]
+        if not lists:
+            return np.zeros(0, dtype=np.int64)
+        shared = np.bincount(np.concatenate(lists), minlength=len(self.keys))
+        ids = np.flatnonzero(shared >= max(1, math.ceil(len(grams) * MIN_SHARED_RATIO)))
+        if len(ids) > CANDIDATE_LIMIT:
+            # 공유 gram 많은 순, 같으면 앞 키
+            ids = ids[np.lexsort((ids, -shared[ids]))[:CANDIDATE_LIMIT]]
+        return ids
+
+    def matches(self, query: str) -> List[Tuple[float, int]]:
+        """한도 안의 (비용, 키 번호) 전부, 비용 -> 키 번호 순."""
+        q = to_jamo(query)
+        if len(q) < MIN_QUERY_JAMO or not self.keys:
+            return []
+        query_codes = _codes(q)
+        ids = self._candidates(list(dict.fromkeys(_grams(query_codes).tolist())))
+        if not len(ids):
+            return []
+        limit = max(1.0, len(q) * MAX_COST_RATIO)
+        lengths = self._lengths[ids]
+        width = int(lengths.max())
+        # (제목 위치, 후보) 배치: 행 안의 누적 최솟값을 후보 전체에 한 번에 계산
+        codes = self._codes[ids, :width].T
+        ramp = GAP_COST * np.arange(width + 1)[:, None]
+        # 제목 어디서 시작해도 0 (제목 길이를 넘는 칸은 inf라 끝 이후로는 안 맞음)
+        cost = np.where(np.arange(width + 1)[:, None] <= lengths, 0.0, np.inf)
+        for ch in query_codes:
+            step = np.empty_like(cost)
+            step[0] = cost[0] + 1
+            np.minimum(cost[:-1] + (codes != ch), cost[1:] + 1, out=step[1:])
+            # 제목 자모 건너뛰기: cost[j] = min_k(step[k] + GAP_COST * (j - k))
+            step -= ramp
+            cost = np.minimum.accumulate(step, axis=0)
+            cost += ramp
+            keep = cost.min(axis=0) <= limit
+            if not keep.all():
+                ids, codes, cost = ids[keep], codes[:, keep], cost[:, keep]
+                if not len(ids):
+                    return []
+        best = cost.min(axis=0)
+        return sorted(zip(best.tolist(), ids.tolist()))
+
+    def best(self, query: str) -> Optional[Tuple[float, int]]:
+        found = self.matches(query)
+        return found[0] if found else None
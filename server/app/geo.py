@@ -0,0 +1,231 @@
+import math
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.schemas import PlaceCandidate
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEG_LAT = 111.195
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp = p2 - p1
+    dl = math.radians(lng2 - lng1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def haversine_to_point(lats: np.ndarray, lngs: np.ndarray, lat: float, lng: float) -> np.ndarray:
+    """여러 좌표에서 한 점까지의 거리(km) 벡터."""
+    p1 = np.radians(lats)
+    p2 = math.radians(lat)
+    a = np.sin((p2 - p1) / 2) ** 2 + np.cos(p1) * math.cos(p2) * np.sin(np.radians(lng - lngs) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.minimum(1.0, np.sqrt(a)))
+
+
+def haversine_matrix(
+    lats: np.ndarray,
+    lngs: np.ndarray,
+    other_lats: Optional[np.ndarray] = None,
+    other_lngs: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """(len(lats), len(other_lats)) 거리 행렬(km). other를 생략하면 자기 자신과의 행렬."""
+    if other_lats is None or other_lngs is None:
+        other_lats, other_lngs = lats, lngs
+    p1 = np.radians(np.asarray(lats, dtype=float))[:, None]
+    p2 = np.radians(np.asarray(other_lats, dtype=float))[None, :]
+    dl = np.radians(np.asarray(other_lngs, dtype=float)[None, :] - np.asarray(lngs, dtype=float)[:, None])
+    a = np.sin((p2 - p1) / 2) ** 2 + np.cos(p1) * np.cos(p2) * np.sin(dl / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.minimum(1.0, np.sqrt(a)))
+
+
+class SpatialIndex:
+    """
+    PlaceCandidate 목록 위의 격자(grid bucket) 공간 인덱스.
+
+    - within(lat, lng, radius_km): 반경 내 장소 (가까운 순)
+    - nearest(lat, lng, k): 가까운 k개
+    - distance_matrix(indices): 벡터화된 haversine 거리 행렬
+
+    격자 셀은 데이터의 최대 위도 기준으로 잡아서 어느 셀이든 가로/세로가 cell_km 이상이 되게 함.
+    """
+
+    def __init__(self, places: Sequence[PlaceCandidate], cell_km: float = 1.0):
+        self.places: List[PlaceCandidate] = list(places)
+        self.lats = np.array([p.mapy for p in self.places], dtype=float)
+        self.lngs = np.array([p.mapx for p in self.places], dtype=float)
+        self.cell_km = cell_km
+
+        max_abs_lat = float(np.abs(self.lats).max()) if len(self.places) else 0.0
+        self.cell_lat = cell_km / KM_PER_DEG_LAT
+        self.cell_lng = cell_km / (KM_PER_DEG_LAT * max(math.cos(math.radians(min(max_abs_lat, 89.0))), 1e-6))
+
+        buckets: Dict[Tuple[int, int], List[int]] = {}
+        for i, (lat, lng) in enumerate(zip(self.lats, self.lngs)):
+            buckets.setdefault(self._cell(lat, lng), []).append(i)
+        self._grid: Dict[Tuple[int, int], np.ndarray] = {k: np.array(v, dtype=np.intp) for k, v in buckets.items()}
+
+        if buckets:
+            rows = [k[0] for k in buckets]
+            cols = [k[1] for k in buckets]
+            self._extent = (min(rows), max(rows), min(cols), max(cols))
+        else:
+            self._extent = (0, -1, 0, -1)
+
+    def __len__(self) -> int:
+        return len(self.places)
+
+    def _cell(self, lat: float, lng: float) -> Tuple[int, int]:
+        return int(math.floor(lat / self.cell_lat)), int(math.floor(lng / self.cell_lng))
+
+    def _indices_in_cells(self, row0: int, row1: int, col0: int, col1: int) -> np.ndarray:
+        min_row, max_row, min_col, max_col = self._extent
+        row0, row1 = max(row0, min_row), min(row1, max_row)
+        col0, col1 = max(col0, min_col), min(col1, max_col)
+        if row0 > row1 or col0 > col1:
+            return np.empty(0, dtype=np.intp)
+
+        chunks = []
+        if (row1 - row0 + 1) * (col1 - col0 + 1) <= len(self._grid):
+            for r in range(row0, row1 + 1):
+                for c in range(col0, col1 + 1):
+                    chunk = self._grid.get((r, c))
+                    if chunk is not None:
+                        chunks.append(chunk)
+        else:
+            # 범위가 격자 전체보다 넓으면 비어 있지 않은 셀만 훑음
+            for (r, c), chunk in self._grid.items():
+                if row0 <= r <= row1 and col0 <= c <= col1:
+                    chunks.append(chunk)
+        if not chunks:
+            return np.empty(0, dtype=np.intp)
+        return np.concatenate(chunks)
+
+    def within_indices(self, lat: float, lng: float, radius_km: float) -> Tuple[np.ndarray, np.ndarray]:
+        """반경 내 (인덱스, 거리) 배열, 가까운 순."""
+        if not self.places or radius_km < 0:
+            return np.empty(0, dtype=np.intp), np.empty(0)
+        span = int(math.ceil(radius_km / self.cell_km))
+        row, col = self._cell(lat, lng)
+        idx = self._indices_in_cells(row - span, row + span, col - span, col + span)
+        if not len(idx):
+            return idx, np.empty(0)
+        dist = haversine_to_point(self.lats[idx], self.lngs[idx], lat, lng)
+        mask = dist <= radius_km
+        idx, dist = idx[mask], dist[mask]
+        order = np.argsort(dist, kind="stable")
+        return idx[order], dist[order]
+
+    def within(self, lat: float, lng: float, radius_km: float) -> List[Tuple[PlaceCandidate, float]]:
+        idx, dist = self.within_indices(lat, lng, radius_km)
+        return [(self.places[i], float(d)) for i, d in zip(idx, dist)]
+
+    def nearest_indices(self, lat: float, lng: float, k: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+        """가까운 k개의 (인덱스, 거리) 배열. 격자를 한 겹씩 넓혀가며 찾음."""
+        n = len(self.places)
+        if n == 0 or k <= 0:
+            return np.empty(0, dtype=np.intp), np.empty(0)
+        k = min(k, n)
+
+        row, col = self._cell(lat, lng)
+        min_row, max_row, min_col, max_col = self._extent
+        max_ring = max(abs(row - min_row), abs(row - max_row), abs(col - min_col), abs(col - max_col))
+
+        # 쿼리 지점이 격자 밖이면 격자에 닿는 링부터 시작
+        ring = max(0, row - max_row, min_row - row, col - max_col, min_col - col)
+        while True:
+            idx = self._indices_in_cells(row - ring, row + ring, col - ring, col + ring)
+            if len(idx) < k and ring < max_ring:
+                ring = min(max_ring, max(1, ring * 2))
+                continue
+
+            dist = haversine_to_point(self.lats[idx], self.lngs[idx], lat, lng)
+            if len(idx) > k:
+                part = np.argpartition(dist, k - 1)[:k]
+                idx, dist = idx[part], dist[part]
+            order = np.argsort(dist, kind="stable")
+            idx, dist = idx[order], dist[order]
+            # ring 밖의 점은 최소 ring * cell_km 떨어져 있으므로 k번째 거리가 그 안이면 확정
+            if ring >= max_ring or dist[-1] <= ring * self.cell_km:
+                return idx, dist
+            ring = min(max_ring, max(ring + 1, int(math.ceil(dist[-1] / self.cell_km))))
+
+    def nearest(self, lat: float, lng: float, k: int = 1) -> List[Tuple[PlaceCandidate, float]]:
+        idx, dist = self.nearest_indices(lat, lng, k)
+        return [(self.places[i], float(d)) for i, d in zip(idx, dist)]
+
+    def distance_matrix(self, indices: Optional[Sequence[int]] = None) -> np.ndarray:
+        if indices is None:
+            return haversine_matrix(self.lats, self.lngs)
+        idx = np.asarray(indices, dtype=np.intp)
+        return haversine_matrix(self.lats[idx], self.lngs[idx])
+
+
+def farthest_point_seeds(lats: np.ndarray, lngs: np.ndarray, k: int, seeds: List[int]) -> List[int]:
+    """이미 고른 seeds에서 가장 먼 점을 차례로 추가해 k개 중심 인덱스를 만듦 (결정적)."""
+    seeds = list(seeds)
+    if not seeds:
+        seeds = [0]
+    nearest = haversine_matrix(lats, lngs, lats[seeds], lngs[seeds]).min(axis=1)
+    while len(seeds) < k:
+        i = int(np.argmax(nearest))
+        seeds.append(i)
+        nearest = np.minimum(nearest, haversine_to_point(lats, lngs, lats[i], lngs[i]))
+    return seeds
+
+
+def balanced_groups(
+    lats: Sequence[float],
+    lngs: Sequence[float],
+    k: int,
+    *,
+    anchors: Sequence[int] = (),
+    iterations: int = 10,
+) -> List[List[int]]:
+    """
+    좌표를 크기가 비슷한(최대 ceil(n/k)) k개 지리 그룹으로 나눔. 용량 제한 k-means.
+
+    anchors: 그룹 중심으로 쓸 점 인덱스(예: 숙소). 앵커끼리는 항상 서로 다른 그룹에 들어감.
+    반환: 그룹별 인덱스 목록(각 그룹 안은 원래 순서), 그룹은 가장 앞선 인덱스 순으로 정렬.
+    """
+    lats = np.asarray(lats, dtype=float)
+    lngs = np.asarray(lngs, dtype=float)
+    n = len(lats)
+    k = min(k, n)
+    if k <= 0:
+        return []
+
+    anchors = list(dict.fromkeys(anchors))[:k]
+    capacity = -(-n // k)
+    centers = farthest_point_seeds(lats, lngs, k, anchors)
+    c_lats, c_lngs = lats[centers], lngs[centers]
+
+    assignment = np.full(n, -1, dtype=np.intp)
+    for _ in range(max(1, iterations)):
+        dist = haversine_matrix(lats, lngs, c_lats, c_lngs)
+        new = np.full(n, -1, dtype=np.intp)
+        sizes = np.zeros(k, dtype=np.intp)
+        for g, i in enumerate(anchors):
+            new[i] = g
+            sizes[g] += 1
+        # 가까운 (점, 그룹) 쌍부터 용량이 남은 그룹에 배정
+        for flat in np.argsort(dist, axis=None, kind="stable"):
+            i, g = divmod(int(flat), k)
+            if new[i] >= 0 or sizes[g] >= capacity:
+                continue
+            new[i] = g
+            sizes[g] += 1
+        if np.array_equal(new, assignment):
+            break
+        assignment = new
+        for g in range(k):
+            members = assignment == g
+            c_lats[g] = lats[members].mean()
+            c_lngs[g] = lngs[members].mean()
+
+    groups = [np.flatnonzero(assignment == g).tolist() for g in range(k)]
+    groups = [g for g in groups if g]
+    groups.sort(key=lambda g: g[0])
+    return groups
@@ -0,0 +1,77 @@
+import json
+from typing import Any, List, Optional
+
+
+class ArrayItemStreamParser:
+    """
+    스트리밍으로 들어오는 JSON 텍스트에서 최상위 객체의 `key` 배열 원소를 완성되는 대로 꺼냄.
+
+        parser = ArrayItemStreamParser("travelSchedule")
+        for chunk in model_stream:
+            for day in parser.feed(chunk):
+                ...
+
+    문자열/이스케이프 상태와 괄호 깊이만 추적하는 한 번 훑기(single pass) 파서.
+    원소 하나가 닫히는 시점에만 그 구간을 json.loads 함. 앞뒤의 ```json 펜스 같은 잡음은 무시.
+    """
+
+    def __init__(self, key: str):
+        self.key = key
+        self.text = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start = -1
+        self._last_string: Optional[str] = None
+        self._current_key: Optional[str] = None
+        self._array_depth: Optional[int] = None  # 대상 배열 안쪽 깊이
+        self._item_start = -1
+        self.done = False
+
+    def feed(self, chunk: str) -> List[Any]:
+        self.text += chunk
+        items: List[Any] = []
+        text = self.text
+        i = self._pos
+        n = len(text)
+        while i < n:
+            ch = text[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        self._last_string = text[self._string_start + 1:i]
+            elif ch == '"':
+                self._in_string = True
+                self._string_start = i
+            elif ch in "{[":
+                if self._array_depth is not None and self._depth == self._array_depth and self._item_start < 0:
+                    self._item_start = i
+                if ch == "[" and self._depth == 1 and self._current_key == self.key and not self.done:
+                    self._array_depth = self._depth + 1
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if self._array_depth is not None:
+                    if self._depth == self._array_depth and self._item_start >= 0:
+                        try:
+                            items.append(json.loads(text[self._item_start:i + 1]))
+                        except json.JSONDecodeError:
+                            pass
+                        self._item_start = -1
+                    elif self._depth < self._array_depth:
+                        self._array_depth = None
+                        self.done = True
+            elif self._depth == 1:
+                if ch == ":":
+                    self._current_key = self._last_string
+                elif ch == ",":
+                    self._current_key = None
+            i += 1
+        self._pos = i
+        return items
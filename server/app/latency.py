@@ -0,0 +1,61 @@
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, List
+
+_registry: Dict[str, "LatencyTracker"] = {}
+_registry_lock = threading.Lock()
+
+
+def _percentile(sorted_samples: List[float], q: float) -> float:
+    if not sorted_samples:
+        return 0.0
+    return sorted_samples[min(len(sorted_samples) - 1, max(0, int(round(q * (len(sorted_samples) - 1)))))]
+
+
+class LatencyTracker:
+    """
+    구간별 지연(초) 집계. 누적 count/sum + 최근 window개 샘플로 p50/p95/p99 계산.
+    """
+
+    def __init__(self, name: str, window: int = 512):
+        self.name = name
+        self._lock = threading.Lock()
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._count = 0
+        self._sum = 0.0
+        _registry[name] = self
+
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+            self._count += 1
+            self._sum += seconds
+
+    def percentile(self, q: float) -> float:
+        with self._lock:
+            samples = sorted(self._samples)
+        return _percentile(samples, q)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            samples = sorted(self._samples)
+            count, total = self._count, self._sum
+        return {
+            "count": count,
+            "avg_seconds": round(total / count, 4) if count else 0.0,
+            "p50_seconds": round(_percentile(samples, 0.5), 4),
+            "p95_seconds": round(_percentile(samples, 0.95), 4),
+            "p99_seconds": round(_percentile(samples, 0.99), 4),
+        }
+
+
+def get_tracker(name: str) -> LatencyTracker:
+    with _registry_lock:
+        tracker = _registry.get(name)
+        if tracker is None:
+            tracker = LatencyTracker(name)
+        return tracker
+
+
+def latency_stats() -> Dict[str, Dict[str, Any]]:
+    return {name: tracker.stats() for name, tracker in _registry.items()}
@@ -0,0 +1,158 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+from app.cache import SQLiteTTLCache
+
+# 같은 (system, payload, model, temperature) 요청은 모델 응답을 재사용 (메모리 LRU -> 디스크 순)
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "1") not in ("0", "false", "False", "")
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", ".cache/llm.sqlite3")
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", str(7 * 86400)))
+LLM_CACHE_MEMORY_ENTRIES = int(os.getenv("LLM_CACHE_MEMORY_ENTRIES", "256"))
+
+
+def make_llm_cache_key(system: str, payload: Dict[str, Any], *, model: str, temperature: float) -> str:
+    """요청 내용의 정규화 JSON 해시. dict 키 순서/공백 차이는 같은 키가 됨."""
+    canonical = json.dumps(
+        {"system": system, "payload": payload, "model": model, "temperature": temperature},
+        ensure_ascii=False,
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """
+    모델 응답 캐시. 크기 제한 메모리 LRU 앞단 + SQLiteTTLCache 디스크 뒷단(워커 간 공유, 재시작 후 유지).
+
+    모델 재호출은 비용이 드므로 디스크 계층은 stale-while-revalidate 없이 ttl이 지나면 바로 미스.
+    loader가 예외를 던지면 아무것도 저장하지 않음.
+    """
+
+    def __init__(self, path: Optional[str], *, ttl: float = LLM_CACHE_TTL, max_entries: int = LLM_CACHE_MEMORY_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._disk = SQLiteTTLCache(path, namespace="llm", ttl=ttl, stale_ttl=0.0) if path else None
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats: Dict[str, float] = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "bypassed": 0,
+            "load_seconds": 0.0,
+        }
+
+    def _count(self, name: str, amount: float = 1) -> None:
+        with self._lock:
+            self._stats[name] += amount
+
+    def _memory_get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                return None
+            value, stored_at = entry
+            if time.time() - stored_at > self.ttl:
+                del self._memory[key]
+                return None
+            self._memory.move_to_end(key)
+            return value
+
+    def _memory_set(self, key: str, value: Any, stored_at: float) -> None:
+        with self._lock:
+            self._memory[key] = (value, stored_at)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[Any]:
+        value = self._memory_get(key)
+        if value is not None:
+            self._count("memory_hits")
+            return value
+        if self._disk is not None:
+            entry = self._disk.get_entry(key)
+            if entry is not None and entry[1] <= self.ttl:
+                value, age = entry
+                self._memory_set(key, value, time.time() - age)
+                self._count("disk_hits")
+                return value
+        return None
+
+    def set(self, key: str, value: Any) -> None:
+        self._memory_set(key, value, time.time())
+        if self._disk is not None:
+            self._disk.set(key, value)
+
+    def lookup(self, key: str, *, use_cache: bool = True) -> Optional[Any]:
+        """get + 통계 집계. use_cache=False면 읽지 않고 bypassed로 집계."""
+        if not use_cache:
+            self._count("bypassed")
+            return None
+        value = self.get(key)
+        if value is None:
+            self._count("misses")
+        return value
+
+    def store(self, key: str, value: Any, load_seconds: float) -> None:
+        """lookup 미스 후 직접 불러온 값 저장 (스트리밍처럼 loader 함수로 감싸기 어려운 경우)."""
+        self._count("load_seconds", load_seconds)
+        if value is not None:
+            self.set(key, value)
+
+    def get_or_load(self, key: str, loader: Callable[[], Any], *, use_cache: bool = True) -> Any:
+        """use_cache=False면 캐시를 읽지 않고 새로 호출하되 결과는 저장(다음 일반 요청이 재사용)."""
+        value = self.lookup(key, use_cache=use_cache)
+        if value is not None:
+            return value
+        started = time.perf_counter()
+        value = loader()
+        self.store(key, value, time.perf_counter() - started)
+        return value
+
+    def clear_memory(self) -> None:
+        with self._lock:
+            self._memory.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_entries"] = len(self._memory)
+        loads = stats["misses"] + stats["bypassed"]
+        avg_load = stats["load_seconds"] / loads if loads else 0.0
+        served = stats["memory_hits"] + stats["disk_hits"]
+        lookups = served + stats["misses"]
+        stats["hit_rate"] = round(served / lookups, 4) if lookups else 0.0
+        stats["avg_load_seconds"] = round(avg_load, 4)
+        # 캐시로 응답한 횟수 x 평균 모델 호출 지연 = 아낀 지연 추정치
+        stats["saved_seconds_estimate"] = round(served * avg_load, 3)
+        stats["load_seconds"] = round(stats["load_seconds"], 3)
+        return stats
+
+
+_cache: Optional[LLMResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    global _cache
+    if not LLM_CACHE_ENABLED:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = LLMResponseCache(LLM_CACHE_PATH)
+    return _cache
+
+
+def llm_cache_stats() -> Dict[str, Any]:
+    cache = get_llm_cache()
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.stats()}
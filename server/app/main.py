@@ -1,20 +1,40 @@
+from concurrent.futures import ThreadPoolExecutor
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from dotenv import load_dotenv
+import json
+import logging
+import os
 import re
+import threading
+import time
 
 load_dotenv()
 
+from app.breaker import CircuitOpenError, breaker_stats
+from app.codes import AREA_CODE, TYPE_TO_CONTENTTYPEID
+from app.edit_command import parse_edit_command
 from app.schemas import FrontPlanRequest, PlaceCandidate, ResponseDto
-from app.tourapi import area_based_list2
+from app.singleflight import singleflight_stats
+from app.latency import LatencyTracker, latency_stats
+from app.llm_cache import llm_cache_stats
+from app.metrics import render as render_metrics
+from app.model_client import model_client_stats
+from app.planner import local_planner_stats
+from app.relevance import relevance_stats
+from app.title_index import title_index_stats
+from app.place_store import ALL_TYPES, get_place_store, store_stats
+from app.tourapi import cache_stats, iter_area_based_list2_pages
 from app.ai import (
     apply_schedule_edit_locally,
     build_plan_from_front,
-    has_add_intent,
-    has_edit_intent,
-    has_replan_intent,
+    model_stats,
+    stream_plan_from_front,
 )
 
+logger = logging.getLogger(__name__)
+
 app = FastAPI(title="PlanMyTrip")
 
 app.add_middleware(
@@ -29,26 +49,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-AREA_CODE = {
-    "서울": 1, "인천": 2, "대전": 3, "대구": 4, "광주": 5, "부산": 6, "울산": 7, "세종": 8,
-    "경기": 31, "강원": 32, "충북": 33, "충남": 34, "경북": 35, "경남": 36, "전북": 37, "전남": 38, "제주": 39,
-}
-
-TYPE_TO_CONTENTTYPEID = {
-    "관광": 12,
-    "관광지": 12,
-    "문화시설": 14,
-    "문화": 14,
-    "축제공연행사": 15,
-    "축제": 15,
-    "공연": 15,
-    "행사": 15,
-    "쇼핑": 38,
-    "숙박": 32,
-    "음식점": 39,
-    "음식": 39,
-    "맛집": 39,
-}
+# 콘텐츠 유형별 TourAPI 호출을 동시에 보내되, 전체 요청이 공유하는 풀로 업스트림 동시 호출 수를 제한
+TOURAPI_MAX_CONCURRENCY = int(os.getenv("TOURAPI_MAX_CONCURRENCY", "8"))
+_tourapi_executor = ThreadPoolExecutor(max_workers=TOURAPI_MAX_CONCURRENCY, thread_name_prefix="tourapi")
+
+_plan_latency = LatencyTracker("plan.total")
+# 스트리밍: 첫 day 이벤트까지(체감 대기 시간)와 스트림 종료까지를 따로 집계
+_stream_first_day_latency = LatencyTracker("plan_stream.first_day")
+_stream_total_latency = LatencyTracker("plan_stream.total")
 
 
 def _pick_area_code(region: str) -> int:
@@ -77,11 +85,15 @@ def _pick_content_type_ids(travelType) -> list[int]:
     return out
 
 
+def _dedup_key(p) -> str:
+    return p.dedup_key
+
+
 def _dedup(places):
     seen = set()
     out = []
     for p in places:
-        key = p.contentid or f"{p.title}|{p.mapy}|{p.mapx}"
+        key = _dedup_key(p)
         if key in seen:
             continue
         seen.add(key)
@@ -109,57 +121,132 @@ def _schedule_to_candidates(current_schedule):
     return out
 
 
+def _run_concurrently(fn, args: list) -> list:
+    """fn(arg)를 공유 풀에서 동시에 실행하고 args 순서대로 결과 반환."""
+    if len(args) == 1:
+        return [fn(args[0])]
+    futures = [_tourapi_executor.submit(fn, arg) for arg in args]
+    return [future.result() for future in futures]
+
+
+def _open_page_stream(*, area_code: int, content_type_id, **kwargs):
+    """동기화된 장소 저장소가 신선하면 저장소에서, 아니면 실시간 TourAPI에서 페이지를 읽음."""
+    store = get_place_store()
+    store_type = ALL_TYPES if content_type_id is None else content_type_id
+    if store is not None and store.is_fresh(area_code, store_type):
+        return store.iter_pages(area_code=area_code, content_type_id=content_type_id, **kwargs)
+    return iter_area_based_list2_pages(area_code=area_code, content_type_id=content_type_id, **kwargs)
+
+
+def _stream_places(
+    area_code: int,
+    ctype_ids: list,
+    *,
+    page_size: int,
+    max_rows: int,
+    target: int,
+    seed: list | None = None,
+) -> list[PlaceCandidate]:
+    """
+    유형별 페이지 스트림을 동시에 소비하면서 중복 제거 후보가 target 개가 되면 다음 페이지 요청을 중단.
+    - 첫 페이지는 모든 유형에서 받음(유형 다양성 유지)
+    - 결과 순서: seed -> 유형별 첫 페이지 -> 유형별 나머지 페이지 (기존 30건/80건 2단계 조회와 같은 순서)
+    """
+    seed = seed or []
+    lock = threading.Lock()
+    seen_keys = {_dedup_key(p) for p in seed}
+
+    def has_enough() -> bool:
+        with lock:
+            return len(seen_keys) >= target
+
+    def record(page: list[PlaceCandidate]) -> list[PlaceCandidate]:
+        with lock:
+            seen_keys.update(_dedup_key(p) for p in page)
+        return page
+
+    streams = [
+        _open_page_stream(
+            area_code=area_code,
+            content_type_id=ctid,
+            page_size=page_size,
+            max_rows=max_rows,
+            should_continue=lambda: not has_enough(),
+        )
+        for ctid in ctype_ids
+    ]
+
+    first_pages = _run_concurrently(lambda stream: record(next(stream, [])), streams)
+
+    def drain(stream) -> list[PlaceCandidate]:
+        out = []
+        for page in stream:
+            out.extend(record(page))
+        return out
+
+    if has_enough():
+        for stream in streams:
+            stream.close()
+        rest_pages = [[] for _ in streams]
+    else:
+        rest_pages = _run_concurrently(drain, streams)
+
+    ordered = list(seed)
+    for page in first_pages:
+        ordered.extend(page)
+    for rest in rest_pages:
+        ordered.extend(rest)
+    return _dedup(ordered)
+
+
 def _collect_places(area_code: int, ctype_ids: list[int], min_candidates: int = 12):
+    try:
+        return _collect_live_places(area_code, ctype_ids, min_candidates)
+    except CircuitOpenError:
+        logger.warning("TourAPI circuit open, serving stored places area=%s types=%s", area_code, ctype_ids)
+        return _collect_stored_places(area_code, ctype_ids)
+
+
+def _collect_stored_places(area_code: int, ctype_ids: list[int], limit: int = 80) -> list[PlaceCandidate]:
+    """TourAPI 장애(회로 open) 시 신선도와 무관하게 장소 저장소의 후보로 응답."""
+    store = get_place_store()
+    if store is None:
+        return []
     places = []
+    for ctid in ctype_ids or [ALL_TYPES]:
+        places.extend(store.query(area_code, ctid, limit=limit))
+    return _dedup(places)
 
+
+def _collect_live_places(area_code: int, ctype_ids: list[int], min_candidates: int):
     if ctype_ids:
-        for ctid in ctype_ids:
-            places.extend(
-                area_based_list2(
-                    area_code=area_code,
-                    content_type_id=ctid,
-                    num_of_rows=30,
-                )
-            )
-        places = _dedup(places)
-
-        if len(places) < min_candidates:
-            for ctid in ctype_ids:
-                places.extend(
-                    area_based_list2(
-                        area_code=area_code,
-                        content_type_id=ctid,
-                        num_of_rows=80,
-                    )
-                )
-            places = _dedup(places)
+        places = _stream_places(
+            area_code,
+            ctype_ids,
+            page_size=30,
+            max_rows=80,
+            target=min_candidates,
+        )
 
         # 선택한 유형의 후보가 극단적으로 적을 때만 전체 유형으로 보강
         if len(places) < max(6, min_candidates // 2):
-            places = _dedup(
-                places
-                + area_based_list2(
-                    area_code=area_code,
-                    content_type_id=None,
-                    num_of_rows=80,
-                )
+            places = _stream_places(
+                area_code,
+                [None],
+                page_size=30,
+                max_rows=80,
+                target=min_candidates,
+                seed=places,
             )
         return places
 
-    places = area_based_list2(area_code=area_code, content_type_id=None, num_of_rows=50)
-    places = _dedup(places)
-
-    if len(places) < min_candidates:
-        places = _dedup(
-            places
-            + area_based_list2(
-                area_code=area_code,
-                content_type_id=None,
-                num_of_rows=80,
-            )
-        )
-
-    return places
+    return _stream_places(
+        area_code,
+        [None],
+        page_size=50,
+        max_rows=80,
+        target=min_candidates,
+    )
 
 
 @app.get("/health")
@@ -167,62 +254,143 @@ def health():
     return {"ok": True}
 
 
+@app.get("/stats")
+def stats():
+    return {
+        "tourapiCache": cache_stats(),
+        "placeStore": store_stats(),
+        "singleflight": singleflight_stats(),
+        "circuitBreakers": breaker_stats(),
+        "llmCache": llm_cache_stats(),
+        "latency": latency_stats(),
+        "model": model_stats(),
+        "modelClient": model_client_stats(),
+        "localPlanner": local_planner_stats(),
+        "relevanceIndex": relevance_stats(),
+        "titleIndex": title_index_stats(),
+    }
+
+
+@app.get("/metrics")
+def metrics():
+    """Prometheus 텍스트 형식. 모델 호출 지표 + /stats 숫자 값(app_stats 게이지)."""
+    return PlainTextResponse(render_metrics(stats()), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+def _prepare_plan(req: FrontPlanRequest):
+    """
+    로컬 수정/후보 수집까지 처리. 바로 응답할 수 있으면 ResponseDto,
+    모델 호출이 필요하면 build_plan_from_front/stream_plan_from_front 인자 dict 반환.
+    """
+    area_code = _pick_area_code(req.region)
+    ctype_ids = _pick_content_type_ids(req.travelType)
+    current_schedule = req.currentSchedule or []
+    current_schedule_dict = [d.model_dump() for d in current_schedule]
+    current_schedule_candidates = _dedup(_schedule_to_candidates(current_schedule))
+    # 의도/삭제/추가 요청은 한 번만 파싱 (apply_schedule_edit_locally도 같은 결과를 캐시에서 씀)
+    command = parse_edit_command(req.userInput)
+    is_replan = command.replan
+
+    # 기존 일정이 있을 때는 기본적으로 "수정 모드"로 처리해서 완전히 새 일정으로 바뀌지 않게 보호
+    if current_schedule and not is_replan and command.edit:
+        # 기존 일정 장소만으로 먼저 시도 (오타난 기존 장소 이름도 근사 검색으로 맞춰 후보를 다시 가져오지 않음)
+        local_edited = apply_schedule_edit_locally(
+            user_input=req.userInput,
+            current_schedule=current_schedule_dict,
+            places=current_schedule_candidates,
+        )
+        if local_edited is not None:
+            if (
+                command.add
+                and "추가 후보를 찾지 못함" in (local_edited.text or "")
+            ):
+                fetched_places = _collect_places(area_code=area_code, ctype_ids=ctype_ids)
+                retry_edited = apply_schedule_edit_locally(
+                    user_input=req.userInput,
+                    current_schedule=current_schedule_dict,
+                    places=_dedup(current_schedule_candidates + fetched_places),
+                )
+                if retry_edited is not None:
+                    return retry_edited
+            return local_edited
+
+        return ResponseDto(
+            text="수정 요청을 이해하지 못했어요. 예: '해운대 삭제', '2일차에 감천문화마을 추가'",
+            travelSchedule=current_schedule_dict,
+        )
+
+    places = _collect_places(area_code=area_code, ctype_ids=ctype_ids)
+
+    if current_schedule and not is_replan:
+        places = _dedup(places + current_schedule_candidates)
+
+    if not places:
+        return ResponseDto(text="TourAPI에서 좌표 있는 장소 후보를 찾지 못했어요.", travelSchedule=[])
+
+    return {
+        "user_input": req.userInput,
+        "date_str": req.date,
+        "region": req.region,
+        "travel_type": req.travelType,
+        "transportation": req.transportation,
+        "companions": req.companions,
+        "pace": req.pace,
+        "places": places,
+        "current_schedule": [] if is_replan else current_schedule_dict,
+        "use_cache": not req.noCache,
+        "fast": req.fast,
+    }
+
+
 @app.post("/v1/plan", response_model=ResponseDto)
 def plan(req: FrontPlanRequest):
+    started = time.perf_counter()
     try:
-        area_code = _pick_area_code(req.region)
-        ctype_ids = _pick_content_type_ids(req.travelType)
-        current_schedule = req.currentSchedule or []
-        current_schedule_dict = [d.model_dump() for d in current_schedule]
-        current_schedule_candidates = _dedup(_schedule_to_candidates(current_schedule))
-        is_replan = has_replan_intent(req.userInput)
-
-        # 기존 일정이 있을 때는 기본적으로 "수정 모드"로 처리해서 완전히 새 일정으로 바뀌지 않게 보호
-        if current_schedule and not is_replan and has_edit_intent(req.userInput):
-            local_edited = apply_schedule_edit_locally(
-                user_input=req.userInput,
-                current_schedule=current_schedule_dict,
-                places=current_schedule_candidates,
-            )
-            if local_edited is not None:
-                if (
-                    has_add_intent(req.userInput)
-                    and "추가 후보를 찾지 못함" in (local_edited.text or "")
-                ):
-                    fetched_places = _collect_places(area_code=area_code, ctype_ids=ctype_ids)
-                    retry_edited = apply_schedule_edit_locally(
-                        user_input=req.userInput,
-                        current_schedule=current_schedule_dict,
-                        places=_dedup(current_schedule_candidates + fetched_places),
-                    )
-                    if retry_edited is not None:
-                        return retry_edited
-                return local_edited
-
-            return ResponseDto(
-                text="수정 요청을 이해하지 못했어요. 예: '해운대 삭제', '2일차에 감천문화마을 추가'",
-                travelSchedule=current_schedule_dict,
-            )
+        prepared = _prepare_plan(req)
+        if isinstance(prepared, ResponseDto):
+            return prepared
+        return build_plan_from_front(**prepared)
 
-        places = _collect_places(area_code=area_code, ctype_ids=ctype_ids)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        _plan_latency.observe(time.perf_counter() - started)
 
-        if current_schedule and not is_replan:
-            places = _dedup(places + current_schedule_candidates)
 
-        if not places:
-            return ResponseDto(text="TourAPI에서 좌표 있는 장소 후보를 찾지 못했어요.", travelSchedule=[])
+def _sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
 
-        return build_plan_from_front(
-            user_input=req.userInput,
-            date_str=req.date,
-            region=req.region,
-            travel_type=req.travelType,
-            transportation=req.transportation,
-            companions=req.companions,
-            pace=req.pace,
-            places=places,
-            current_schedule=[] if is_replan else current_schedule_dict,
-        )
 
+def _plan_stream_events(req: FrontPlanRequest):
+    """
+    SSE 이벤트 순서: candidates -> model_started -> day(완성되는 대로) ... -> done(최종 ResponseDto)
+    실패하면 error 이벤트로 끝남. 첫 day까지 걸린 시간은 전체 지연과 따로 집계.
+    """
+    started = time.perf_counter()
+    first_day = True
+    try:
+        prepared = _prepare_plan(req)
+        if isinstance(prepared, ResponseDto):
+            yield _sse("done", prepared.model_dump())
+            return
+
+        yield _sse("candidates", {"count": len(prepared["places"]), "seconds": round(time.perf_counter() - started, 3)})
+        for event, data in stream_plan_from_front(**prepared):
+            if event == "day" and first_day:
+                first_day = False
+                _stream_first_day_latency.observe(time.perf_counter() - started)
+            yield _sse(event, data)
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        logger.exception("plan stream failed")
+        yield _sse("error", {"detail": str(e)})
+    finally:
+        _stream_total_latency.observe(time.perf_counter() - started)
+
+
+@app.post("/v1/plan/stream")
+def plan_stream(req: FrontPlanRequest):
+    return StreamingResponse(
+        _plan_stream_events(req),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,146 @@
+"""
+Prometheus 텍스트 형식(0.0.4) 지표. 외부 의존성 없이 Counter/Histogram만 최소 구현.
+
+    calls = Counter("plan_model_calls_total", "모델 호출 수", ["mode", "outcome"])
+    calls.inc(mode="new", outcome="ok")
+    render()  # GET /metrics 응답 본문
+
+라벨 값은 카디널리티가 작은 것만 (모드/지역/페이스/후보 수 구간 등).
+"""
+import math
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+_registry: Dict[str, "_Metric"] = {}
+_registry_lock = threading.Lock()
+
+LabelKey = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        with _registry_lock:
+            _registry[name] = self
+
+    def _key(self, labels: Dict[str, Any]) -> LabelKey:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name}: labels {sorted(labels)} != {sorted(self.labelnames)}")
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        return "\n".join(lines + self._samples())
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelKey, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: Any) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}" for k, v in items]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, buckets: Sequence[float], labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        # 라벨 조합별 [버킷별 개수(누적 아님)..., 합계]
+        self._values: Dict[LabelKey, List[float]] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        index = next(i for i, bound in enumerate(self.buckets) if value <= bound)
+        with self._lock:
+            row = self._values.setdefault(key, [0.0] * (len(self.buckets) + 1))
+            row[index] += 1
+            row[-1] += value
+
+    def count(self, **labels: Any) -> int:
+        with self._lock:
+            row = self._values.get(self._key(labels))
+        return int(sum(row[:-1])) if row else 0
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._values.items())
+        lines = []
+        for key, row in items:
+            cumulative = 0.0
+            for bound, n in zip(self.buckets, row):
+                cumulative += n
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {_format_value(cumulative)}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(row[-1])}")
+            lines.append(f"{self.name}_count{labels} {_format_value(cumulative)}")
+        return lines
+
+
+def _flatten(prefix: str, value: Any, out: List[Tuple[str, float]]) -> None:
+    if isinstance(value, (int, float)):  # bool 포함
+        out.append((prefix, float(value)))
+    elif isinstance(value, dict):
+        for k, v in value.items():
+            _flatten(f"{prefix}.{k}" if prefix else str(k), v, out)
+
+
+def render(stats: Optional[Dict[str, Any]] = None) -> str:
+    """
+    등록된 지표 전체를 Prometheus 텍스트로. stats(/stats 응답 dict)를 주면 숫자 값을
+    app_stats{section="...", key="..."} 게이지로 함께 내보냄 (캐시/서킷 브레이커/지연 등 기존 지표).
+    """
+    with _registry_lock:
+        metrics = list(_registry.values())
+    blocks = [m.render() for m in metrics]
+
+    if stats:
+        lines = ["# HELP app_stats GET /stats 숫자 값", "# TYPE app_stats gauge"]
+        for section, value in stats.items():
+            flat: List[Tuple[str, float]] = []
+            _flatten("", value, flat)
+            for key, number in flat:
+                lines.append(f"app_stats{_format_labels(('section', 'key'), (section, key))} {_format_value(number)}")
+        blocks.append("\n".join(lines))
+    return "\n".join(blocks) + "\n"
@@ -0,0 +1,213 @@
+"""
+OpenAI 호출 계층. 모든 요청을 백그라운드 스레드의 이벤트 루프 하나에서 AsyncOpenAI 클라이언트 하나로 보냄.
+
+- 연결 풀: 요청/스레드마다 클라이언트를 만들지 않고 루프 하나의 AsyncOpenAI(httpx 풀)를 공유
+- 마감 시간(deadline): 호출 하나(헤징/대기 포함)가 넘지 못하는 시간. 넘으면 요청을 취소하고 TimeoutError.
+  호출마다 더 짧게 줄 수 있음 (complete/stream의 deadline: 일정 생성 예산이 끝나면 호출도 같이 끝나도록)
+- 동시 호출 상한: 넘는 호출은 세마포어에서 대기하고 대기 시간은 "<name>.queue" 지연 지표로 집계
+- 헤징: 최근 응답 p95가 지나도 첫 요청이 안 끝나면 같은 요청을 하나 더 보내 먼저 온 응답을 씀.
+  샘플이 충분히 쌓이기 전이나 동시 호출 상한이 꽉 찼을 때는 보내지 않음 (부하를 더 키우지 않도록)
+
+API 핸들러와 일정 생성 로직은 동기 코드라 complete()/stream()은 루프에 코루틴을 넘기고 결과를 기다리는 동기 함수.
+"""
+import asyncio
+import logging
+import os
+import queue
+import threading
+import time
+from typing import Any, Dict, Iterator, Optional
+
+from openai import AsyncOpenAI
+
+from app.latency import LatencyTracker
+
+logger = logging.getLogger(__name__)
+
+MODEL_DEADLINE_SECONDS = float(os.getenv("OPENAI_DEADLINE_SECONDS", "45"))
+MODEL_MAX_CONCURRENCY = int(os.getenv("OPENAI_MAX_CONCURRENCY", "16"))
+HEDGE_ENABLED = os.getenv("OPENAI_HEDGE", "1") not in ("0", "false", "False", "")
+HEDGE_PERCENTILE = float(os.getenv("OPENAI_HEDGE_PERCENTILE", "0.95"))
+HEDGE_MIN_SAMPLES = int(os.getenv("OPENAI_HEDGE_MIN_SAMPLES", "20"))
+
+_registry: Dict[str, "ModelClient"] = {}
+
+_DONE = object()
+
+
+class _StreamError:
+    __slots__ = ("error",)
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+class ModelClient:
+    def __init__(
+        self,
+        name: str,
+        *,
+        api_key: str,
+        base_url: Optional[str] = None,
+        deadline: float = MODEL_DEADLINE_SECONDS,
+        max_concurrency: int = MODEL_MAX_CONCURRENCY,
+        hedge: bool = HEDGE_ENABLED,
+    ):
+        self.name = name
+        self.api_key = api_key
+        self.base_url = base_url
+        self.deadline = deadline
+        self.hedge = hedge
+        self.queue_latency = LatencyTracker(f"{name}.queue")
+        self.call_latency = LatencyTracker(f"{name}.completion")
+        self._max_concurrency = max_concurrency
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._client: Optional[AsyncOpenAI] = None
+        self._in_flight = 0
+        self._stats = {"calls": 0, "streams": 0, "hedged": 0, "hedge_wins": 0, "deadline_exceeded": 0, "errors": 0}
+        _registry[name] = self
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name=f"{self.name}-loop", daemon=True).start()
+                # 클라이언트(연결 풀)는 이 루프에서만 사용
+                self._client = AsyncOpenAI(api_key=self.api_key, base_url=self.base_url, timeout=self.deadline)
+                self._loop = loop
+            return self._loop
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    def _deadline(self, deadline: Optional[float]) -> float:
+        return self.deadline if deadline is None else max(0.0, min(self.deadline, deadline))
+
+    def _hedge_delay(self) -> Optional[float]:
+        if not self.hedge or self.call_latency.stats()["count"] < HEDGE_MIN_SAMPLES:
+            return None
+        return self.call_latency.percentile(HEDGE_PERCENTILE)
+
+    async def _acquire(self) -> None:
+        queued = time.perf_counter()
+        await self._semaphore.acquire()
+        self.queue_latency.observe(time.perf_counter() - queued)
+        with self._lock:
+            self._in_flight += 1
+
+    def _release(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+        self._semaphore.release()
+
+    async def _attempt(self, kwargs: Dict[str, Any]) -> Any:
+        await self._acquire()
+        try:
+            started = time.perf_counter()
+            resp = await self._client.chat.completions.create(**kwargs)
+            self.call_latency.observe(time.perf_counter() - started)
+            return resp
+        finally:
+            self._release()
+
+    async def _complete(self, kwargs: Dict[str, Any], deadline: float) -> Any:
+        tasks = []
+        try:
+            async with asyncio.timeout(deadline):
+                first = asyncio.ensure_future(self._attempt(kwargs))
+                tasks.append(first)
+                delay = self._hedge_delay()
+                if delay is None:
+                    return await first
+
+                done, _ = await asyncio.wait({first}, timeout=delay)
+                if done or self._semaphore.locked():
+                    return await first
+
+                self._count("hedged")
+                second = asyncio.ensure_future(self._attempt(kwargs))
+                tasks.append(second)
+                pending = {first, second}
+                error: Optional[BaseException] = None
+                while pending:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        if task.exception() is None:
+                            if task is second:
+                                self._count("hedge_wins")
+                            return task.result()
+                        error = error or task.exception()
+                raise error
+        except TimeoutError:
+            self._count("deadline_exceeded")
+            raise
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def complete(self, *, deadline: Optional[float] = None, **kwargs: Any) -> Any:
+        """
+        chat.completions.create와 같은 인자. 마감 시간을 넘기면 TimeoutError.
+        deadline(초)을 주면 이 호출만 그 시간 안에 끝냄 (클라이언트 마감 시간보다 길게는 못 늘림).
+        """
+        loop = self._ensure_loop()
+        self._count("calls")
+        try:
+            return asyncio.run_coroutine_threadsafe(self._complete(kwargs, self._deadline(deadline)), loop).result()
+        except TimeoutError:
+            raise
+        except Exception:
+            self._count("errors")
+            raise
+
+    async def _pump_stream(self, kwargs: Dict[str, Any], deadline: float, out: "queue.Queue[Any]") -> None:
+        try:
+            async with asyncio.timeout(deadline):
+                await self._acquire()
+                try:
+                    stream = await self._client.chat.completions.create(stream=True, **kwargs)
+                    async for chunk in stream:
+                        out.put(chunk)
+                finally:
+                    self._release()
+        except TimeoutError as e:
+            self._count("deadline_exceeded")
+            out.put(_StreamError(e))
+        except Exception as e:
+            self._count("errors")
+            out.put(_StreamError(e))
+        finally:
+            out.put(_DONE)
+
+    def stream(self, *, deadline: Optional[float] = None, **kwargs: Any) -> Iterator[Any]:
+        """stream=True 호출의 청크를 순서대로 yield (헤징 없음). 중간에 그만 읽으면 요청도 취소. deadline은 complete와 같음."""
+        loop = self._ensure_loop()
+        self._count("streams")
+        out: "queue.Queue[Any]" = queue.Queue()
+        future = asyncio.run_coroutine_threadsafe(self._pump_stream(kwargs, self._deadline(deadline), out), loop)
+        try:
+            while True:
+                item = out.get()
+                if item is _DONE:
+                    return
+                if isinstance(item, _StreamError):
+                    raise item.error
+                yield item
+        finally:
+            future.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            out: Dict[str, Any] = dict(self._stats)
+            out["in_flight"] = self._in_flight
+        out["max_concurrency"] = self._max_concurrency
+        out["hedge_delay_seconds"] = round(self._hedge_delay() or 0.0, 4)
+        out["queue_p95_seconds"] = self.queue_latency.stats()["p95_seconds"]
+        return out
+
+
+def model_client_stats() -> Dict[str, Dict[str, Any]]:
+    return {name: client.stats() for name, client in _registry.items()}
@@ -0,0 +1,291 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from app.schemas import PlaceCandidate, PlaceCandidateList
+
+# 지역 x 콘텐츠 유형별로 미리 내려받아 둔 장소 저장소 (python -m app.sync_places 로 채움)
+STORE_ENABLED = os.getenv("PLACE_STORE_ENABLED", "1") not in ("0", "false", "False", "")
+STORE_PATH = os.getenv("PLACE_STORE_PATH", "data/places.sqlite3")
+# 이보다 오래된 조합은 미스로 보고 실시간 TourAPI 호출
+STORE_MAX_AGE = float(os.getenv("PLACE_STORE_MAX_AGE", str(7 * 86400)))
+
+# content_type_id=None(전체 유형) 조회를 저장할 때 쓰는 값
+ALL_TYPES = 0
+
+_COLUMNS = ("title", "addr1", "firstimage", "mapy", "mapx", "contentid", "contenttypeid", "modifiedtime")
+
+
+class PlaceStore:
+    """
+    SQLite 장소 저장소.
+
+    places: (area_code, content_type_id, contentid) 단위 장소 행. rank는 조회순(arrange=B) 순위.
+    sync_state: 조합별 동기화 상태. 전체 동기화는 페이지마다 next_page를 커밋해서 중단돼도 이어서 진행.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        conn = self._conn()
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS places (
+                area_code INTEGER NOT NULL,
+                content_type_id INTEGER NOT NULL,
+                contentid TEXT NOT NULL,
+                rank INTEGER NOT NULL,
+                generation INTEGER NOT NULL,
+                title TEXT NOT NULL,
+                addr1 TEXT NOT NULL DEFAULT '',
+                firstimage TEXT NOT NULL DEFAULT '',
+                mapy REAL NOT NULL,
+                mapx REAL NOT NULL,
+                contenttypeid TEXT,
+                modifiedtime TEXT,
+                PRIMARY KEY (area_code, content_type_id, contentid)
+            );
+            CREATE INDEX IF NOT EXISTS idx_places_rank ON places (area_code, content_type_id, rank);
+            CREATE TABLE IF NOT EXISTS sync_state (
+                area_code INTEGER NOT NULL,
+                content_type_id INTEGER NOT NULL,
+                status TEXT NOT NULL,
+                generation INTEGER NOT NULL DEFAULT 0,
+                next_page INTEGER NOT NULL DEFAULT 1,
+                total_count INTEGER NOT NULL DEFAULT 0,
+                watermark TEXT NOT NULL DEFAULT '',
+                synced_at REAL,
+                PRIMARY KEY (area_code, content_type_id)
+            );
+            """
+        )
+        conn.commit()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    # ---- 조회 ----
+
+    def get_state(self, area_code: int, content_type_id: int) -> Optional[Dict[str, Any]]:
+        row = self._conn().execute(
+            "SELECT * FROM sync_state WHERE area_code = ? AND content_type_id = ?",
+            (area_code, content_type_id),
+        ).fetchone()
+        return dict(row) if row else None
+
+    def is_fresh(self, area_code: int, content_type_id: int, max_age: float = STORE_MAX_AGE) -> bool:
+        state = self.get_state(area_code, content_type_id)
+        if not state or not state.get("synced_at"):
+            return False
+        return time.time() - state["synced_at"] <= max_age
+
+    def query(self, area_code: int, content_type_id: int, *, limit: int, offset: int = 0) -> List[PlaceCandidate]:
+        rows = self._conn().execute(
+            f"SELECT {', '.join(_COLUMNS)} FROM places"
+            " WHERE area_code = ? AND content_type_id = ?"
+            " ORDER BY rank LIMIT ? OFFSET ?",
+            (area_code, content_type_id, limit, offset),
+        ).fetchall()
+        return PlaceCandidateList.validate_python([dict(row) for row in rows])
+
+    def iter_pages(
+        self,
+        *,
+        area_code: int,
+        content_type_id: Optional[int] = None,
+        page_size: int = 30,
+        max_rows: int = 80,
+        should_continue: Optional[Callable[[], bool]] = None,
+    ) -> Iterator[List[PlaceCandidate]]:
+        """tourapi.iter_area_based_list2_pages와 같은 방식으로 저장소에서 페이지를 yield."""
+        ctid = ALL_TYPES if content_type_id is None else content_type_id
+        page_no = 1
+        while (page_no - 1) * page_size < max_rows:
+            if page_no > 1 and should_continue is not None and not should_continue():
+                return
+            page = self.query(area_code, ctid, limit=page_size, offset=(page_no - 1) * page_size)
+            yield page
+            if len(page) < page_size:
+                return
+            page_no += 1
+
+    def freshness(self) -> List[Dict[str, Any]]:
+        """지역별 동기화 신선도 (가장 오래된 유형 기준)."""
+        now = time.time()
+        rows = self._conn().execute(
+            "SELECT area_code, COUNT(*) AS types, MIN(synced_at) AS oldest, MAX(synced_at) AS newest,"
+            " SUM(status = 'in_progress') AS in_progress"
+            " FROM sync_state GROUP BY area_code ORDER BY area_code"
+        ).fetchall()
+        places = dict(
+            self._conn().execute("SELECT area_code, COUNT(*) FROM places GROUP BY area_code").fetchall()
+        )
+        out = []
+        for row in rows:
+            oldest = row["oldest"]
+            out.append(
+                {
+                    "areaCode": row["area_code"],
+                    "types": row["types"],
+                    "inProgress": row["in_progress"] or 0,
+                    "places": places.get(row["area_code"], 0),
+                    "oldestSyncedAt": oldest,
+                    "maxAgeSeconds": round(now - oldest, 1) if oldest else None,
+                }
+            )
+        return out
+
+    # ---- 동기화 ----
+
+    def begin_full_sync(self, area_code: int, content_type_id: int) -> Dict[str, Any]:
+        """
+        전체 동기화 시작. 진행 중인 전체 동기화가 있으면 그 상태를 그대로 반환(이어받기).
+        """
+        state = self.get_state(area_code, content_type_id)
+        if state and state["status"] == "in_progress":
+            return state
+
+        generation = (state["generation"] if state else 0) + 1
+        conn = self._conn()
+        conn.execute(
+            "INSERT INTO sync_state (area_code, content_type_id, status, generation, next_page, total_count, watermark, synced_at)"
+            " VALUES (?, ?, 'in_progress', ?, 1, 0, ?, ?)"
+            " ON CONFLICT (area_code, content_type_id) DO UPDATE SET"
+            " status = 'in_progress', generation = excluded.generation, next_page = 1",
+            (area_code, content_type_id, generation, state["watermark"] if state else "", state["synced_at"] if state else None),
+        )
+        conn.commit()
+        return self.get_state(area_code, content_type_id)
+
+    def write_full_page(
+        self,
+        area_code: int,
+        content_type_id: int,
+        rows: List[dict],
+        *,
+        generation: int,
+        rank_offset: int,
+        next_page: int,
+        total_count: int,
+    ) -> None:
+        """한 페이지 저장 + 진행 위치 갱신을 한 트랜잭션으로 커밋."""
+        conn = self._conn()
+        with conn:
+            for i, row in enumerate(rows):
+                self._upsert(conn, area_code, content_type_id, row, rank=rank_offset + i, generation=generation)
+            conn.execute(
+                "UPDATE sync_state SET next_page = ?, total_count = ? WHERE area_code = ? AND content_type_id = ?",
+                (next_page, total_count, area_code, content_type_id),
+            )
+
+    def finish_full_sync(self, area_code: int, content_type_id: int, generation: int) -> None:
+        conn = self._conn()
+        with conn:
+            # 이번 세대에서 다시 보이지 않은 장소는 삭제된 것으로 간주
+            conn.execute(
+                "DELETE FROM places WHERE area_code = ? AND content_type_id = ? AND generation < ?",
+                (area_code, content_type_id, generation),
+            )
+            conn.execute(
+                "UPDATE sync_state SET status = 'complete', synced_at = ?, watermark = ("
+                "  SELECT COALESCE(MAX(modifiedtime), '') FROM places WHERE area_code = ? AND content_type_id = ?)"
+                " WHERE area_code = ? AND content_type_id = ?",
+                (time.time(), area_code, content_type_id, area_code, content_type_id),
+            )
+
+    def apply_incremental(self, area_code: int, content_type_id: int, rows: List[dict], watermark: str) -> int:
+        """
+        수정일이 watermark 이후인 행만 반영. 기존 장소는 rank 유지, 새 장소는 맨 뒤 rank.
+        반영한 행 수 반환.
+        """
+        conn = self._conn()
+        state = self.get_state(area_code, content_type_id) or {}
+        generation = state.get("generation", 1)
+        changed = 0
+        with conn:
+            max_rank = conn.execute(
+                "SELECT COALESCE(MAX(rank), -1) FROM places WHERE area_code = ? AND content_type_id = ?",
+                (area_code, content_type_id),
+            ).fetchone()[0]
+            for row in rows:
+                if (row.get("modifiedtime") or "") <= watermark:
+                    continue
+                existing = conn.execute(
+                    "SELECT rank FROM places WHERE area_code = ? AND content_type_id = ? AND contentid = ?",
+                    (area_code, content_type_id, _contentid(row)),
+                ).fetchone()
+                if existing is not None:
+                    rank = existing[0]
+                else:
+                    max_rank += 1
+                    rank = max_rank
+                self._upsert(conn, area_code, content_type_id, row, rank=rank, generation=generation)
+                changed += 1
+
+            conn.execute(
+                "UPDATE sync_state SET synced_at = ?, watermark = MAX(watermark, ("
+                "  SELECT COALESCE(MAX(modifiedtime), '') FROM places WHERE area_code = ? AND content_type_id = ?))"
+                " WHERE area_code = ? AND content_type_id = ?",
+                (time.time(), area_code, content_type_id, area_code, content_type_id),
+            )
+        return changed
+
+    @staticmethod
+    def _upsert(conn: sqlite3.Connection, area_code: int, content_type_id: int, row: dict, *, rank: int, generation: int) -> None:
+        conn.execute(
+            "INSERT OR REPLACE INTO places"
+            " (area_code, content_type_id, contentid, rank, generation, title, addr1, firstimage, mapy, mapx, contenttypeid, modifiedtime)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                area_code,
+                content_type_id,
+                _contentid(row),
+                rank,
+                generation,
+                row.get("title") or "",
+                row.get("addr1") or "",
+                row.get("firstimage") or "",
+                float(row.get("mapy") or 0.0),
+                float(row.get("mapx") or 0.0),
+                row.get("contenttypeid"),
+                row.get("modifiedtime"),
+            ),
+        )
+
+
+def _contentid(row: dict) -> str:
+    return str(row.get("contentid") or f"{row.get('title')}|{row.get('mapy')}|{row.get('mapx')}")
+
+
+_store: Optional[PlaceStore] = None
+_store_lock = threading.Lock()
+
+
+def get_place_store() -> Optional[PlaceStore]:
+    """동기화된 저장소 파일이 있을 때만 반환 (요청 경로에서 빈 파일을 만들지 않음)."""
+    global _store
+    if not STORE_ENABLED or not os.path.exists(STORE_PATH):
+        return None
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = PlaceStore(STORE_PATH)
+    return _store
+
+
+def store_stats() -> Dict[str, Any]:
+    store = get_place_store()
+    if store is None:
+        return {"enabled": False}
+    return {"enabled": True, "areas": store.freshness()}
@@ -0,0 +1,141 @@
+"""
+모델 없이 후보 장소만으로 일정을 만드는 로컬 플래너.
+
+빠른 모드(요청의 fast=True)와, 모델 호출이 실패하거나 지연 예산을 넘겼을 때의 대체 응답에 씀.
+1) 이미지 있는 장소 우선 + 제목 중복 제거로 순위를 매기고 (ai._build_candidates와 같은 기준)
+2) 날짜 수 x 하루 장소 수의 2배까지만 뽑아 날짜별 지리 그룹으로 나눈 뒤 (geo.balanced_groups)
+3) 그룹마다 순위 높은 장소를 페이스(PACE_TARGETS)만큼 고르고, 박마다 그 날 장소에 가장 가까운 숙소를 붙이고
+4) 동선은 route.optimize_day_routes(최근접 이웃 + 2-opt, 이동 수단별 거리 예산)로 정하고 설명/활동은 콘텐츠 유형별 템플릿으로 채움
+
+후보 전체는 한 번만 훑고(O(n)) 군집/동선 계산은 고른 장소 수십 개에만 하므로 후보가 1만 개여도 수 ms 안에 끝남.
+"""
+import threading
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from app.codes import PACE_TARGETS, TYPE_TO_CONTENTTYPEID
+from app.geo import balanced_groups, haversine_to_point
+from app.route import day_budget_km, optimize_day_routes
+from app.schemas import PlaceCandidate, ResponseDto
+
+DEFAULT_PACE = "보통"
+LODGING_CONTENT_TYPE_ID = str(TYPE_TO_CONTENTTYPEID["숙박"])
+
+# contenttypeid -> (activity, description 템플릿)
+TEMPLATES: Dict[str, Tuple[str, str]] = {
+    "12": ("관광", "{title} 둘러보기"),
+    "14": ("문화 체험", "{title}에서 전시와 문화 즐기기"),
+    "15": ("축제·공연", "{title} 관람하기"),
+    "25": ("코스 여행", "{title} 코스 따라 걷기"),
+    "28": ("레포츠", "{title}에서 액티비티 즐기기"),
+    "32": ("숙박", "{title} 체크인 후 휴식"),
+    "38": ("쇼핑", "{title}에서 쇼핑하기"),
+    "39": ("식사", "{title}에서 식사하기"),
+}
+DEFAULT_TEMPLATE = ("관광", "{title} 방문하기")
+
+# 로컬 플래너로 만든 일정 수 (/stats). reason: "fast" | "fallback"
+_counts: Dict[str, int] = {}
+_counts_lock = threading.Lock()
+
+
+def local_planner_stats() -> Dict[str, int]:
+    with _counts_lock:
+        return dict(_counts)
+
+
+def _rank_places(places: Sequence[PlaceCandidate]) -> Tuple[List[PlaceCandidate], List[PlaceCandidate]]:
+    """(관광지 등, 숙소)로 나눠 각각 이미지 있는 장소 우선 + 원래 순서 유지, 제목 중복 제거."""
+    seen = set()
+    ranked: List[List[PlaceCandidate]] = [[], [], [], []]  # [일반/이미지, 일반/무이미지, 숙소/이미지, 숙소/무이미지]
+    for p in places:
+        if not p.title or p.title in seen:
+            continue
+        seen.add(p.title)
+        lodging = p.contenttypeid == LODGING_CONTENT_TYPE_ID
+        ranked[2 * lodging + (not p.firstimage)].append(p)
+    return ranked[0] + ranked[1], ranked[2] + ranked[3]
+
+
+def _plan_item(place: PlaceCandidate) -> Dict[str, Any]:
+    activity, description = TEMPLATES.get(place.contenttypeid or "", DEFAULT_TEMPLATE)
+    return {
+        "order": 0,  # 동선 정리 후 다시 매김
+        "place": place.title,
+        "description": description.format(title=place.title),
+        "activity": activity,
+        "address": place.addr1 or "",
+        "image": place.firstimage or "",
+        "latitude": place.mapy,
+        "longitude": place.mapx,
+    }
+
+
+def plan_locally(
+    places: Sequence[PlaceCandidate],
+    dates: List[str],
+    *,
+    pace: str = "",
+    region: str = "",
+    transportation: str = "",
+    text: str = "",
+    reason: str = "fast",
+) -> ResponseDto:
+    """
+    후보 장소만으로 날짜별 일정을 만듦. 하루 장소 수는 페이스 최대치(숙소 포함), 날짜 간 장소 중복 없음.
+    dates가 비어 있으면 날짜 없는 하루 일정. reason은 통계용("fast" | "fallback").
+    """
+    with _counts_lock:
+        _counts[reason] = _counts.get(reason, 0) + 1
+
+    dates = dates or [""]
+    n_days = len(dates)
+    min_per_day, per_day = PACE_TARGETS.get((pace or "").strip(), PACE_TARGETS[DEFAULT_PACE])
+    spots, lodgings = _rank_places(places)
+
+    # 군집은 상위 후보로만 (그룹마다 고를 여유를 두려고 필요한 수의 2배)
+    pool = spots[: n_days * per_day * 2]
+    groups = balanced_groups([p.mapy for p in pool], [p.mapx for p in pool], n_days) if pool else []
+
+    lodging_lats = np.array([p.mapy for p in lodgings], dtype=float)
+    lodging_lngs = np.array([p.mapx for p in lodgings], dtype=float)
+    lodging_free = np.ones(len(lodgings), dtype=bool)
+
+    schedule = []
+    night_lodgings = set()
+    for day_index, date in enumerate(dates):
+        group = groups[day_index] if day_index < len(groups) else []
+        # 마지막 날을 뺀 날(박)마다 숙소 1곳
+        night = day_index < n_days - 1 and bool(lodging_free.any())
+        day_spots = [pool[i] for i in group[: per_day - 1 if night else per_day]]
+
+        lodging = None
+        if night:
+            if day_spots:
+                lat = float(np.mean([p.mapy for p in day_spots]))
+                lng = float(np.mean([p.mapx for p in day_spots]))
+                dist = np.where(lodging_free, haversine_to_point(lodging_lats, lodging_lngs, lat, lng), np.inf)
+                pick = int(np.argmin(dist))
+            else:
+                pick = int(np.argmax(lodging_free))
+            lodging_free[pick] = False
+            lodging = lodgings[pick]
+            night_lodgings.add(lodging.title)
+
+        stops = day_spots + ([lodging] if lodging else [])
+        schedule.append({"day": f"Day {day_index + 1}", "date": date, "plan": [_plan_item(p) for p in stops]})
+
+    optimize_day_routes(
+        schedule,
+        lodging_titles=night_lodgings,
+        budget_km=day_budget_km(transportation),
+        min_stops=min_per_day,
+    )
+    for day in schedule:
+        for i, item in enumerate(day["plan"], start=1):
+            item["order"] = i
+
+    if not text:
+        text = f"{region + ' ' if region else ''}{n_days}일 일정을 가까운 장소끼리 묶어 동선 순서로 준비했어요."
+    return ResponseDto.model_validate({"text": text, "travelSchedule": schedule})
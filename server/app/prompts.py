@@ -0,0 +1,122 @@
+"""
+일정 생성 프롬프트의 고정 부분 (system 메시지).
+
+OpenAI 프롬프트 캐시는 요청 앞부분(prefix)이 바이트 단위로 같을 때만 맞으므로
+요청마다 바뀌지 않는 것(역할 설명, rules, 동행/페이스/이동 수단별 규칙 표, 예시 스키마)은 전부 system 메시지에 넣고
+모드(new/edit/day) x 예시 스키마 포함 여부별로 import 시 한 번만 직렬화해 둠.
+지역/날짜/후보/사용자 입력 등 요청마다 다른 값은 user 메시지(payload)로만 보냄.
+"""
+import json
+from typing import Any, Dict, List, Tuple
+
+from app.route import DEFAULT_DAY_BUDGET_KM, TRANSPORT_DAY_BUDGET_KM
+
+MODES = ("new", "edit", "day")
+
+RESPONSE_SCHEMA: Dict[str, Any] = {
+    "text": "string",
+    "travelSchedule": [
+        {
+            "day": "Day 1",
+            "date": "YYYY-MM-DD",
+            # 장소는 id로만 받고 주소/이미지/좌표/순서는 서버가 채움
+            "plan": [{"id": 1, "description": "string", "activity": "string"}],
+        }
+    ],
+}
+
+COMPANION_RULES: Dict[str, str] = {
+    "혼자": "혼자 여행에 적합한 장소 선택 — 혼밥 가능 식당, 산책로, 문화공간, 혼자 즐기기 좋은 명소 우선",
+    "커플": "커플 여행에 적합한 장소 선택 — 야경 명소, 감성 카페, 로맨틱한 분위기의 소규모 장소 우선",
+    "가족": "가족(어린이 동반) 여행에 적합한 장소 선택 — 어린이 친화 명소, 체험 프로그램, 넓고 안전한 공간 우선",
+    "친구들": "친구들과의 여행에 적합한 장소 선택 — 활동적이고 재미있는 명소, 단체 식사 가능한 식당 우선",
+}
+PACE_RULES: Dict[str, str] = {
+    "여유롭게": "하루 2~3곳만 방문하고 각 장소에 충분한 시간을 배분할 것",
+    "보통": "하루 3~4곳을 균형 있게 배분할 것",
+    "알차게": "하루 4~5곳까지 방문하되 이동 시간을 고려해 동선을 최적화할 것",
+}
+# 이동 수단별 하루 직선 이동 거리 합 상한(km). 표에 없는 이동 수단은 "기타"
+DAY_DISTANCE_KM: Dict[str, float] = {**TRANSPORT_DAY_BUDGET_KM, "기타": DEFAULT_DAY_BUDGET_KM}
+
+_SHARED_RULES = [
+    "companions가 companion_rules에 있으면 그 규칙을 따를 것",
+    "pace가 pace_rules에 있으면 그 규칙을 따를 것",
+]
+
+_NEW_SYSTEM = (
+    "너는 감성 힐링 여행 플래너다.\n"
+    "반드시 입력 받은 지역(region)과 날짜(date_range)를 지켜서 일정을 만든다.\n"
+    "반드시 candidates 목록 안의 장소만 id로 사용한다(목록 밖 장소 금지).\n"
+    "반환은 오직 JSON만 출력한다(설명 문장/마크다운 금지).\n"
+)
+_NEW_RULES = [
+    "plan의 id는 candidates.id 중 하나여야 함",
+    "candidates.pos는 [위도, 경도], addr은 시/구 단위 주소",
+    "1박 이상이면 숙소 1개 포함",
+    "userInput의 키워드와 분위기를 최우선으로 반영하여 장소를 선택할 것",
+    "relevantIds는 userInput과 관련도가 높은 candidates.id(앞일수록 높음), 장소 선택 시 우선 고려",
+    "travelTypes에 맞지 않는 장소는 제외할 것",
+    "img가 0인 candidates는 img가 1인 candidates보다 낮은 우선순위로 선택",
+    "transportation이 '대중교통'이면 이동 거리가 짧고 접근성 좋은 장소 우선 선택",
+    "transportation이 '자가용'이면 드라이브 코스, 외곽 명소도 포함 가능",
+    "하루 장소 간 직선 이동 거리 합이 day_distance_km[transportation](없으면 '기타')km를 넘지 않게 가까운 장소끼리 묶을 것",
+    "pace가 '여유롭게'면 하루 2~3곳, '보통'이면 3~4곳, '알차게'면 4~5곳으로 구성",
+] + _SHARED_RULES
+
+_EDIT_SYSTEM = (
+    "너는 여행 일정 수정 전문가다.\n"
+    "baseSchedule을 기준으로 editRequest를 반영해 일정을 수정한다.\n"
+    "사용자가 언급하지 않은 장소/날짜는 최대한 유지한다.\n"
+    "새로 추가하는 장소는 반드시 candidates 중 하나를 id로 사용한다.\n"
+    "삭제 요청된 장소/키워드/지역은 결과 일정에서 제거한다.\n"
+    "반환은 오직 JSON만 출력한다(설명 문장/마크다운 금지).\n"
+)
+_EDIT_RULES = [
+    "baseSchedule의 day/date 구조는 가능하면 유지",
+    "plan의 id는 baseSchedule의 기존 장소 id 또는 candidates.id 중 하나",
+    "삭제 요청된 장소/지역은 결과 plan에서 제거",
+    "추가 요청은 해당 날짜(day/date 표현 포함)에 반영",
+    "relevantIds는 editRequest와 관련도가 높은 candidates.id(앞일수록 높음), 추가할 장소를 고를 때 우선 고려",
+    "text에는 어떤 수정이 반영됐는지 짧게 요약",
+] + _SHARED_RULES
+
+# 날짜별 병렬 생성: 새 일정 규칙 + 하루만 만들라는 규칙
+_DAY_RULES = _NEW_RULES + [
+    "전체 일정 중 dayOfTrip.day일차 하루만 생성: travelSchedule에는 day 1개만",
+    "text에는 이 날 일정을 한 문장으로 요약",
+]
+
+_MODE_PARTS: Dict[str, Tuple[str, List[str]]] = {
+    "new": (_NEW_SYSTEM, _NEW_RULES),
+    "edit": (_EDIT_SYSTEM, _EDIT_RULES),
+    "day": (_NEW_SYSTEM, _DAY_RULES),
+}
+
+
+def _render(mode: str, with_schema: bool) -> str:
+    intro, rules = _MODE_PARTS[mode]
+    static: Dict[str, Any] = {
+        "rules": rules,
+        "companion_rules": COMPANION_RULES,
+        "pace_rules": PACE_RULES,
+    }
+    if mode != "edit":
+        static["day_distance_km"] = DAY_DISTANCE_KM
+    if with_schema:
+        intro += "JSON 스키마는 response_schema를 따른다.\n"
+        static["response_schema"] = RESPONSE_SCHEMA
+    return intro + json.dumps(static, ensure_ascii=False, separators=(",", ":"))
+
+
+# (모드, 예시 스키마 포함 여부) -> system 메시지. 프로세스 내내 같은 문자열 객체를 씀
+_SYSTEM_PROMPTS: Dict[Tuple[str, bool], str] = {
+    (mode, with_schema): _render(mode, with_schema) for mode in MODES for with_schema in (False, True)
+}
+
+
+def system_prompt(mode: str, with_schema: bool = False) -> str:
+    """
+    고정 system 메시지. with_schema는 structured output을 끈 경우(응답 형식을 프롬프트 예시로만 알려줌).
+    """
+    return _SYSTEM_PROMPTS[(mode, with_schema)]
@@ -0,0 +1,137 @@
+"""
+후보 장소 관련도 사전 정렬용 BM25 역색인 (한국어 글자 bigram).
+
+제목/주소/콘텐츠 유형 이름을 문서로 색인해서 모델에 보낼 후보를 두 갈래로 고름 (ai._build_candidates).
+- 앞 목록: travelType + companions(relevance_query) 점수 상위 K개. 대화 중 거의 안 바뀌는 조건만 써서
+  같은 조건이면 같은 목록/순서 (프롬프트 캐시 prefix 유지)
+- 뒤쪽 자리: userInput 점수(scores)로 앞 목록 밖에서 맞는 장소만 붙이고 relevantIds로 알려 줌
+띄어쓰기/조사가 섞인 한국어 입력("바다가 보이는")도 bigram("바다")으로 맞음.
+
+같은 후보 집합이면 색인을 다시 만들지 않음 (get_index: 후보 집합 지문 기준 LRU, 수정 요청 간 재사용).
+"""
+import hashlib
+import math
+import re
+import threading
+from collections import Counter, OrderedDict
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from app.codes import TYPE_TO_CONTENTTYPEID
+from app.schemas import PlaceCandidate
+
+K1 = 1.2
+B = 0.75
+TITLE_WEIGHT = 2  # 제목 term은 주소/유형보다 가중
+
+_TOKEN_RE = re.compile(r"[0-9a-z가-힣]+")
+
+# contenttypeid -> 유형 이름들 (travelType 문자열과 같은 말로 색인)
+CONTENT_TYPE_NAMES: Dict[str, str] = {}
+for _name, _ctid in TYPE_TO_CONTENTTYPEID.items():
+    CONTENT_TYPE_NAMES[str(_ctid)] = f"{CONTENT_TYPE_NAMES.get(str(_ctid), '')} {_name}".strip()
+
+# 동행 유형별로 잘 맞는 장소 키워드 (검색어 확장)
+COMPANION_TERMS: Dict[str, str] = {
+    "혼자": "산책 카페 전시 미술관 서점",
+    "커플": "야경 카페 전망대 해변 공원",
+    "가족": "체험 공원 박물관 동물원 수목원",
+    "친구들": "시장 맛집 거리 테마파크 레포츠",
+}
+
+
+def terms(text: str) -> List[str]:
+    """소문자화 후 단어별 글자 bigram (한 글자 단어는 그대로)."""
+    out: List[str] = []
+    for word in _TOKEN_RE.findall((text or "").lower()):
+        if len(word) == 1:
+            out.append(word)
+        else:
+            out.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return out
+
+
+def relevance_query(travel_types: Sequence[str], companions: str) -> str:
+    """앞 목록 순위용 질의 (사용자 입력은 넣지 않음)."""
+    return " ".join([" ".join(travel_types), COMPANION_TERMS.get((companions or "").strip(), "")]).strip()
+
+
+class RelevanceIndex:
+    """places 순서를 문서 번호로 쓰는 BM25 역색인. 점수가 같으면 원래 순서 유지."""
+
+    def __init__(self, places: Sequence[PlaceCandidate]):
+        self.size = len(places)
+        postings: Dict[str, Dict[int, int]] = {}
+        doc_len = np.zeros(self.size)
+        for i, p in enumerate(places):
+            counts = Counter(terms(p.title) * TITLE_WEIGHT)
+            counts.update(terms(p.addr1))
+            counts.update(terms(CONTENT_TYPE_NAMES.get(p.contenttypeid or "", "")))
+            doc_len[i] = sum(counts.values())
+            for term, tf in counts.items():
+                postings.setdefault(term, {})[i] = tf
+
+        avg_len = float(doc_len.mean()) if self.size else 0.0
+        self._norm = K1 * (1 - B + B * doc_len / avg_len) if avg_len else np.full(self.size, K1)
+        self._postings: Dict[str, Tuple[np.ndarray, np.ndarray, float]] = {}
+        for term, docs in postings.items():
+            df = len(docs)
+            idf = math.log(1 + (self.size - df + 0.5) / (df + 0.5))
+            ids = np.fromiter(docs.keys(), dtype=np.intp, count=df)
+            tf = np.fromiter(docs.values(), dtype=float, count=df)
+            self._postings[term] = (ids, tf, idf)
+
+    def scores(self, query: str) -> np.ndarray:
+        out = np.zeros(self.size)
+        for term in set(terms(query)):
+            posting = self._postings.get(term)
+            if posting is None:
+                continue
+            ids, tf, idf = posting
+            out[ids] += idf * tf * (K1 + 1) / (tf + self._norm[ids])
+        return out
+
+    def top_k(self, query: str, k: int) -> List[int]:
+        """점수 높은 순 상위 k개 문서 번호 (동점/무관한 문서는 원래 순서대로 뒤를 채움)."""
+        s = self.scores(query)
+        order = np.lexsort((np.arange(self.size), -s))
+        return order[:k].tolist()
+
+
+# ---- 후보 집합별 색인 캐시 ----
+INDEX_CACHE_SIZE = 32
+_cache: "OrderedDict[str, RelevanceIndex]" = OrderedDict()
+_cache_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0}
+
+
+def _fingerprint(places: Sequence[PlaceCandidate]) -> str:
+    h = hashlib.sha1()
+    for p in places:
+        h.update(p.dedup_key.encode("utf-8"))
+        h.update(b"\x00")
+    return h.hexdigest()
+
+
+def get_index(places: Sequence[PlaceCandidate]) -> RelevanceIndex:
+    """같은 후보 목록(순서 포함)이면 이전에 만든 색인을 재사용."""
+    key = _fingerprint(places)
+    with _cache_lock:
+        index = _cache.get(key)
+        if index is not None:
+            _cache.move_to_end(key)
+            _stats["hits"] += 1
+            return index
+        _stats["misses"] += 1
+    index = RelevanceIndex(places)
+    with _cache_lock:
+        _cache[key] = index
+        while len(_cache) > INDEX_CACHE_SIZE:
+            _cache.popitem(last=False)
+    return index
+
+
+def relevance_stats() -> Dict[str, int]:
+    with _cache_lock:
+        return {**_stats, "size": len(_cache)}
@@ -0,0 +1,178 @@
+"""
+하루 일정 동선 최적화.
+
+- route_order: 최근접 이웃으로 시작 경로를 만들고 2-opt로 교차 구간을 풀어 이동 거리를 줄임 (열린 경로)
+- insertion_costs: 후보를 현재 경로에 끼워 넣을 때 늘어나는 거리 (페이스 보충 시 가까운 장소 우선)
+- optimize_day_routes: 일정 전체의 날짜별 순서 재배치 + 거리 예산을 넘는 날은 멀리 떨어진 장소부터 정리 + distanceKm 기록
+
+거리는 haversine 직선거리(km)라 실제 이동 거리보다 짧게 나옴. 하루 거리 예산도 같은 기준.
+"""
+from typing import Any, Dict, List, Optional, Sequence, Set
+
+import numpy as np
+
+from app.geo import haversine_matrix
+
+# 이동 수단별 하루 이동 거리 예산(km, 직선거리 합)
+TRANSPORT_DAY_BUDGET_KM: Dict[str, float] = {
+    "대중교통": 15.0,
+    "자가용": 60.0,
+}
+DEFAULT_DAY_BUDGET_KM = 25.0
+
+
+def day_budget_km(transportation: str) -> float:
+    return TRANSPORT_DAY_BUDGET_KM.get((transportation or "").strip(), DEFAULT_DAY_BUDGET_KM)
+
+
+def path_length(dist: np.ndarray, order: Sequence[int]) -> float:
+    return float(sum(dist[a, b] for a, b in zip(order, order[1:])))
+
+
+def _nearest_neighbour(dist: np.ndarray, start: int, nodes: Sequence[int]) -> List[int]:
+    order = [start]
+    left = [i for i in nodes if i != start]
+    while left:
+        nxt = min(left, key=lambda j: dist[order[-1], j])
+        order.append(nxt)
+        left.remove(nxt)
+    return order
+
+
+def _two_opt(dist: np.ndarray, order: List[int], fixed_end: bool) -> List[int]:
+    """열린 경로 2-opt. 구간 order[i..j]를 뒤집어 짧아지면 반영, 더 줄지 않을 때까지 반복."""
+    n = len(order)
+    last = n - 2 if fixed_end else n - 1
+    improved = True
+    while improved:
+        improved = False
+        for i in range(n - 1):
+            for j in range(i + 1, last + 1):
+                a = order[i - 1] if i > 0 else None
+                b = order[j + 1] if j + 1 < n else None
+                before = (dist[a, order[i]] if a is not None else 0.0) + (dist[order[j], b] if b is not None else 0.0)
+                after = (dist[a, order[j]] if a is not None else 0.0) + (dist[order[i], b] if b is not None else 0.0)
+                if after < before - 1e-9:
+                    order[i:j + 1] = order[i:j + 1][::-1]
+                    improved = True
+    return order
+
+
+def route_order(dist: np.ndarray, end: Optional[int] = None) -> List[int]:
+    """
+    거리 행렬 위의 짧은 방문 순서(열린 경로). end를 주면 그 지점(예: 숙소)에서 끝남.
+    시작점마다 최근접 이웃 경로를 만들어 가장 짧은 것을 2-opt로 다듬음 (하루 장소 수가 적어 전부 시도해도 충분히 빠름).
+    """
+    n = len(dist)
+    nodes = [i for i in range(n) if i != end]
+    if len(nodes) <= 1:
+        return nodes + ([end] if end is not None else [])
+
+    best: List[int] = []
+    best_len = float("inf")
+    for start in nodes:
+        order = _nearest_neighbour(dist, start, nodes) + ([end] if end is not None else [])
+        length = path_length(dist, order)
+        if length < best_len:
+            best, best_len = order, length
+    return _two_opt(dist, best, fixed_end=end is not None)
+
+
+def insertion_costs(
+    route_lats: Sequence[float], route_lngs: Sequence[float], lats: np.ndarray, lngs: np.ndarray
+) -> np.ndarray:
+    """후보마다 열린 경로(route)의 가장 싼 위치에 끼워 넣을 때 늘어나는 거리(km). 경로가 비어 있으면 0."""
+    if not len(route_lats):
+        return np.zeros(len(lats))
+    route_lats = np.asarray(route_lats, dtype=float)
+    route_lngs = np.asarray(route_lngs, dtype=float)
+    d = haversine_matrix(lats, lngs, route_lats, route_lngs)
+    costs = np.minimum(d[:, 0], d[:, -1])  # 맨 앞/맨 뒤
+    if d.shape[1] > 1:
+        seg = haversine_matrix(route_lats[:-1], route_lngs[:-1], route_lats[1:], route_lngs[1:]).diagonal()
+        costs = np.minimum(costs, (d[:, :-1] + d[:, 1:] - seg).min(axis=1))
+    return costs
+
+
+def _has_coords(item: Dict[str, Any]) -> bool:
+    return bool(item.get("latitude")) and bool(item.get("longitude"))
+
+
+def _legs_km(items: List[Dict[str, Any]]) -> np.ndarray:
+    """연속한 두 장소 사이 거리(km) 배열 (len(items) - 1개)."""
+    if len(items) < 2:
+        return np.zeros(0)
+    lats = np.array([p["latitude"] for p in items], dtype=float)
+    lngs = np.array([p["longitude"] for p in items], dtype=float)
+    return haversine_matrix(lats[:-1], lngs[:-1], lats[1:], lngs[1:]).diagonal()
+
+
+def _trim_to_budget(plans: List[Dict[str, Any]], budget_km: float, min_stops: int, lodging_titles: Set[str]) -> None:
+    """
+    하루 이동 거리가 예산을 넘으면 빼면 가장 많이 줄어드는 장소(숙소 제외)부터 뺌 (제자리 수정).
+    min_stops(페이스 최소 개수) 아래로는 빼지 않음.
+    """
+    while len(plans) > min_stops:
+        located = [p for p in plans if _has_coords(p)]
+        legs = _legs_km(located)
+        if legs.sum() <= budget_km:
+            return
+        best, best_saving = None, 0.0
+        for k, item in enumerate(located):
+            if item.get("place") in lodging_titles:
+                continue
+            if k == 0:
+                saving = legs[0]
+            elif k == len(located) - 1:
+                saving = legs[-1]
+            else:
+                prev, nxt = located[k - 1], located[k + 1]
+                bridge = _legs_km([prev, nxt])[0]
+                saving = legs[k - 1] + legs[k] - bridge
+            if saving > best_saving:
+                best, best_saving = item, saving
+        if best is None:
+            return
+        plans.remove(best)
+
+
+def optimize_day_routes(
+    schedule: List[Dict[str, Any]],
+    *,
+    lodging_titles: Optional[Set[str]] = None,
+    reorder: bool = True,
+    budget_km: Optional[float] = None,
+    min_stops: int = 0,
+) -> List[Dict[str, Any]]:
+    """
+    날짜별 plan을 이동 거리가 짧은 순서로 재배치하고 day["distanceKm"]에 총 이동 거리(km)를 기록 (제자리 수정).
+    숙소(lodging_titles)는 그 날의 마지막에 두고, 좌표 없는 항목은 좌표 있는 항목 뒤(숙소 앞)에 원래 순서대로 둠.
+    budget_km를 주면 재배치 후에도 예산을 넘는 날은 min_stops까지 동선에서 가장 벗어난 장소부터 뺌.
+    reorder=False면 순서는 그대로 두고 거리만 계산 (사용자가 정한 순서를 지켜야 하는 수정 모드).
+    order는 호출하는 쪽에서 다시 매김.
+    """
+    lodging_titles = lodging_titles or set()
+    for day in schedule:
+        plans = [p for p in day.get("plan", []) if isinstance(p, dict)]
+        if reorder:
+            located = [p for p in plans if _has_coords(p) and p.get("place") not in lodging_titles]
+            lodging = [p for p in plans if _has_coords(p) and p.get("place") in lodging_titles][:1]
+            rest = [p for p in plans if not any(p is q for q in located + lodging)]
+            stops = located + lodging
+            if len(stops) > 1:
+                dist = haversine_matrix(
+                    np.array([p["latitude"] for p in stops], dtype=float),
+                    np.array([p["longitude"] for p in stops], dtype=float),
+                )
+                order = route_order(dist, end=len(located) if lodging else None)
+                stops = [stops[i] for i in order]
+            if lodging:
+                plans = stops[:-1] + rest + stops[-1:]
+            else:
+                plans = stops + rest
+            if budget_km is not None:
+                _trim_to_budget(plans, budget_km, min_stops, lodging_titles)
+            day["plan"] = plans
+
+        day["distanceKm"] = round(float(_legs_km([p for p in plans if _has_coords(p)]).sum()), 2)
+    return schedule
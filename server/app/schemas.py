@@ -1,5 +1,6 @@
-from pydantic import BaseModel, Field
-from typing import List, Optional, Union
+from functools import cached_property
+from pydantic import BaseModel, Field, TypeAdapter
+from typing import Any, Dict, List, Optional, Type, Union
 
 
 class PlaceCandidate(BaseModel):
@@ -10,6 +11,24 @@ class PlaceCandidate(BaseModel):
     mapx: float  # lng
     contentid: Optional[str] = None
     contenttypeid: Optional[str] = None
+    modifiedtime: Optional[str] = None  # "YYYYMMDDHHMMSS"
+
+    @cached_property
+    def title_key(self) -> str:
+        # 공백 제거 + 소문자 (ai._normalize_text와 동일), 인스턴스당 한 번만 계산
+        return "".join(self.title.lower().split())
+
+    @cached_property
+    def addr_key(self) -> str:
+        return "".join((self.addr1 or "").lower().split())
+
+    @cached_property
+    def dedup_key(self) -> str:
+        return self.contentid or f"{self.title}|{self.mapy}|{self.mapx}"
+
+
+# 후보 목록을 한 번의 호출로 검증 (아이템마다 PlaceCandidate(**row)보다 빠름)
+PlaceCandidateList = TypeAdapter(List[PlaceCandidate])
 
 
 class Plan(BaseModel):
@@ -27,6 +46,7 @@ class TravelDay(BaseModel):
     day: str
     date: str
     plan: List[Plan]
+    distanceKm: float = 0.0  # 하루 총 이동 거리(km, 장소 간 직선거리 합)
 
 
 class ResponseDto(BaseModel):
@@ -34,6 +54,59 @@ class ResponseDto(BaseModel):
     travelSchedule: List[TravelDay] = []
 
 
+# ---- 모델 응답 스키마 (structured output) ----
+# 장소는 후보 id로만 받고 주소/이미지/좌표/순서는 서버가 place_map에서 채움
+
+class ModelPlanItem(BaseModel):
+    id: int
+    description: str = ""
+    activity: str = ""
+
+
+class ModelTravelDay(BaseModel):
+    # 이동 거리 등 서버가 계산하는 값은 받지 않음
+    day: str
+    date: str
+    plan: List[ModelPlanItem]
+
+
+class ModelPlanResponse(ResponseDto):
+    # 응답 파싱 시 두 필드 모두 필수 (travelSchedule이 빠진 응답은 형식 오류)
+    text: str
+    travelSchedule: List[ModelTravelDay]
+
+
+def strict_json_schema(model: Type[BaseModel]) -> Dict[str, Any]:
+    """
+    Pydantic 모델 -> OpenAI strict JSON schema.
+    strict 모드 제약: 모든 object에 additionalProperties=false, 모든 속성 required, default 불가.
+    """
+    schema = model.model_json_schema()
+
+    def fix(node: Any) -> None:
+        if isinstance(node, list):
+            for child in node:
+                fix(child)
+            return
+        if not isinstance(node, dict):
+            return
+        node.pop("default", None)
+        node.pop("title", None)
+        if node.get("type") == "object" and "properties" in node:
+            node["additionalProperties"] = False
+            node["required"] = list(node["properties"])
+        for key, child in node.items():
+            # properties/$defs는 이름 -> 스키마 매핑이라 값만 따라 내려감
+            if key in ("properties", "$defs"):
+                for sub in child.values():
+                    fix(sub)
+            else:
+                fix(child)
+
+    fix(schema)
+    return schema
+
+
 class FrontPlanRequest(BaseModel):
     userInput: str = ""
     date: str = ""  # "2025. 12. 09 ~ 2025. 12. 10" / "2025-12-09~2025-12-10" / "2025-12-09"
@@ -43,3 +116,5 @@ class FrontPlanRequest(BaseModel):
     companions: str = ""   # "혼자" | "커플" | "가족" | "친구들"
     pace: str = ""         # "여유롭게" | "보통" | "알차게"
     currentSchedule: List[TravelDay] = Field(default_factory=list)
+    noCache: bool = False  # True면 캐시된 AI 응답 대신 새로 생성
+    fast: bool = False     # True면 AI 없이 로컬 플래너로 즉시 생성 (새 일정만, 수정 요청에는 무시)
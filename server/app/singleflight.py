@@ -0,0 +1,68 @@
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional
+
+_registry: Dict[str, "SingleFlight"] = {}
+
+
+class _Call:
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    같은 키로 동시에 들어온 호출을 하나로 합침 (프로세스 내).
+    먼저 온 호출만 fn()을 실행하고, 진행 중에 들어온 호출은 그 결과(또는 예외)를 함께 받음.
+    결과는 공유되므로 호출자가 수정할 값이면 호출자 쪽에서 복사해서 쓸 것.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._stats = {"calls": 0, "executed": 0, "shared": 0}
+        _registry[name] = self
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            self._stats["calls"] += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+                self._stats["executed"] += 1
+            else:
+                self._stats["shared"] += 1
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.event.set()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["in_flight"] = len(self._calls)
+        # shared = 합쳐져서 아낀 업스트림 호출 수
+        return stats
+
+
+def singleflight_stats() -> Dict[str, Dict[str, int]]:
+    return {name: flight.stats() for name, flight in _registry.items()}
@@ -0,0 +1,154 @@
+"""
+TourAPI 장소 저장소 동기화.
+
+    python -m app.sync_places                 # 전체 지역 x 유형 (완료된 조합은 증분 동기화)
+    python -m app.sync_places --area 부산 제주 --type 12 39
+    python -m app.sync_places --full          # 증분 대신 전체 재동기화
+    python -m app.sync_places --status        # 지역별 신선도 출력
+
+전체 동기화는 페이지마다 진행 위치를 커밋하므로 중단 후 다시 실행하면 이어서 진행한다.
+증분 동기화는 수정일순(arrange=C)으로 읽다가 저장된 watermark(최대 modifiedtime) 이하가 나오면 멈춘다.
+"""
+import argparse
+import logging
+import sys
+import time
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from app.codes import AREA_CODE, CONTENT_TYPE_IDS
+from app.place_store import ALL_TYPES, PlaceStore, STORE_PATH
+from app.tourapi import fetch_area_based_list2_rows
+
+logger = logging.getLogger("app.sync_places")
+
+
+def _api_type(content_type_id: int):
+    return None if content_type_id == ALL_TYPES else content_type_id
+
+
+def full_sync(store: PlaceStore, area_code: int, content_type_id: int, page_size: int) -> int:
+    state = store.begin_full_sync(area_code, content_type_id)
+    page_no = state["next_page"]
+    generation = state["generation"]
+    if page_no > 1:
+        logger.info("resume full sync area=%s type=%s page=%s", area_code, content_type_id, page_no)
+
+    written = 0
+    while True:
+        rows, total_count = fetch_area_based_list2_rows(
+            area_code=area_code,
+            content_type_id=_api_type(content_type_id),
+            arrange="B",
+            num_of_rows=page_size,
+            page_no=page_no,
+        )
+        store.write_full_page(
+            area_code,
+            content_type_id,
+            rows,
+            generation=generation,
+            rank_offset=(page_no - 1) * page_size,
+            next_page=page_no + 1,
+            total_count=total_count,
+        )
+        written += len(rows)
+        if page_no * page_size >= total_count:
+            break
+        page_no += 1
+
+    store.finish_full_sync(area_code, content_type_id, generation)
+    return written
+
+
+def incremental_sync(store: PlaceStore, area_code: int, content_type_id: int, page_size: int, watermark: str) -> int:
+    changed = 0
+    page_no = 1
+    while True:
+        rows, total_count = fetch_area_based_list2_rows(
+            area_code=area_code,
+            content_type_id=_api_type(content_type_id),
+            arrange="C",
+            num_of_rows=page_size,
+            page_no=page_no,
+        )
+        changed += store.apply_incremental(area_code, content_type_id, rows, watermark)
+        reached_watermark = any((row.get("modifiedtime") or "") <= watermark for row in rows)
+        if reached_watermark or page_no * page_size >= total_count:
+            break
+        page_no += 1
+    return changed
+
+
+def sync(store: PlaceStore, area_codes, content_type_ids, *, page_size: int, force_full: bool) -> int:
+    failures = 0
+    for area_code in area_codes:
+        for content_type_id in content_type_ids:
+            state = store.get_state(area_code, content_type_id)
+            started = time.perf_counter()
+            try:
+                if force_full or not state or state["status"] != "complete" or not state["watermark"]:
+                    count = full_sync(store, area_code, content_type_id, page_size)
+                    mode = "full"
+                else:
+                    count = incremental_sync(store, area_code, content_type_id, page_size, state["watermark"])
+                    mode = "incremental"
+            except Exception:
+                failures += 1
+                logger.exception("sync failed area=%s type=%s", area_code, content_type_id)
+                continue
+            logger.info(
+                "synced area=%s type=%s mode=%s rows=%s elapsed=%.1fs",
+                area_code,
+                content_type_id,
+                mode,
+                count,
+                time.perf_counter() - started,
+            )
+    return failures
+
+
+def print_status(store: PlaceStore) -> None:
+    names = {code: name for name, code in AREA_CODE.items()}
+    for row in store.freshness():
+        age = row["maxAgeSeconds"]
+        age_text = f"{age / 3600:.1f}h" if age is not None else "never"
+        print(
+            f"{names.get(row['areaCode'], row['areaCode'])}\t"
+            f"types={row['types']}\tplaces={row['places']}\t"
+            f"in_progress={row['inProgress']}\toldest={age_text}"
+        )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Sync TourAPI places into the local place store")
+    parser.add_argument("--area", nargs="*", help="지역 이름 (기본: 전체)")
+    parser.add_argument("--type", nargs="*", type=int, help=f"contentTypeId, {ALL_TYPES}=전체 유형 목록 (기본: 전부)")
+    parser.add_argument("--full", action="store_true", help="증분 대신 전체 재동기화")
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--path", default=STORE_PATH)
+    parser.add_argument("--status", action="store_true", help="지역별 신선도만 출력")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    store = PlaceStore(args.path)
+
+    if args.status:
+        print_status(store)
+        return 0
+
+    unknown = [name for name in args.area or [] if name not in AREA_CODE]
+    if unknown:
+        parser.error(f"unknown area: {', '.join(unknown)}")
+    area_codes = [AREA_CODE[name] for name in args.area] if args.area else sorted(set(AREA_CODE.values()))
+    content_type_ids = args.type or CONTENT_TYPE_IDS + [ALL_TYPES]
+
+    failures = sync(store, area_codes, content_type_ids, page_size=args.page_size, force_full=args.full)
+    print_status(store)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
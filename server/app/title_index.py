@@ -0,0 +1,264 @@
+"""
+장소 제목(정규화 키) 부분 문자열 색인. 키 정규화/색인은 만들 때 한 번만 하고 질의마다 키 전체를 훑지 않음.
+
+- 질의가 들어 있는 키 (query in key): 키를 구분자로 이어 붙인 문자열의 접미사 배열(suffix array)에서
+  이분 탐색으로 질의로 시작하는 접미사 구간을 찾고, 그 구간의 키 번호 최솟값/전체를 numpy로 구함 (O(|q| log n))
+- 질의 안에 들어 있는 키 (key in query): 질의의 부분 문자열 중 키 길이에 해당하는 것만 키 dict에서 찾음
+  (질의는 장소 이름/편집 단어라 짧음. O(|q| x 서로 다른 키 길이 수))
+- 같은 키 (key == query): dict
+
+키 순서가 곧 우선순위라 first_*는 조건을 만족하는 가장 앞 키 번호를 돌려줌 (기존 선형 탐색이 처음 찾던 것과 같음).
+접미사 배열은 numpy 배수 확장(prefix doubling)으로 만들어 키 1만 개(약 12만 글자)도 수십 ms, 메모리는 글자당 수십 바이트.
+
+    index = SubstringIndex(["해운대해수욕장", "광안리해수욕장", "해운대시장"])
+    index.first_containing("해운대")      # 0
+    index.all_within("해운대시장가는길")   # [2]
+
+TitleResolver(모델 응답 장소 이름 -> 허용 제목)와 PlaceTermIndex(편집 요청 단어 -> 후보 장소)가 이 색인을 씀.
+PlaceTermIndex는 아무 등급에도 안 맞을 때 쓸 자모 근사 색인(app.fuzzy.JamoIndex)도 처음 필요할 때 만듦.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.fuzzy import JamoIndex, split_category
+from app.schemas import PlaceCandidate
+
+SEPARATOR = "\x00"  # 정규화 키에는 나오지 않는 구분 문자
+
+
+def suffix_array(codes: np.ndarray) -> np.ndarray:
+    """정수 배열의 접미사 배열 (배수 확장: 앞 k글자 순위 쌍으로 2k글자 순위를 매기는 걸 모두 달라질 때까지)."""
+    n = len(codes)
+    if n == 0:
+        return np.zeros(0, dtype=np.int64)
+    rank = np.unique(codes, return_inverse=True)[1].astype(np.int64).ravel()
+    k = 1
+    while True:
+        # (앞 k글자 순위, 다음 k글자 순위)를 정수 하나로 묶어 정렬. 끝을 넘으면 0 (가장 작음)
+        second = np.zeros(n, dtype=np.int64)
+        second[: n - k] = rank[k:] + 1
+        key = rank * (n + 1) + second
+        order = np.argsort(key, kind="stable")
+        sorted_key = key[order]
+        changed = np.empty(n, dtype=np.int64)
+        changed[0] = 0
+        changed[1:] = sorted_key[1:] != sorted_key[:-1]
+        rank = np.empty(n, dtype=np.int64)
+        rank[order] = np.cumsum(changed)
+        if rank[order[-1]] == n - 1 or k >= n:
+            return order
+        k *= 2
+
+
+class SubstringIndex:
+    def __init__(self, keys: Sequence[str]):
+        self.keys = list(keys)
+        self._positions: Dict[str, List[int]] = {}
+        for i, key in enumerate(self.keys):
+            self._positions.setdefault(key, []).append(i)
+        self._lengths = sorted({len(k) for k in self._positions})
+
+        self._text = SEPARATOR.join(self.keys)
+        codes = np.frombuffer(self._text.encode("utf-32-le"), dtype=np.uint32).astype(np.int64)
+        # 정렬용으로는 구분자마다 다른(글자보다 작은) 값을 줘서 같은 키가 여러 번 나와도 공통 접두사가 키 안에서 끝나게 함
+        # (배수 확장 횟수가 가장 긴 키 길이로 묶임). 구분자가 없는 질의의 비교 결과는 같음
+        separators = codes == 0
+        codes += len(self.keys)
+        codes[separators] = np.arange(int(separators.sum()))
+        self._sa = suffix_array(codes)
+        # 글자 위치 -> 키 번호 (구분자는 앞 키에 붙임. 질의에 구분자가 없으니 구분자로 시작하는 접미사는 맞지 않음)
+        doc_of = np.repeat(np.arange(len(self.keys)), [len(k) + 1 for k in self.keys])[: len(codes)]
+        self._sa_doc = doc_of[self._sa]
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def _suffix_range(self, query: str) -> Tuple[int, int]:
+        """query로 시작하는 접미사들의 접미사 배열 구간 [lo, hi)."""
+        text, sa, m = self._text, self._sa, len(query)
+        lo, hi = 0, len(sa)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = sa[mid]
+            if text[start:start + m] < query:
+                lo = mid + 1
+            else:
+                hi = mid
+        left, hi = lo, len(sa)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = sa[mid]
+            if text[start:start + m] == query:
+                lo = mid + 1
+            else:
+                hi = mid
+        return left, lo
+
+    def first_containing(self, query: str) -> Optional[int]:
+        """query를 부분 문자열로 포함하는 가장 앞 키 번호."""
+        if not query:
+            return 0 if self.keys else None
+        lo, hi = self._suffix_range(query)
+        return int(self._sa_doc[lo:hi].min()) if hi > lo else None
+
+    def all_containing(self, query: str) -> List[int]:
+        """query를 포함하는 키 번호 전부 (오름차순)."""
+        if not query:
+            return list(range(len(self.keys)))
+        lo, hi = self._suffix_range(query)
+        return np.unique(self._sa_doc[lo:hi]).tolist()
+
+    def _within_keys(self, query: str) -> Iterator[str]:
+        positions = self._positions
+        n = len(query)
+        for length in self._lengths:
+            if length > n:
+                break
+            if length == 0:
+                yield ""
+                continue
+            for i in range(n - length + 1):
+                part = query[i:i + length]
+                if part in positions:
+                    yield part
+
+    def first_within(self, query: str) -> Optional[int]:
+        """query 안에 부분 문자열로 들어 있는 가장 앞 키 번호."""
+        return min((self._positions[k][0] for k in self._within_keys(query)), default=None)
+
+    def all_within(self, query: str) -> List[int]:
+        """query 안에 들어 있는 키 번호 전부 (오름차순)."""
+        return sorted({i for k in set(self._within_keys(query)) for i in self._positions[k]})
+
+    def first_equal(self, query: str) -> Optional[int]:
+        positions = self._positions.get(query)
+        return positions[0] if positions else None
+
+
+class TitleResolver:
+    """
+    모델이 돌려준 장소 이름 -> 허용된 제목. 그대로 있으면 그 제목, 아니면 공백을 뺀 이름과
+    서로 포함 관계(같음 포함)인 첫 제목 (titles 순서 = 우선순위).
+    응답은 대부분 id에서 되돌린 정확한 제목이라 색인은 처음 정확히 맞지 않을 때 만듦.
+    """
+
+    def __init__(self, titles: Iterable[str]):
+        self.titles = list(dict.fromkeys(titles))
+        self._members = set(self.titles)
+        self._index: Optional[SubstringIndex] = None
+
+    def __contains__(self, title: object) -> bool:
+        return title in self._members
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.titles)
+
+    def __len__(self) -> int:
+        return len(self.titles)
+
+    def resolve(self, raw_title: str) -> str:
+        title = (raw_title or "").strip()
+        if not title:
+            return ""
+        if title in self._members:
+            return title
+        if self._index is None:
+            self._index = get_index([t.replace(" ", "") for t in self.titles])
+        key = title.replace(" ", "")
+        hits = [i for i in (self._index.first_containing(key), self._index.first_within(key)) if i is not None]
+        return self.titles[min(hits)] if hits else ""
+
+
+class PlaceTermIndex:
+    """
+    편집 요청 단어 -> 후보 장소. 제목과 같음 > 제목과 서로 포함 > 주소에 포함 순이고
+    같은 등급이면 이미지 있는 장소, 그다음 places 앞쪽 (제목이 빈 장소는 제외).
+    """
+
+    def __init__(self, places: Sequence[PlaceCandidate]):
+        usable = [p for p in places if (p.title or "").strip()]
+        # 안정 정렬이라 이미지 여부가 같으면 원래 순서 유지 -> 색인 번호가 곧 우선순위
+        self.places = sorted(usable, key=lambda p: not p.firstimage)
+        self.titles = SubstringIndex([p.title_key for p in self.places])
+        self.addresses = SubstringIndex([p.addr_key for p in self.places])
+        self._fuzzy: Optional[JamoIndex] = None
+
+    def best(self, variants: Sequence[str]) -> Optional[PlaceCandidate]:
+        variants = [v for v in variants if v]
+        tiers = (
+            [self.titles.first_equal(v) for v in variants],
+            [i for v in variants for i in (self.titles.first_containing(v), self.titles.first_within(v))],
+            [self.addresses.first_containing(v) for v in variants],
+        )
+        for hits in tiers:
+            hits = [i for i in hits if i is not None]
+            if hits:
+                return self.places[min(hits)]
+        return None
+
+    def closest(self, variants: Sequence[str]) -> Optional[PlaceCandidate]:
+        """
+        오타/띄어쓰기/일부만 쓴 단어 -> 자모 편집 거리가 가장 작은 제목의 장소 (같으면 우선순위 앞쪽).
+        best()가 못 찾았을 때 쓰는 마지막 등급. 거리는 분류 꼬리를 뗀 고유한 앞부분으로만 재고,
+        제목에 그 꼬리와 앞부분 첫 글자가 그대로 있어야 함 ("다대포해수욕장"이 해운대해수욕장, "부산공원"이 용두산공원에 맞지 않게).
+        """
+        if self._fuzzy is None:
+            self._fuzzy = JamoIndex(self.titles.keys)
+        hits: List[Tuple[float, int]] = []
+        for v in variants:
+            stem, suffix = split_category(v)
+            if not stem:
+                continue
+            for cost, i in self._fuzzy.matches(stem):
+                key = self.titles.keys[i]
+                if suffix in key and stem[0] in key:
+                    hits.append((cost, i))
+                    break
+        with _cache_lock:
+            _stats["fuzzy_hits" if hits else "fuzzy_misses"] += 1
+        return self.places[min(hits)[1]] if hits else None
+
+
+# ---- 같은 키 목록/후보 집합이면 색인 재사용 (요청/수정 간) ----
+INDEX_CACHE_SIZE = 32
+_cache: "OrderedDict[Any, Any]" = OrderedDict()
+_cache_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "fuzzy_hits": 0, "fuzzy_misses": 0}
+
+
+def _cached(key: Any, build: Callable[[], Any]) -> Any:
+    with _cache_lock:
+        value = _cache.get(key)
+        if value is not None:
+            _cache.move_to_end(key)
+            _stats["hits"] += 1
+            return value
+        _stats["misses"] += 1
+    value = build()
+    with _cache_lock:
+        _cache[key] = value
+        while len(_cache) > INDEX_CACHE_SIZE:
+            _cache.popitem(last=False)
+    return value
+
+
+def get_index(keys: Sequence[str]) -> SubstringIndex:
+    keys = tuple(keys)
+    return _cached(("keys", keys), lambda: SubstringIndex(keys))
+
+
+def get_place_term_index(places: Sequence[PlaceCandidate]) -> PlaceTermIndex:
+    """같은 후보 목록(순서 포함)이면 이전에 만든 색인을 재사용."""
+    h = hashlib.sha1()
+    for p in places:
+        h.update(f"{p.dedup_key}\x00{p.title}\x00{p.addr1}\x00{bool(p.firstimage)}\x00".encode("utf-8"))
+    return _cached(("places", h.hexdigest()), lambda: PlaceTermIndex(places))
+
+
+def title_index_stats() -> Dict[str, int]:
+    with _cache_lock:
+        return {**_stats, "size": len(_cache)}
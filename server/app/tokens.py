@@ -0,0 +1,13 @@
+import math
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    프롬프트 토큰 수 근사치 (토크나이저 없이).
+    ASCII는 4글자당 1토큰, 한글 등 비ASCII는 글자당 0.8토큰으로 계산 (o200k 기준 한국어는 대략 이 범위).
+    예산 계산용이라 약간 크게 잡는 쪽이 안전함.
+    """
+    if not text:
+        return 0
+    non_ascii = sum(1 for ch in text if ord(ch) > 127)
+    return math.ceil((len(text) - non_ascii) / 4 + non_ascii * 0.8)
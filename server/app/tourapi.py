@@ -1,22 +1,175 @@
 import os
+import random
 import requests
 import logging
-from typing import List, Optional
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
-from app.schemas import PlaceCandidate
+from requests.adapters import HTTPAdapter
 
-BASE_URL = "https://apis.data.go.kr/B551011/KorService2"
+from app import fastjson
+from app.breaker import CircuitBreaker, CircuitOpenError
+from app.cache import SQLiteTTLCache, make_cache_key
+from app.schemas import PlaceCandidate, PlaceCandidateList
+from app.singleflight import SingleFlight
+
+# 로컬 개발/벤치마크 시 stubs/fake_tourapi.py 주소로 바꿔서 사용
+BASE_URL = os.getenv("TOURAPI_BASE_URL", "https://apis.data.go.kr/B551011/KorService2").rstrip("/")
 TOURAPI_KEY = os.getenv("TOURAPI_SERVICE_KEY", "")
 logger = logging.getLogger(__name__)
 
+# 장소 목록은 하루 안에 거의 바뀌지 않으므로 디스크 캐시(워커 간 공유, 재시작 후 유지)
+CACHE_ENABLED = os.getenv("TOURAPI_CACHE_ENABLED", "1") not in ("0", "false", "False", "")
+CACHE_PATH = os.getenv("TOURAPI_CACHE_PATH", ".cache/tourapi.sqlite3")
+CACHE_TTL = float(os.getenv("TOURAPI_CACHE_TTL", "86400"))
+CACHE_STALE_TTL = float(os.getenv("TOURAPI_CACHE_STALE_TTL", "86400"))
+# 캐시에 저장하는 페이지 값 형식. 바뀌면 올려서 이전 형식 항목을 다른 키로 (읽지 않고 새로 받음)
+# 1: 행 list, 2: {"items": 행 list, "totalCount": int}
+PAGE_CACHE_FORMAT = 2
+
+# HTTP 클라이언트: 커넥션 풀(keep-alive) + connect/read 타임아웃 분리 + 지터 지수 백오프 재시도
+POOL_SIZE = int(os.getenv("TOURAPI_POOL_SIZE", "16"))
+CONNECT_TIMEOUT = float(os.getenv("TOURAPI_CONNECT_TIMEOUT", "3.05"))
+READ_TIMEOUT = float(os.getenv("TOURAPI_READ_TIMEOUT", "10"))
+MAX_RETRIES = int(os.getenv("TOURAPI_MAX_RETRIES", "2"))
+BACKOFF_BASE = float(os.getenv("TOURAPI_BACKOFF_BASE", "0.3"))
+BACKOFF_MAX = float(os.getenv("TOURAPI_BACKOFF_MAX", "3"))
+
+_cache: Optional[SQLiteTTLCache] = None
+_cache_lock = threading.Lock()
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+# 같은 (areaCode, contentTypeId, numOfRows, arrange, pageNo) 동시 호출은 업스트림 1회로 합침
+_flight = SingleFlight("tourapi")
+# data.go.kr 장애 시 요청마다 타임아웃까지 기다리지 않도록 빠르게 실패
+_breaker = CircuitBreaker(
+    "tourapi",
+    failure_threshold=int(os.getenv("TOURAPI_BREAKER_FAILURES", "5")),
+    slow_call_seconds=float(os.getenv("TOURAPI_BREAKER_SLOW_SECONDS", "5")),
+    recovery_timeout=float(os.getenv("TOURAPI_BREAKER_RESET_SECONDS", "30")),
+    half_open_max_calls=int(os.getenv("TOURAPI_BREAKER_HALF_OPEN_CALLS", "1")),
+)
+
+
+def _get_session() -> requests.Session:
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=POOL_SIZE, max_retries=0)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+    return _session
+
+
+def _backoff_delay(attempt: int) -> float:
+    # full jitter: 0 ~ min(max, base * 2^attempt)
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)))
+
+
+def _get_json(operation: str, params: Dict[str, Any]) -> Optional[dict]:
+    """
+    TourAPI GET 호출 (멱등이므로 재시도 안전).
+    - 요청 예외(연결 오류/타임아웃/리다이렉트 초과/응답 본문 끊김 등)/5xx/429, JSON이 아닌 응답(XML 에러 페이지)은 재시도
+    - 그 외 4xx는 즉시 예외
+    - 재시도 후에도 JSON 파싱 실패면 None, HTTP 오류면 마지막 예외를 다시 던짐
+    - 매 시도는 서킷 브레이커를 거치며, 회로가 열려 있으면 CircuitOpenError
+    """
+    url = f"{BASE_URL}/{operation}"
+    session = _get_session()
+    last_error: Optional[Exception] = None
+
+    for attempt in range(MAX_RETRIES + 1):
+        if attempt:
+            time.sleep(_backoff_delay(attempt - 1))
+
+        _breaker.before_call()
+        started = time.perf_counter()
+        try:
+            r = session.get(url, params=params, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT))
+        except requests.RequestException as e:
+            # 어떤 요청 예외든 결과를 기록해야 half-open 시험 호출 자리가 풀림
+            _breaker.record_failure()
+            last_error = e
+            logger.warning(
+                "TourAPI %s failed attempt=%s elapsed_ms=%.0f error=%s",
+                operation,
+                attempt + 1,
+                (time.perf_counter() - started) * 1000,
+                e.__class__.__name__,
+            )
+            continue
+
+        elapsed = time.perf_counter() - started
+        elapsed_ms = elapsed * 1000
+        logger.info(
+            "TourAPI %s status=%s attempt=%s elapsed_ms=%.0f",
+            operation,
+            r.status_code,
+            attempt + 1,
+            elapsed_ms,
+        )
+
+        if r.status_code >= 500 or r.status_code == 429:
+            _breaker.record_failure()
+            last_error = requests.HTTPError(f"{r.status_code} from TourAPI {operation}", response=r)
+            continue
+        if r.status_code >= 400:
+            # 그 외 4xx는 요청 문제이므로 업스트림 장애로 보지 않음
+            _breaker.record_success()
+            r.raise_for_status()
+
+        try:
+            data = fastjson.loads(r.content)
+            _breaker.record_success(elapsed)
+            return data
+        except ValueError:
+            _breaker.record_failure()
+            preview = (r.text or "").strip().replace("\n", " ")[:180]
+            logger.warning(
+                "TourAPI JSON parse failed status=%s content-type=%s body=%s",
+                r.status_code,
+                r.headers.get("content-type"),
+                preview,
+            )
+            last_error = None
+
+    if last_error is not None:
+        raise last_error
+    return None
+
+
+def _get_cache() -> Optional[SQLiteTTLCache]:
+    global _cache
+    if not CACHE_ENABLED:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = SQLiteTTLCache(
+                    CACHE_PATH,
+                    namespace="areaBasedList2",
+                    ttl=CACHE_TTL,
+                    stale_ttl=CACHE_STALE_TTL,
+                )
+    return _cache
+
+
+def cache_stats() -> Dict[str, Any]:
+    cache = _get_cache()
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.stats()}
+
 
 def _normalize_items(data) -> List[dict]:
-    items = (
-        data.get("response", {})
-        .get("body", {})
-        .get("items", {})
-        .get("item", [])
-    )
+    body = data.get("response", {}).get("body", {}) if isinstance(data, dict) else {}
+    items = body.get("items", {}) if isinstance(body, dict) else {}
+    # 결과가 없으면 items가 빈 문자열("")로 오는 경우가 있음
+    items = items.get("item", []) if isinstance(items, dict) else []
     if isinstance(items, dict):
         return [items]
     if isinstance(items, list):
@@ -24,7 +177,14 @@ def _normalize_items(data) -> List[dict]:
     return []
 
 
-def area_based_list2(
+def _total_count(data) -> int:
+    try:
+        return int(data.get("response", {}).get("body", {}).get("totalCount") or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _build_params(
     *,
     area_code: int,
     content_type_id: Optional[int] = None,
@@ -34,15 +194,10 @@ def area_based_list2(
     arrange: str = "B",
     num_of_rows: int = 30,
     page_no: int = 1,
-) -> List[PlaceCandidate]:
-    """
-    KorService2/areaBasedList2 호출.
-    좌표(mapx/mapy) 포함 장소 후보 반환
-    """
+) -> Dict[str, Any]:
     if not TOURAPI_KEY:
         raise RuntimeError("TOURAPI_SERVICE_KEY is not set")
 
-    url = f"{BASE_URL}/areaBasedList2"
     params = {
         "serviceKey": TOURAPI_KEY,
         "MobileOS": "ETC",
@@ -61,22 +216,166 @@ def area_based_list2(
         params["cat2"] = cat2
     if cat3:
         params["cat3"] = cat3
+    return params
+
+
+def _page_cache_key(params: Dict[str, Any]) -> str:
+    # serviceKey는 키에서 제외 (키 교체 시에도 캐시 유지)
+    return make_cache_key({**{k: v for k, v in params.items() if k != "serviceKey"}, "cacheFormat": PAGE_CACHE_FORMAT})
+
 
-    r = requests.get(url, params=params, timeout=15)
-    r.raise_for_status()
+def area_based_list2_page(
+    *,
+    area_code: int,
+    content_type_id: Optional[int] = None,
+    cat1: Optional[str] = None,
+    cat2: Optional[str] = None,
+    cat3: Optional[str] = None,
+    arrange: str = "B",
+    num_of_rows: int = 30,
+    page_no: int = 1,
+) -> Tuple[List[PlaceCandidate], int]:
+    """
+    areaBasedList2 한 페이지 조회.
+    (좌표 있는 장소 후보, 응답 body의 totalCount) 반환
+    """
+    params = _build_params(
+        area_code=area_code,
+        content_type_id=content_type_id,
+        cat1=cat1,
+        cat2=cat2,
+        cat3=cat3,
+        arrange=arrange,
+        num_of_rows=num_of_rows,
+        page_no=page_no,
+    )
+
+    key = _page_cache_key(params)
+    load = lambda: _flight.do(key, lambda: _fetch_page(params))
+
+    cache = _get_cache()
     try:
-        data = r.json()
-    except ValueError:
-        preview = (r.text or "").strip().replace("\n", " ")[:180]
-        logger.warning(
-            "TourAPI JSON parse failed status=%s content-type=%s body=%s",
-            r.status_code,
-            r.headers.get("content-type"),
-            preview,
+        page = load() if cache is None else cache.get_or_load(key, load)
+    except CircuitOpenError:
+        # 회로가 열려 있으면 오래된 캐시라도 있으면 사용
+        entry = cache.get_entry(key) if cache is not None else None
+        if entry is None:
+            raise
+        page = entry[0]
+
+    if not isinstance(page, dict):
+        return [], 0
+    places = PlaceCandidateList.validate_python(page.get("items") or [])
+    return places, int(page.get("totalCount") or 0)
+
+
+def fetch_area_based_list2_rows(
+    *,
+    area_code: int,
+    content_type_id: Optional[int] = None,
+    arrange: str = "B",
+    num_of_rows: int = 100,
+    page_no: int = 1,
+) -> Tuple[List[dict], int]:
+    """
+    캐시를 거치지 않는 원본 조회 (장소 저장소 동기화용).
+    정규화된 행(dict, modifiedtime 포함)과 totalCount 반환. 파싱 실패 시 RuntimeError.
+    """
+    params = _build_params(
+        area_code=area_code,
+        content_type_id=content_type_id,
+        arrange=arrange,
+        num_of_rows=num_of_rows,
+        page_no=page_no,
+    )
+    page = _fetch_page(params)
+    if page is None:
+        raise RuntimeError(f"TourAPI areaBasedList2 returned an unreadable page (page_no={page_no})")
+    return page["items"], int(page.get("totalCount") or 0)
+
+
+def area_based_list2(
+    *,
+    area_code: int,
+    content_type_id: Optional[int] = None,
+    cat1: Optional[str] = None,
+    cat2: Optional[str] = None,
+    cat3: Optional[str] = None,
+    arrange: str = "B",
+    num_of_rows: int = 30,
+    page_no: int = 1,
+) -> List[PlaceCandidate]:
+    """
+    KorService2/areaBasedList2 호출.
+    좌표(mapx/mapy) 포함 장소 후보 반환
+    """
+    places, _ = area_based_list2_page(
+        area_code=area_code,
+        content_type_id=content_type_id,
+        cat1=cat1,
+        cat2=cat2,
+        cat3=cat3,
+        arrange=arrange,
+        num_of_rows=num_of_rows,
+        page_no=page_no,
+    )
+    return places
+
+
+def iter_area_based_list2_pages(
+    *,
+    area_code: int,
+    content_type_id: Optional[int] = None,
+    page_size: int = 30,
+    max_rows: int = 80,
+    should_continue: Optional[Callable[[], bool]] = None,
+    **filters: Any,
+) -> Iterator[List[PlaceCandidate]]:
+    """
+    pageNo를 1부터 올려가며 페이지 단위로 장소 후보를 yield.
+    - totalCount에 도달하거나 요청한 행 수가 max_rows 이상이면 종료(페이지 단위로 올림)
+    - 두 번째 페이지부터는 요청 전에 should_continue()를 확인해서 False면 종료
+    소비자가 다음 페이지를 요청할 때만 HTTP 호출이 나가므로 중간에 멈추면 추가 전송/파싱이 없음.
+    """
+    page_no = 1
+    while (page_no - 1) * page_size < max_rows:
+        if page_no > 1 and should_continue is not None and not should_continue():
+            return
+
+        places, total_count = area_based_list2_page(
+            area_code=area_code,
+            content_type_id=content_type_id,
+            num_of_rows=page_size,
+            page_no=page_no,
+            **filters,
         )
-        return []
+        yield places
+
+        if page_no * page_size >= total_count:
+            return
+        page_no += 1
+
+
+def iter_area_based_list2(**kwargs: Any) -> Iterator[PlaceCandidate]:
+    """iter_area_based_list2_pages의 장소 단위 버전."""
+    for page in iter_area_based_list2_pages(**kwargs):
+        yield from page
 
-    out: List[PlaceCandidate] = []
+
+def _fetch_page(params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    실제 HTTP 호출 + 아이템 정규화.
+    응답 파싱 실패 시 None (캐시에 빈 결과가 저장되지 않도록 구분)
+    """
+    data = _get_json("areaBasedList2", params)
+    if data is None:
+        return None
+    return {"items": _normalize_rows(data), "totalCount": _total_count(data)}
+
+
+def _normalize_rows(data) -> List[dict]:
+    """응답 아이템을 PlaceCandidate 필드 타입에 맞춘 dict로 정규화 (좌표 없는 장소 제외)."""
+    out: List[dict] = []
     for it in _normalize_items(data):
         title = (it.get("title") or "").strip()
         if not title:
@@ -93,15 +392,16 @@ def area_based_list2(
             continue
 
         out.append(
-            PlaceCandidate(
-                title=title,
-                addr1=(it.get("addr1") or "").strip(),
-                firstimage=(it.get("firstimage") or "").strip(),
-                mapy=mapy,
-                mapx=mapx,
-                contentid=str(it.get("contentid")) if it.get("contentid") is not None else None,
-                contenttypeid=str(it.get("contenttypeid")) if it.get("contenttypeid") is not None else None,
-            )
+            {
+                "title": title,
+                "addr1": (it.get("addr1") or "").strip(),
+                "firstimage": (it.get("firstimage") or "").strip(),
+                "mapy": mapy,
+                "mapx": mapx,
+                "contentid": str(it.get("contentid")) if it.get("contentid") is not None else None,
+                "contenttypeid": str(it.get("contenttypeid")) if it.get("contenttypeid") is not None else None,
+                "modifiedtime": str(it.get("modifiedtime")) if it.get("modifiedtime") else None,
+            }
         )
 
     return out
@@ -0,0 +1,70 @@
+"""
+_collect_places 벽시계 시간 벤치마크 (TourAPI는 sleep 스텁으로 대체).
+
+    cd server && OPENAI_API_KEY=dummy python -m bench.bench_collect_places
+"""
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from app import main as app_main
+from app.schemas import PlaceCandidate
+
+LATENCY_SEC = 0.3
+
+
+class StubTourAPI:
+    """
+    좌표 없는 행이 많아 유형별 후보가 페이지당 1건씩만 남는 최악의 경우를 재현.
+    (유형별로 여러 페이지 + 전체 유형 보강까지 모두 타게 됨)
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = 0
+        self.rows_requested = 0
+
+    def __call__(self, *, area_code, content_type_id=None, num_of_rows=30, page_no=1, **_):
+        with self.lock:
+            self.calls += 1
+            self.rows_requested += num_of_rows
+        time.sleep(LATENCY_SEC)
+        count = 1 if content_type_id is not None else num_of_rows
+        places = [
+            PlaceCandidate(
+                title=f"{content_type_id}-{page_no}-{i}",
+                mapy=35.0 + i * 0.001,
+                mapx=129.0 + i * 0.001,
+                contentid=f"{content_type_id}-{page_no}-{i}",
+            )
+            for i in range(count)
+        ]
+        return places, 200
+
+
+def _run(executor, ctype_ids, repeat):
+    timings = []
+    stub = StubTourAPI()
+    with patch("app.tourapi.area_based_list2_page", stub), patch.object(app_main, "_tourapi_executor", executor):
+        for _ in range(repeat):
+            started = time.perf_counter()
+            app_main._collect_places(area_code=6, ctype_ids=ctype_ids)
+            timings.append(time.perf_counter() - started)
+    return statistics.median(timings), stub.calls // repeat, stub.rows_requested // repeat
+
+
+def main():
+    ctype_ids = [12, 14, 39]
+    print(f"stub latency={LATENCY_SEC * 1000:.0f}ms types={ctype_ids}")
+    serial, calls, rows = _run(ThreadPoolExecutor(max_workers=1), ctype_ids, repeat=3)
+    print(f"serial      {serial * 1000:8.1f} ms  calls={calls} rows_requested={rows}")
+    concurrent, calls, rows = _run(
+        ThreadPoolExecutor(max_workers=app_main.TOURAPI_MAX_CONCURRENCY), ctype_ids, repeat=3
+    )
+    print(f"concurrent  {concurrent * 1000:8.1f} ms  calls={calls} rows_requested={rows}  ({serial / concurrent:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
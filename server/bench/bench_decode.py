@@ -0,0 +1,95 @@
+"""
+TourAPI 응답 디코딩 + 후보 생성 + 중복 제거 마이크로벤치마크.
+
+기존 경로(표준 json + 아이템마다 Pydantic 검증 + 매번 키/정규화 계산)와
+현재 경로(fastjson + 목록 단위 TypeAdapter 검증 + 인스턴스당 1회 계산되는 title_key/dedup_key)를 비교.
+model_construct도 측정하지만 pydantic v2에서는 Rust 검증보다 느려서 사용하지 않음.
+
+    cd server && OPENAI_API_KEY=dummy python -m bench.bench_decode
+"""
+import json
+import re
+import timeit
+from pathlib import Path
+
+from app import fastjson
+from app.schemas import PlaceCandidate, PlaceCandidateList
+from app.tourapi import _normalize_rows
+
+FIXTURE = Path(__file__).resolve().parent.parent / "stubs" / "fixtures" / "areaBasedList2_6_12.json"
+ROWS_PER_PAGE = 80
+PAGES = 3  # 유형 3개
+
+
+def _recorded_pages() -> list[bytes]:
+    base = json.loads(FIXTURE.read_text(encoding="utf-8"))
+    items = base["response"]["body"]["items"]["item"]
+    pages = []
+    for page in range(PAGES):
+        rows = []
+        for i in range(ROWS_PER_PAGE):
+            item = dict(items[i % len(items)])
+            # 유형 사이에 일부 중복이 생기도록 contentid를 겹치게 만듦
+            item["contentid"] = str(1000 + (page * ROWS_PER_PAGE + i) % (ROWS_PER_PAGE * PAGES - 40))
+            rows.append(item)
+        payload = {"response": {"body": {"items": {"item": rows}, "totalCount": ROWS_PER_PAGE}}}
+        pages.append(json.dumps(payload, ensure_ascii=False).encode("utf-8"))
+    return pages
+
+
+def _legacy(pages):
+    places = []
+    for raw in pages:
+        data = json.loads(raw)
+        places.extend(PlaceCandidate(**row) for row in _normalize_rows(data))
+    seen, out = set(), []
+    for p in places:
+        key = p.contentid or f"{p.title}|{p.mapy}|{p.mapx}"
+        if key in seen:
+            continue
+        seen.add(key)
+        out.append(p)
+    return [re.sub(r"\s+", "", (p.title or "").strip().lower()) for p in out]
+
+
+def _dedup_with_cached_keys(places):
+    seen, out = set(), []
+    for p in places:
+        if p.dedup_key in seen:
+            continue
+        seen.add(p.dedup_key)
+        out.append(p)
+    return [p.title_key for p in out]
+
+
+def _fast(pages):
+    places = []
+    for raw in pages:
+        data = fastjson.loads(raw)
+        places.extend(PlaceCandidateList.validate_python(_normalize_rows(data)))
+    return _dedup_with_cached_keys(places)
+
+
+def _construct(pages):
+    places = []
+    for raw in pages:
+        data = fastjson.loads(raw)
+        places.extend(PlaceCandidate.model_construct(**row) for row in _normalize_rows(data))
+    return _dedup_with_cached_keys(places)
+
+
+def main():
+    pages = _recorded_pages()
+    assert _legacy(pages) == _fast(pages) == _construct(pages)
+
+    number = 200
+    print(f"{PAGES} pages x {ROWS_PER_PAGE} rows, orjson={'yes' if fastjson.orjson else 'no'}")
+    legacy = min(timeit.repeat(lambda: _legacy(pages), number=number, repeat=5)) / number
+    print(f"legacy     {legacy * 1e6:8.1f} us/request")
+    for name, fn in (("fast", _fast), ("construct", _construct)):
+        elapsed = min(timeit.repeat(lambda: fn(pages), number=number, repeat=5)) / number
+        print(f"{name:<10} {elapsed * 1e6:8.1f} us/request  ({legacy / elapsed:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
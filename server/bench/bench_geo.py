@@ -0,0 +1,41 @@
+"""
+SpatialIndex 빌드/질의 시간.
+
+    cd server && OPENAI_API_KEY=dummy python -m bench.bench_geo
+"""
+import random
+import timeit
+
+from app.geo import SpatialIndex
+from app.schemas import PlaceCandidate
+
+
+def _places(n, seed=3):
+    rng = random.Random(seed)
+    # 부산 광역권 크기(약 40km x 40km)에 흩뿌림
+    return [
+        PlaceCandidate(title=f"p{i}", mapy=35.0 + rng.random() * 0.35, mapx=128.85 + rng.random() * 0.45)
+        for i in range(n)
+    ]
+
+
+def main():
+    rng = random.Random(11)
+    queries = [(35.0 + rng.random() * 0.35, 128.85 + rng.random() * 0.45) for _ in range(200)]
+    print(f"{'places':>7} {'build ms':>9} {'within2km us':>13} {'knn10 us':>9} {'matrix100 us':>13}")
+    for n in (1000, 5000, 10000):
+        places = _places(n)
+        build = min(timeit.repeat(lambda: SpatialIndex(places), number=1, repeat=3))
+        index = SpatialIndex(places)
+        within = timeit.timeit(lambda: [index.within_indices(lat, lng, 2.0) for lat, lng in queries], number=5)
+        knn = timeit.timeit(lambda: [index.nearest_indices(lat, lng, 10) for lat, lng in queries], number=5)
+        matrix = timeit.timeit(lambda: index.distance_matrix(range(100)), number=50) / 50
+        per_query = 5 * len(queries)
+        print(
+            f"{n:>7} {build * 1e3:>9.1f} {within / per_query * 1e6:>13.1f}"
+            f" {knn / per_query * 1e6:>9.1f} {matrix * 1e6:>13.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""
+로컬 플래너(plan_locally) 지연 시간. 후보 수별 3박 4일 / 9박 10일 일정.
+
+    cd server && OPENAI_API_KEY=dummy python -m bench.bench_planner
+"""
+import random
+import timeit
+
+from app.planner import plan_locally
+from app.schemas import PlaceCandidate
+
+TYPES = ("12", "14", "38", "39", "32")
+
+
+def _places(n, seed=5):
+    rng = random.Random(seed)
+    # 부산 광역권 크기(약 40km x 40km), 숙소 약 20%
+    return [
+        PlaceCandidate(
+            title=f"p{i}",
+            firstimage="x.jpg" if rng.random() < 0.7 else "",
+            mapy=35.0 + rng.random() * 0.35,
+            mapx=128.85 + rng.random() * 0.45,
+            contenttypeid=rng.choice(TYPES),
+        )
+        for i in range(n)
+    ]
+
+
+def main():
+    print(f"{'places':>7} {'4 days ms':>10} {'10 days ms':>11}")
+    for n in (100, 1000, 10000):
+        places = _places(n)
+        row = []
+        for days in (4, 10):
+            dates = [f"2026-03-{d + 1:02d}" for d in range(days)]
+            best = min(timeit.repeat(lambda: plan_locally(places, dates, pace="알차게"), number=10, repeat=3)) / 10
+            row.append(best * 1e3)
+        print(f"{n:>7} {row[0]:>10.2f} {row[1]:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+프롬프트 입력 토큰(추정치) 비교: 기존 후보 인코딩(전체 주소 + 이미지 URL + 좌표, 응답에 주소/이미지/좌표 재출력 요구)
+vs 압축 인코딩(숫자 id + 시/구 주소 + img 플래그, 응답은 id만).
+
+    cd server && OPENAI_API_KEY=dummy python -m bench.bench_prompt_tokens
+"""
+import json
+from pathlib import Path
+
+from app import ai
+from app.schemas import PlaceCandidateList
+from app.tokens import estimate_tokens
+from app.tourapi import _normalize_rows
+
+FIXTURE = Path(__file__).resolve().parent.parent / "stubs" / "fixtures" / "areaBasedList2_6_12.json"
+CANDIDATES = 100
+
+LEGACY_PLAN_ITEM = {
+    "order": 1,
+    "place": "string",
+    "description": "string",
+    "activity": "string",
+    "address": "string",
+    "image": "string",
+    "latitude": 0.0,
+    "longitude": 0.0,
+}
+
+
+def _places():
+    rows = _normalize_rows(json.loads(FIXTURE.read_text(encoding="utf-8")))
+    out = []
+    for i in range(CANDIDATES):
+        row = dict(rows[i % len(rows)])
+        row["title"] = f"{row['title']} {i // len(rows) + 1}"
+        out.append(row)
+    return PlaceCandidateList.validate_python(out)
+
+
+def _legacy_prompt_tokens(ctx) -> int:
+    payload = dict(ctx.user_payload)
+    payload["candidates"] = ctx.candidates
+    payload["response_schema"] = {
+        "text": "string",
+        "travelSchedule": [{"day": "Day 1", "date": "YYYY-MM-DD", "plan": [LEGACY_PLAN_ITEM]}],
+    }
+    return estimate_tokens(ctx.system) + estimate_tokens(json.dumps(payload, ensure_ascii=False))
+
+
+def _output_tokens(plan_item: dict, days: int = 3, per_day: int = 4) -> int:
+    schedule = {"text": "부산 2박 3일 일정", "travelSchedule": [
+        {"day": f"Day {d + 1}", "date": "2026-03-01", "plan": [plan_item] * per_day} for d in range(days)
+    ]}
+    return estimate_tokens(json.dumps(schedule, ensure_ascii=False))
+
+
+def main():
+    places = _places()
+    ctx = ai._prepare_plan_context(
+        user_input="바다 보면서 여유롭게",
+        date_str="2026-03-01~2026-03-03",
+        region="부산",
+        travel_type="관광지",
+        transportation="대중교통",
+        pace="보통",
+        places=places,
+    )
+    legacy = _legacy_prompt_tokens(ctx)
+    compact = estimate_tokens(ctx.system) + estimate_tokens(ai._payload_json(ctx.user_payload))
+    print(f"{len(ctx.candidates)} candidates, budget={ai.PROMPT_TOKEN_BUDGET}, sent={len(ctx.user_payload['candidates'])}")
+    print(f"input  legacy  {legacy:6d} tokens")
+    print(f"input  compact {compact:6d} tokens  (-{1 - compact / legacy:.0%})")
+
+    sample = places[0]
+    legacy_item = {
+        "order": 1, "place": sample.title, "description": "해변 산책과 카페", "activity": "산책",
+        "address": sample.addr1, "image": sample.firstimage, "latitude": sample.mapy, "longitude": sample.mapx,
+    }
+    compact_item = {"id": 1, "description": "해변 산책과 카페", "activity": "산책"}
+    legacy_out, compact_out = _output_tokens(legacy_item), _output_tokens(compact_item)
+    print(f"output legacy  {legacy_out:6d} tokens (3 days x 4 places)")
+    print(f"output compact {compact_out:6d} tokens  (-{1 - compact_out / legacy_out:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+관련도 색인(BM25 bigram) 빌드/질의 시간과 모델 입력 크기 비교.
+
+    cd server && OPENAI_API_KEY=dummy python -m bench.bench_relevance
+"""
+import json
+import random
+import timeit
+from pathlib import Path
+from unittest.mock import patch
+
+from app import ai
+from app.relevance import RelevanceIndex, relevance_query
+from app.schemas import PlaceCandidateList
+from app.tokens import estimate_tokens
+from app.tourapi import _normalize_rows
+
+FIXTURE = Path(__file__).resolve().parent.parent / "stubs" / "fixtures" / "areaBasedList2_6_12.json"
+QUERY = relevance_query(["관광지", "음식점"], "커플")
+WORDS = ["해수욕장", "미술관", "시장", "공원", "카페", "전망대", "박물관", "사찰", "거리", "항구", "해변", "마을"]
+
+
+def _places(n, seed=9):
+    """픽스처 장소에 임의 단어를 섞어 n개로 늘림 (제목/주소 길이 분포는 실제와 비슷하게)."""
+    rng = random.Random(seed)
+    rows = _normalize_rows(json.loads(FIXTURE.read_text(encoding="utf-8")))
+    out = []
+    for i in range(n):
+        row = dict(rows[i % len(rows)])
+        row["title"] = f"{rng.choice(WORDS)} {row['title']} {i}"
+        row["contentid"] = str(i)
+        row["contenttypeid"] = rng.choice(["12", "14", "32", "38", "39"])
+        out.append(row)
+    return PlaceCandidateList.validate_python(out)
+
+
+def _prompt_tokens(places, limit, ranking):
+    with patch.object(ai, "CANDIDATE_LIMIT", limit), patch.object(ai, "RELEVANCE_RANKING", ranking):
+        ctx = ai._prepare_plan_context(
+            user_input="바다 보이는 카페랑 해수욕장 위주로",
+            date_str="2026-03-01~2026-03-03",
+            region="부산",
+            travel_type="관광지,음식점",
+            transportation="대중교통",
+            companions="커플",
+            pace="보통",
+            places=places,
+        )
+    sent = ctx.user_payload["candidates"]
+    return estimate_tokens(ctx.system) + estimate_tokens(ai._payload_json(ctx.user_payload)), len(sent)
+
+
+def main():
+    print(f"{'places':>7} {'build ms':>9} {'query ms':>9}")
+    for n in (100, 1000, 10000):
+        places = _places(n)
+        build = min(timeit.repeat(lambda: RelevanceIndex(places), number=1, repeat=3))
+        index = RelevanceIndex(places)
+        query = min(timeit.repeat(lambda: index.top_k(QUERY, 60), number=20, repeat=3)) / 20
+        print(f"{n:>7} {build * 1e3:>9.2f} {query * 1e3:>9.3f}")
+
+    places = _places(300)
+    legacy, legacy_n = _prompt_tokens(places, 100, False)
+    ranked, ranked_n = _prompt_tokens(places, ai.CANDIDATE_LIMIT, True)
+    print(f"prompt  image-order top 100 {legacy:6d} tokens ({legacy_n} candidates)")
+    print(f"prompt  relevance top {ai.CANDIDATE_LIMIT:<5d} {ranked:6d} tokens ({ranked_n} candidates, -{1 - ranked / legacy:.0%})")
+
+
+if __name__ == "__main__":
+    main()
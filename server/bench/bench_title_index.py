@@ -0,0 +1,119 @@
+"""
+제목 색인(접미사 배열 + 키 dict) vs 기존 선형 탐색: 모델 응답 장소 이름 해석과 편집 단어 -> 후보 장소 고르기.
+오타 단어(제목 일부 3~5글자에서 한 글자의 모음을 바꾸거나 한 글자를 뺌)의 자모 근사 검색(PlaceTermIndex.closest) 단어당 시간과 맞힌 비율도 같이.
+
+    cd server && OPENAI_API_KEY=dummy python -m bench.bench_title_index
+"""
+import random
+import re
+import timeit
+
+from app import ai
+from app.title_index import PlaceTermIndex, TitleResolver
+
+from bench.bench_relevance import _places
+
+ITEMS = 40  # 일정 하나의 장소 수 (예: 8일 x 5곳)
+TERMS = ["해운대", "광안리지역", "국제시장", "카페", "미술관", "전망대", "없는장소"]
+
+
+def _linear_resolve(raw_title, allowed_titles):
+    title = (raw_title or "").strip()
+    if not title:
+        return ""
+    if title in allowed_titles:
+        return title
+    normalized = title.replace(" ", "")
+    for t in allowed_titles:
+        tn = t.replace(" ", "")
+        if normalized == tn or normalized in tn or tn in normalized:
+            return t
+    return ""
+
+
+def _linear_pick(term, places):
+    term_n = re.sub(r"\s+", "", term.lower())
+    variants = [term_n] + ([term_n[:-2]] if term_n.endswith("지역") and len(term_n) > 2 else [])
+    ranked = []
+    for p in places:
+        if not (p.title or "").strip():
+            continue
+        title_n, addr_n = p.title_key, re.sub(r"\s+", "", (p.addr1 or "").lower())
+        score = 0
+        for v in variants:
+            if v == title_n:
+                score = max(score, 100)
+            elif v in title_n or title_n in v:
+                score = max(score, 80)
+            elif addr_n and v in addr_n:
+                score = max(score, 60)
+        if score > 0:
+            ranked.append((score, 1 if p.firstimage else 0, p))
+    ranked.sort(key=lambda x: (x[0], x[1]), reverse=True)
+    return ranked[0][2] if ranked else None
+
+
+def _ms(fn, number):
+    return min(timeit.repeat(fn, number=number, repeat=3)) / number * 1000
+
+
+def main():
+    rng = random.Random(3)
+    print(f"{'titles':>7} {'build ms':>9} {'resolve linear':>15} {'resolve index':>14} {'pick linear':>12} {'pick index':>11}")
+    for n in (1000, 10000):
+        places = _places(n)
+        titles = [p.title for p in places]
+        # 모델이 제목을 조금 다르게(공백 없이/일부만) 돌려준 경우와 목록에 없는 이름
+        raw = [rng.choice(titles).replace(" ", "")[: rng.randint(4, 12)] for _ in range(ITEMS - 4)] + ["없는 장소"] * 4
+        allowed = set(titles)
+
+        build = _ms(lambda: (TitleResolver(titles).resolve("x"), PlaceTermIndex(places)), 1)
+        resolver = TitleResolver(titles)
+        resolver.resolve("x")
+        index = PlaceTermIndex(places)
+        assert [resolver.resolve(r) for r in raw][-4:] == [_linear_resolve(r, allowed) for r in raw][-4:]
+        assert all(index.best(ai._term_variants(t)) is _linear_pick(t, places) for t in TERMS)
+
+        resolve_linear = _ms(lambda: [_linear_resolve(r, allowed) for r in raw], 3)
+        resolve_index = _ms(lambda: [resolver.resolve(r) for r in raw], 20)
+        pick_linear = _ms(lambda: [_linear_pick(t, places) for t in TERMS], 3)
+        pick_index = _ms(lambda: [index.best(ai._term_variants(t)) for t in TERMS], 20)
+        print(
+            f"{n:>7} {build:>9.1f} {resolve_linear:>12.2f} ms {resolve_index:>11.3f} ms"
+            f" {pick_linear:>9.2f} ms {pick_index:>8.3f} ms"
+        )
+    print(f"(resolve: 일정 장소 {ITEMS}개, pick: 편집 단어 {len(TERMS)}개 한 번씩)")
+
+    # found: 뭔가 고름, correct: 고른 제목에 오타 전 단어가 들어 있음 (합성 제목은 단어가 많이 겹쳐 다른 제목도 같은 거리일 수 있음)
+    print(f"\n{'titles':>7} {'fuzzy build ms':>15} {'fuzzy ms/term':>14} {'found':>6} {'correct':>8}")
+    for n in (1000, 10000):
+        places = _places(n)
+        titles = [p.title_key for p in places if len(p.title_key) >= 5]
+        pairs = [_typo(rng, rng.choice(titles)) for _ in range(50)]
+        typos = [typo for _, typo in pairs]
+        build = _ms(lambda: PlaceTermIndex(places).closest(["가나다라"]), 1)
+        index = PlaceTermIndex(places)
+        index.closest(["가나다라"])
+        per_term = _ms(lambda: [index.closest(ai._term_variants(t)) for t in typos], 3) / len(typos)
+        picked = [index.closest(ai._term_variants(typo)) for typo in typos]
+        found = sum(p is not None for p in picked) / len(pairs)
+        correct = sum(p is not None and word in p.title_key for p, (word, _) in zip(picked, pairs)) / len(pairs)
+        print(f"{n:>7} {build:>15.1f} {per_term:>14.3f} {found:>6.0%} {correct:>8.0%}")
+
+
+def _typo(rng, title):
+    start = rng.randrange(len(title) - 4)
+    word = title[start:start + rng.randint(3, 5)]
+    i = rng.randrange(len(word))
+    if rng.random() < 0.5:
+        return word, word[:i] + word[i + 1:]
+    code = ord(word[i]) - 0xAC00
+    if not 0 <= code < 11172:
+        return word, word[:i] + word[i + 1:]
+    # 같은 초성/종성, 다른 중성 ("대" -> "데")
+    vowel = (code // 28 % 21 + rng.randrange(1, 21)) % 21
+    return word, word[:i] + chr(0xAC00 + (code // 588 * 21 + vowel) * 28 + code % 28) + word[i + 1:]
+
+
+if __name__ == "__main__":
+    main()
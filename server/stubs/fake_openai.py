@@ -0,0 +1,271 @@
+"""
+로컬 OpenAI chat completions 대역 서버. /v1/plan 부하 테스트/오프라인 개발용.
+
+    cd server
+    python -m stubs.fake_openai --port 8082 --ttft-ms 600 --tokens-per-second 80 --error-rate 0.02 --garbage-rate 0.05
+
+    # 다른 터미널에서 실제 코드 경로 그대로 사용 (openai 클라이언트가 OPENAI_BASE_URL로 붙음)
+    OPENAI_BASE_URL=http://127.0.0.1:8082/v1 OPENAI_API_KEY=fake LLM_CACHE_ENABLED=0 uvicorn app.main:app
+
+POST /v1/chat/completions 요청의 user 메시지(JSON payload)에서 candidates(id)와 date_hint_list를 읽어
+pace에 맞는 개수로 그럴듯한 travelSchedule을 만든다. 수정 모드(baseSchedule)면 기존 일정 id를 그대로 돌려준다.
+날짜별 병렬 생성 payload(dayOfTrip)는 하루만 만든다.
+
+시간/형식 특성
+- 첫 토큰까지 ttft_ms, 이후 tokens_per_second 속도로 출력 (stream=True면 청크 단위로, 아니면 한 번에)
+- error_rate: HTTP 500 / 429 (OpenAI 에러 JSON)
+- garbage_rate: JSON이 아니거나 중간에 잘린 출력 -> 서버의 파싱 실패/재시도 경로를 탐
+- response_format이 없으면(자유 형식) 가끔 ```json 코드 블록으로 감싸서 응답
+- usage(prompt/completion 토큰 추정치), stream_options.include_usage면 마지막 청크에 usage
+- 프롬프트 캐시 흉내: 최근 요청들과 겹치는 가장 긴 앞부분을 128토큰 단위로 내림해
+  usage.prompt_tokens_details.cached_tokens로 돌려줌 (1024토큰 미만이면 0, OpenAI와 같은 규칙)
+
+지연/오류 주입은 CLI 옵션 또는 FAKE_OPENAI_TTFT_MS, FAKE_OPENAI_TOKENS_PER_SECOND, FAKE_OPENAI_ERROR_RATE,
+FAKE_OPENAI_GARBAGE_RATE, FAKE_OPENAI_SEED 환경변수로 설정.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from app.tokens import estimate_tokens
+
+PACE_COUNTS = {"여유롭게": 3, "보통": 4, "알차게": 5}
+ACTIVITIES = ["산책", "사진 촬영", "카페 휴식", "전시 관람", "맛집 탐방", "야경 감상"]
+CHUNK_CHARS = 16  # 스트림 청크 하나의 글자 수
+CACHE_MIN_TOKENS = 1024
+CACHE_BLOCK_TOKENS = 128
+CACHE_RECENT_PROMPTS = 256  # 캐시 적중 비교 대상 (최근 프롬프트 수)
+
+
+@dataclass
+class FakeOpenAIConfig:
+    ttft_ms: float = 0.0
+    tokens_per_second: float = 0.0  # 0이면 출력 속도 제한 없음
+    error_rate: float = 0.0
+    garbage_rate: float = 0.0
+    seed: Optional[int] = None
+    stats: Dict[str, int] = field(
+        default_factory=lambda: {"requests": 0, "streams": 0, "errors": 0, "garbage": 0, "cached_tokens": 0}
+    )
+    recent_prompts: List[str] = field(default_factory=list)
+
+
+def _user_payload(messages: List[Dict[str, Any]]) -> Dict[str, Any]:
+    for message in reversed(messages):
+        if message.get("role") == "user":
+            try:
+                payload = json.loads(message.get("content") or "")
+            except ValueError:
+                return {}
+            return payload if isinstance(payload, dict) else {}
+    return {}
+
+
+def _plan_output(payload: Dict[str, Any], rng: random.Random) -> Dict[str, Any]:
+    dates = payload.get("date_hint_list") or [""]
+    if "baseSchedule" in payload:
+        schedule = [
+            {
+                "day": day.get("day") or f"Day {i + 1}",
+                "date": day.get("date") or "",
+                "plan": [
+                    {"id": item["id"], "description": item.get("description") or "", "activity": item.get("activity") or ""}
+                    for item in day.get("plan", [])
+                ],
+            }
+            for i, day in enumerate(payload["baseSchedule"])
+        ]
+        return {"text": "요청하신 내용을 반영해 일정을 수정했어요.", "travelSchedule": schedule}
+
+    candidates = [c for c in payload.get("candidates") or [] if isinstance(c, dict) and "id" in c]
+    per_day = PACE_COUNTS.get(payload.get("pace") or "", 4)
+    day_offset = 0
+    if "dayOfTrip" in payload:
+        dates = dates[:1]
+        day_offset = int(payload["dayOfTrip"].get("day", 1)) - 1
+
+    schedule = []
+    for i, date in enumerate(dates):
+        picked = candidates[i * per_day:(i + 1) * per_day]
+        schedule.append(
+            {
+                "day": f"Day {day_offset + i + 1}",
+                "date": date,
+                "plan": [
+                    {
+                        "id": c["id"],
+                        "description": f"{c.get('title', '')}에서 여유롭게 시간 보내기",
+                        "activity": rng.choice(ACTIVITIES),
+                    }
+                    for c in picked
+                ],
+            }
+        )
+    region = payload.get("region") or ""
+    return {"text": f"{region} {len(dates)}일 일정을 만들었어요.".strip(), "travelSchedule": schedule}
+
+
+def _output_text(body: Dict[str, Any], config: FakeOpenAIConfig, rng: random.Random) -> str:
+    text = json.dumps(_plan_output(_user_payload(body.get("messages") or []), rng), ensure_ascii=False)
+    if rng.random() < config.garbage_rate:
+        config.stats["garbage"] += 1
+        return rng.choice(["죄송하지만 일정을 만들 수 없어요.", text[: len(text) // 2]])
+    if "response_format" not in body and rng.random() < 0.3:
+        return "```json\n" + text + "\n```"
+    return text
+
+
+def _prompt_text(body: Dict[str, Any]) -> str:
+    return "".join(f"{m.get('role')}\n{m.get('content') or ''}\n" for m in body.get("messages") or [])
+
+
+def _cached_tokens(prompt: str, config: FakeOpenAIConfig) -> int:
+    """최근 프롬프트와 겹치는 가장 긴 앞부분의 토큰 수(128 단위 내림, 1024 미만이면 0). 이번 프롬프트도 기억."""
+    shared = max((len(os.path.commonprefix([prompt, seen])) for seen in config.recent_prompts), default=0)
+    config.recent_prompts.append(prompt)
+    del config.recent_prompts[:-CACHE_RECENT_PROMPTS]
+    tokens = estimate_tokens(prompt[:shared]) // CACHE_BLOCK_TOKENS * CACHE_BLOCK_TOKENS
+    cached = tokens if tokens >= CACHE_MIN_TOKENS else 0
+    config.stats["cached_tokens"] += cached
+    return cached
+
+
+def _usage(body: Dict[str, Any], text: str, cached: int) -> Dict[str, Any]:
+    prompt = sum(estimate_tokens(str(m.get("content") or "")) for m in body.get("messages") or [])
+    completion = estimate_tokens(text)
+    return {
+        "prompt_tokens": prompt,
+        "completion_tokens": completion,
+        "total_tokens": prompt + completion,
+        "prompt_tokens_details": {"cached_tokens": min(cached, prompt)},
+    }
+
+
+def _error(status: int) -> JSONResponse:
+    kind = "rate_limit_exceeded" if status == 429 else "server_error"
+    return JSONResponse(
+        {"error": {"message": f"fake {kind}", "type": kind, "param": None, "code": kind}}, status_code=status
+    )
+
+
+def create_app(config: Optional[FakeOpenAIConfig] = None) -> FastAPI:
+    config = config or FakeOpenAIConfig()
+    rng = random.Random(config.seed)
+    app = FastAPI(title="Fake OpenAI chat completions")
+    app.state.config = config
+
+    def seconds_for(text: str) -> float:
+        if config.tokens_per_second <= 0:
+            return 0.0
+        return estimate_tokens(text) / config.tokens_per_second
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        config.stats["requests"] += 1
+        if rng.random() < config.error_rate:
+            config.stats["errors"] += 1
+            return _error(rng.choice([429, 500]))
+
+        model = body.get("model") or "fake"
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+        created = int(time.time())
+        text = _output_text(body, config, rng)
+        cached = _cached_tokens(_prompt_text(body), config)
+        await asyncio.sleep(config.ttft_ms / 1000)
+
+        if not body.get("stream"):
+            await asyncio.sleep(seconds_for(text))
+            return JSONResponse(
+                {
+                    "id": completion_id,
+                    "object": "chat.completion",
+                    "created": created,
+                    "model": model,
+                    "choices": [
+                        {
+                            "index": 0,
+                            "message": {"role": "assistant", "content": text, "refusal": None},
+                            "finish_reason": "stop",
+                        }
+                    ],
+                    "usage": _usage(body, text, cached),
+                }
+            )
+
+        config.stats["streams"] += 1
+        include_usage = bool((body.get("stream_options") or {}).get("include_usage"))
+
+        def chunk(delta: Dict[str, Any], finish_reason: Optional[str] = None, **extra: Any) -> str:
+            data = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+                **extra,
+            }
+            return f"data: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+        async def events():
+            yield chunk({"role": "assistant", "content": ""})
+            for i in range(0, len(text), CHUNK_CHARS):
+                piece = text[i:i + CHUNK_CHARS]
+                await asyncio.sleep(seconds_for(piece))
+                yield chunk({"content": piece})
+            yield chunk({}, "stop")
+            if include_usage:
+                usage = {
+                    "id": completion_id,
+                    "object": "chat.completion.chunk",
+                    "created": created,
+                    "model": model,
+                    "choices": [],
+                    "usage": _usage(body, text, cached),
+                }
+                yield f"data: {json.dumps(usage)}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    @app.get("/_stats")
+    def stats():
+        return config.stats
+
+    return app
+
+
+def main(argv=None) -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Fake OpenAI chat completions server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8082)
+    parser.add_argument("--ttft-ms", type=float, default=float(os.getenv("FAKE_OPENAI_TTFT_MS", "0")))
+    parser.add_argument("--tokens-per-second", type=float, default=float(os.getenv("FAKE_OPENAI_TOKENS_PER_SECOND", "0")))
+    parser.add_argument("--error-rate", type=float, default=float(os.getenv("FAKE_OPENAI_ERROR_RATE", "0")))
+    parser.add_argument("--garbage-rate", type=float, default=float(os.getenv("FAKE_OPENAI_GARBAGE_RATE", "0")))
+    parser.add_argument("--seed", type=int, default=int(os.environ["FAKE_OPENAI_SEED"]) if os.getenv("FAKE_OPENAI_SEED") else None)
+    args = parser.parse_args(argv)
+
+    config = FakeOpenAIConfig(
+        ttft_ms=args.ttft_ms,
+        tokens_per_second=args.tokens_per_second,
+        error_rate=args.error_rate,
+        garbage_rate=args.garbage_rate,
+        seed=args.seed,
+    )
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
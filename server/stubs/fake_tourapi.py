@@ -0,0 +1,202 @@
+"""
+로컬 TourAPI(KorService2) 대역 서버. 오프라인 개발, 부하 테스트, 벤치마크용.
+
+    cd server
+    python -m stubs.fake_tourapi --port 8081 --latency-ms 300 --jitter-ms 100 --error-rate 0.05
+
+    # 다른 터미널에서 실제 클라이언트 코드 경로 그대로 사용
+    TOURAPI_BASE_URL=http://127.0.0.1:8081/B551011/KorService2 TOURAPI_SERVICE_KEY=fake \\
+        TOURAPI_CACHE_ENABLED=0 uvicorn app.main:app
+
+areaBasedList2를 stubs/fixtures/areaBasedList2_{areaCode}_{contentTypeId}.json(없으면 _{areaCode}.json)에서
+읽어 numOfRows/pageNo로 잘라서 응답한다. 픽스처가 없는 조합은 지역 중심 좌표 주변에 결정적인 가짜 장소를 만든다.
+
+실제 API의 응답 특성도 흉내낸다.
+- 결과가 1건이면 item이 리스트가 아니라 객체
+- 결과가 없으면 items가 빈 문자열("")
+- 장애/쿼터 초과 시 HTTP 200 + XML 에러 본문
+- 간헐적인 5xx
+
+지연/오류 주입은 CLI 옵션 또는 FAKE_TOURAPI_LATENCY_MS, FAKE_TOURAPI_JITTER_MS, FAKE_TOURAPI_ERROR_RATE,
+FAKE_TOURAPI_XML_ERROR_RATE, FAKE_TOURAPI_SEED 환경변수로 설정.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response
+
+FIXTURE_DIR = Path(__file__).resolve().parent / "fixtures"
+
+XML_ERROR_TEMPLATE = (
+    "<OpenAPI_ServiceResponse><cmmMsgHeader>"
+    "<errMsg>SERVICE ERROR</errMsg>"
+    "<returnAuthMsg>{auth_msg}</returnAuthMsg>"
+    "<returnReasonCode>{code}</returnReasonCode>"
+    "</cmmMsgHeader></OpenAPI_ServiceResponse>"
+)
+
+# 가짜 장소 생성용 지역 중심 좌표 (lat, lng)
+AREA_CENTERS = {
+    1: (37.5665, 126.9780), 2: (37.4563, 126.7052), 3: (36.3504, 127.3845), 4: (35.8714, 128.6014),
+    5: (35.1595, 126.8526), 6: (35.1796, 129.0756), 7: (35.5384, 129.3114), 8: (36.4800, 127.2890),
+    31: (37.2752, 127.0095), 32: (37.8854, 127.7298), 33: (36.6357, 127.4917), 34: (36.6588, 126.6728),
+    35: (36.5760, 128.5056), 36: (35.2383, 128.6924), 37: (35.8202, 127.1088), 38: (34.8161, 126.4629),
+    39: (33.4996, 126.5312),
+}
+
+
+@dataclass
+class FakeTourAPIConfig:
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0  # HTTP 500 비율
+    xml_error_rate: float = 0.0  # HTTP 200 + XML 에러 본문 비율
+    synthetic_count: int = 120  # 픽스처 없는 조합의 가짜 장소 수
+    seed: Optional[int] = None
+    stats: Dict[str, int] = field(default_factory=lambda: {"requests": 0, "errors": 0, "xml_errors": 0})
+
+
+def _load_fixture_items(area_code: int, content_type_id: Optional[int]) -> Optional[List[dict]]:
+    names = []
+    if content_type_id is not None:
+        names.append(f"areaBasedList2_{area_code}_{content_type_id}.json")
+    names.append(f"areaBasedList2_{area_code}.json")
+    for name in names:
+        path = FIXTURE_DIR / name
+        if path.exists():
+            data = json.loads(path.read_text(encoding="utf-8"))
+            items = data["response"]["body"]["items"]
+            items = items.get("item", []) if isinstance(items, dict) else []
+            return [items] if isinstance(items, dict) else list(items)
+    return None
+
+
+def _synthetic_items(area_code: int, content_type_id: Optional[int], count: int) -> List[dict]:
+    lat0, lng0 = AREA_CENTERS.get(area_code, AREA_CENTERS[6])
+    rng = random.Random(area_code * 1000 + (content_type_id or 0))
+    ctid = content_type_id or rng.choice([12, 14, 15, 32, 38, 39])
+    items = []
+    for i in range(count):
+        has_image = rng.random() < 0.7
+        items.append(
+            {
+                "addr1": f"가짜시 {area_code}구 테스트로 {i + 1}",
+                "areacode": str(area_code),
+                "contentid": str(9_000_000 + area_code * 10_000 + ctid * 100 + i),
+                "contenttypeid": str(ctid),
+                "firstimage": f"http://tong.visitkorea.or.kr/cms/resource/fake/{area_code}_{ctid}_{i}.jpg" if has_image else "",
+                "mapx": f"{lng0 + rng.uniform(-0.15, 0.15):.7f}",
+                "mapy": f"{lat0 + rng.uniform(-0.12, 0.12):.7f}",
+                "modifiedtime": f"2025{rng.randint(1, 12):02d}{rng.randint(1, 28):02d}120000",
+                "title": f"테스트장소 {area_code}-{ctid}-{i + 1}",
+            }
+        )
+    return items
+
+
+def _xml_error(auth_msg: str = "LIMITED_NUMBER_OF_SERVICE_REQUESTS_EXCEEDS_ERROR", code: str = "22") -> Response:
+    # 실제 API는 에러도 HTTP 200 + XML로 내려줌
+    return Response(XML_ERROR_TEMPLATE.format(auth_msg=auth_msg, code=code), status_code=200, media_type="text/xml")
+
+
+def _page_body(items: List[dict], num_of_rows: int, page_no: int) -> Dict[str, Any]:
+    start = (page_no - 1) * num_of_rows
+    page = items[start:start + num_of_rows]
+    if not page:
+        items_field: Any = ""
+    elif len(page) == 1:
+        items_field = {"item": page[0]}
+    else:
+        items_field = {"item": page}
+    return {
+        "response": {
+            "header": {"resultCode": "0000", "resultMsg": "OK"},
+            "body": {
+                "items": items_field,
+                "numOfRows": num_of_rows,
+                "pageNo": page_no,
+                "totalCount": len(items),
+            },
+        }
+    }
+
+
+def create_app(config: Optional[FakeTourAPIConfig] = None) -> FastAPI:
+    config = config or FakeTourAPIConfig()
+    rng = random.Random(config.seed)
+    app = FastAPI(title="Fake TourAPI KorService2")
+    app.state.config = config
+
+    @app.get("/B551011/KorService2/areaBasedList2")
+    async def area_based_list2(request: Request):
+        config.stats["requests"] += 1
+        delay = config.latency_ms + rng.uniform(-config.jitter_ms, config.jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+
+        roll = rng.random()
+        if roll < config.error_rate:
+            config.stats["errors"] += 1
+            return Response("Internal Server Error", status_code=500, media_type="text/plain")
+        if roll < config.error_rate + config.xml_error_rate:
+            config.stats["xml_errors"] += 1
+            return _xml_error()
+
+        q = request.query_params
+        if not q.get("serviceKey"):
+            return _xml_error("SERVICE_KEY_IS_NOT_REGISTERED_ERROR", "30")
+
+        try:
+            area_code = int(q.get("areaCode") or 6)
+            content_type_id = int(q["contentTypeId"]) if q.get("contentTypeId") else None
+            num_of_rows = max(int(q.get("numOfRows") or 10), 1)
+            page_no = max(int(q.get("pageNo") or 1), 1)
+        except ValueError:
+            return _xml_error("INVALID_REQUEST_PARAMETER_ERROR", "10")
+
+        items = _load_fixture_items(area_code, content_type_id)
+        if items is None:
+            items = _synthetic_items(area_code, content_type_id, config.synthetic_count)
+        return JSONResponse(_page_body(items, num_of_rows, page_no))
+
+    @app.get("/_stats")
+    def stats():
+        return config.stats
+
+    return app
+
+
+def main(argv=None) -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Fake TourAPI KorService2 server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency-ms", type=float, default=float(os.getenv("FAKE_TOURAPI_LATENCY_MS", "0")))
+    parser.add_argument("--jitter-ms", type=float, default=float(os.getenv("FAKE_TOURAPI_JITTER_MS", "0")))
+    parser.add_argument("--error-rate", type=float, default=float(os.getenv("FAKE_TOURAPI_ERROR_RATE", "0")))
+    parser.add_argument("--xml-error-rate", type=float, default=float(os.getenv("FAKE_TOURAPI_XML_ERROR_RATE", "0")))
+    parser.add_argument("--synthetic-count", type=int, default=int(os.getenv("FAKE_TOURAPI_SYNTHETIC_COUNT", "120")))
+    parser.add_argument("--seed", type=int, default=int(os.environ["FAKE_TOURAPI_SEED"]) if os.getenv("FAKE_TOURAPI_SEED") else None)
+    args = parser.parse_args(argv)
+
+    config = FakeTourAPIConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        xml_error_rate=args.xml_error_rate,
+        synthetic_count=args.synthetic_count,
+        seed=args.seed,
+    )
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+from app.cache import SQLiteTTLCache, make_cache_key
+
+
+class SQLiteTTLCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "cache.sqlite3")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_cache_key_ignores_order_and_empty_values(self):
+        a = make_cache_key({"areaCode": 6, "contentTypeId": 12, "cat1": None})
+        b = make_cache_key({"contentTypeId": "12", "areaCode": "6", "cat2": ""})
+        self.assertEqual(a, b)
+
+    def test_fresh_hit_skips_loader_and_is_shared_between_instances(self):
+        cache = SQLiteTTLCache(self.path, namespace="t", ttl=60, stale_ttl=60)
+        calls = []
+        loader = lambda: calls.append(1) or [{"title": "해운대"}]
+
+        self.assertEqual(cache.get_or_load("k", loader), [{"title": "해운대"}])
+        self.assertEqual(cache.get_or_load("k", loader), [{"title": "해운대"}])
+        other = SQLiteTTLCache(self.path, namespace="t", ttl=60, stale_ttl=60)
+        self.assertEqual(other.get_or_load("k", loader), [{"title": "해운대"}])
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(cache.stats()["misses"], 1)
+        self.assertEqual(cache.stats()["hits"], 1)
+
+    def test_stale_entry_is_served_while_refreshing(self):
+        cache = SQLiteTTLCache(self.path, namespace="t", ttl=10, stale_ttl=100)
+        cache.set("k", ["old"])
+
+        with patch("app.cache.time.time", return_value=time.time() + 50):
+            value = cache.get_or_load("k", lambda: ["new"])
+        self.assertEqual(value, ["old"])
+
+        deadline = time.time() + 2
+        while time.time() < deadline and cache.get_entry("k")[0] != ["new"]:
+            time.sleep(0.01)
+        self.assertEqual(cache.get_entry("k")[0], ["new"])
+        self.assertEqual(cache.stats()["stale_hits"], 1)
+
+    def test_none_result_is_not_cached(self):
+        cache = SQLiteTTLCache(self.path, namespace="t", ttl=60, stale_ttl=60)
+        self.assertIsNone(cache.get_or_load("k", lambda: None))
+        self.assertIsNone(cache.get_entry("k"))
+
+
+if __name__ == "__main__":
+    unittest.main()
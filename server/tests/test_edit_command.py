@@ -0,0 +1,135 @@
+import random
+import re
+import unittest
+
+from app.edit_command import (
+    ADD_KEYWORDS,
+    EDIT_INTENT_KEYWORDS,
+    REMOVE_KEYWORDS,
+    REPLAN_INTENT_KEYWORDS,
+    EditCommand,
+    parse_edit_command,
+)
+
+
+# ---- 단일 정규식 파서 도입 전 구현 (결과 비교 기준) ----
+def _legacy_parse(user_input):
+    text = (user_input or "").strip()
+    normalized_all = re.sub(r"\s+", "", text.lower())
+    intents = (
+        any(k in normalized_all for k in REPLAN_INTENT_KEYWORDS),
+        any(k in text for k in EDIT_INTENT_KEYWORDS),
+        any(k in text for k in ADD_KEYWORDS),
+    )
+
+    def clean(t):
+        t = re.sub(r"[0-9]+\s*(?:일차|일째|째날|일)\s*(?:에|날에)?", " ", t)
+        for k in REMOVE_KEYWORDS + ADD_KEYWORDS:
+            t = t.replace(k, " ")
+        t = re.sub(r"(해줘요|해줘|해주세요|줘요|줘|좀|해주고|해주시고|하고)", " ", t)
+        t = re.sub(r"[\"'`]", " ", t)
+        return re.sub(r"(은|는|이|가|을|를|와|과)$", "", " ".join(t.split()).strip())
+
+    def day_index(chunk):
+        m = re.search(r"([1-9][0-9]*)\s*(?:일차|일째|째날|일)\s*(?:에|날에)?", chunk)
+        return max(int(m.group(1)) - 1, 0) if m else None
+
+    normalized = text
+    for src, dst in {
+        "빼고": "빼,", "빼주고": "빼,", "제외하고": "제외,", "삭제하고": "삭제,", "제거하고": "제거,",
+        "없애고": "없애,", "넣고": "넣어,", "추가하고": "추가,", "배치하고": "배치,",
+    }.items():
+        normalized = normalized.replace(src, dst)
+    chunks = [c.strip() for c in re.split(r"(?:,|;|\n|그리고|또한|또|및|/)", normalized) if c.strip()]
+
+    remove_terms, add_requests = [], []
+    for chunk in chunks:
+        m = re.search(r"(.+?)\s*(?:을|를)\s*(.+?)\s*로\s*(?:바꿔|교체|변경)", chunk)
+        if m:
+            old, new = clean(m.group(1)), clean(m.group(2))
+            if old:
+                remove_terms.append(old)
+            if new:
+                add_requests.append((day_index(chunk), new))
+            continue
+        if any(k in chunk for k in REMOVE_KEYWORDS):
+            target = clean(chunk)
+            if target:
+                remove_terms.append(target)
+        if any(k in chunk for k in ADD_KEYWORDS):
+            target = clean(chunk)
+            if target:
+                add_requests.append((day_index(chunk), target))
+
+    def key(t):
+        return re.sub(r"\s+", "", t.lower())
+
+    compact_remove = []
+    for t in remove_terms:
+        if key(t) and key(t) not in {key(x) for x in compact_remove}:
+            compact_remove.append(t)
+    compact_add = []
+    for d, t in add_requests:
+        if key(t) and (d, key(t)) not in {(x, key(y)) for x, y in compact_add}:
+            compact_add.append((d, t))
+    return intents, tuple(compact_remove), tuple(compact_add)
+
+
+MESSAGES = [
+    "광안리 빼고 2째날에 해운대 넣어줘",
+    "해운대 삭제",
+    "2일차에 감천문화마을 추가",
+    "국제시장을 자갈치시장으로 바꿔줘",
+    "1일차 해운대를 광안리로 교체해줘",
+    "'부산타워' 지워줘 그리고 3일째에 흰여울마을 넣어줘요",
+    "기장지역 제외하고 송정 추가해줘",
+    "처음부터 다시 만들어줘",
+    "완전히 새로 짜줘",
+    "순서만 좀 바꿔줘",
+    "카페 포함, 시장 빼주고 / 박물관 배치하고 전망대 없애",
+    "새 일정 부탁해",
+    "",
+    "   ",
+    "부산 여행 일정 짜줘",
+]
+
+
+class EditCommandTests(unittest.TestCase):
+    def _assert_same(self, message):
+        cmd = parse_edit_command(message)
+        intents, remove_terms, add_requests = _legacy_parse(message)
+        if not message.strip():
+            self.assertEqual(cmd, EditCommand())
+            return
+        self.assertEqual((cmd.replan, cmd.edit, cmd.add), intents, message)
+        self.assertEqual(cmd.remove_terms, remove_terms, message)
+        self.assertEqual(cmd.add_requests, add_requests, message)
+
+    def test_same_result_as_previous_parser(self):
+        for message in MESSAGES:
+            self._assert_same(message)
+
+    def test_random_messages_match_previous_parser(self):
+        rng = random.Random(4)
+        words = ["해운대", "광안리", "시장", "카페", "2일차에", "3째날", "을", "를", "로", "좀", "그리고", ",", "\n", "'"]
+        verbs = list(ADD_KEYWORDS + REMOVE_KEYWORDS) + ["빼고", "제외하고", "추가하고", "바꿔줘", "교체", "다시 만들어", "새일정"]
+        for _ in range(500):
+            tokens = [rng.choice(words + verbs) for _ in range(rng.randint(1, 8))]
+            self._assert_same(rng.choice([" ", ""]).join(tokens))
+
+    def test_parses_chained_requests(self):
+        cmd = parse_edit_command("광안리 빼고 2째날에 해운대 넣어줘")
+        self.assertEqual(cmd.remove_terms, ("광안리",))
+        self.assertEqual(cmd.add_requests, ((1, "해운대"),))
+        self.assertTrue(cmd.edit and cmd.add and cmd.recognized)
+        self.assertFalse(cmd.replan)
+
+    def test_repeated_input_is_memoized(self):
+        parse_edit_command.cache_clear()
+        first = parse_edit_command("해운대 삭제")
+        self.assertIs(parse_edit_command("해운대 삭제"), first)
+        self.assertEqual(parse_edit_command.cache_info().hits, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
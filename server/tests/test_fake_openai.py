@@ -0,0 +1,128 @@
+import os
+import socket
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+import uvicorn
+
+from app import ai
+from app.model_client import ModelClient
+from app.schemas import PlaceCandidate
+from stubs.fake_openai import FakeOpenAIConfig, create_app
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+PLACES = [
+    PlaceCandidate(title=f"장소{i}", firstimage="x.jpg", mapy=35.1 + i * 0.003, mapx=129.0 + i * 0.003, contenttypeid="12")
+    for i in range(12)
+]
+
+
+class FakeOpenAIEndToEndTests(unittest.TestCase):
+    """실제 openai 클라이언트(ModelClient)를 로컬 가짜 서버에 붙여서 일반/스트리밍/재시도 경로 확인."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.config = FakeOpenAIConfig(seed=3)
+        port = _free_port()
+        cls.server = uvicorn.Server(uvicorn.Config(create_app(cls.config), host="127.0.0.1", port=port, log_level="error"))
+        cls.thread = threading.Thread(target=cls.server.run, daemon=True)
+        cls.thread.start()
+        deadline = time.monotonic() + 10
+        while not cls.server.started and time.monotonic() < deadline:
+            time.sleep(0.02)
+        cls.client = ModelClient("fake-openai-test", api_key="fake", base_url=f"http://127.0.0.1:{port}/v1", hedge=False)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.should_exit = True
+        cls.thread.join(timeout=5)
+
+    def setUp(self):
+        self.config.garbage_rate = 0.0
+        self.config.ttft_ms = 0.0
+        patchers = [
+            patch.object(ai, "client", self.client),
+            patch.object(ai, "get_llm_cache", return_value=None),
+            patch.dict(os.environ, {"OPENAI_API_KEY": "fake"}),
+        ]
+        for p in patchers:
+            p.start()
+            self.addCleanup(p.stop)
+
+    def _kwargs(self):
+        return dict(
+            user_input="",
+            date_str="2026-03-01~2026-03-02",
+            region="부산",
+            travel_type="관광지",
+            transportation="",
+            pace="여유롭게",
+            places=PLACES,
+            use_cache=False,
+        )
+
+    def test_plan_through_real_client(self):
+        result = ai.build_plan_from_front(**self._kwargs())
+        self.assertEqual([d.date for d in result.travelSchedule], ["2026-03-01", "2026-03-02"])
+        titles = [p.place for d in result.travelSchedule for p in d.plan]
+        self.assertEqual(len(titles), 6)
+        self.assertTrue(all(t.startswith("장소") for t in titles))
+
+    def test_stream_emits_days_and_usage(self):
+        events = list(ai.stream_plan_from_front(**self._kwargs()))
+        self.assertEqual([e for e, _ in events], ["model_started", "day", "day", "done"])
+        self.assertEqual(len(events[-1][1]["travelSchedule"]), 2)
+
+    def test_garbage_output_takes_retry_path(self):
+        self.config.garbage_rate = 1.0
+        with patch.object(ai, "_model_counts", {}):
+            with self.assertRaises(ValueError):
+                ai._request_model_json("sys", {"candidates": []}, retry=1)
+            stats = ai.model_stats()[ai.MODEL]
+        self.assertEqual((stats["calls"], stats["parse_failures"], stats["retries"]), (2, 2, 1))
+
+    def test_time_to_first_token_is_simulated(self):
+        self.config.ttft_ms = 200
+        started = time.perf_counter()
+        ai._request_model_json("sys", {"candidates": []}, retry=0)
+        self.assertGreaterEqual(time.perf_counter() - started, 0.2)
+
+    def test_static_prefix_is_served_from_prompt_cache(self):
+        # 관련도 정렬(기본값) 그대로: 메시지마다 맞는 장소가 달라도 후보 앞 목록은 같아야 함
+        words = ["해변 산책로", "카페거리", "미술관", "전통시장", "전망대"]
+        places = [
+            PlaceCandidate(
+                title=f"{words[i % len(words)]} {i}", addr1="부산광역시 해운대구", firstimage="x.jpg",
+                mapy=35.1 + i * 0.001, mapx=129.0, contenttypeid="12",
+            )
+            for i in range(120)
+        ]
+        kwargs = dict(self._kwargs(), places=places)
+        kwargs.pop("use_cache")
+        payloads = []
+        with patch.object(ai, "_model_counts", {}):
+            self.assertTrue(ai.RELEVANCE_RANKING)
+            for user_input in ("해변 산책 위주로", "조용한 카페 위주로"):
+                ctx = ai._prepare_plan_context(**dict(kwargs, user_input=user_input))
+                payloads.append(ctx.user_payload)
+                ai._request_model_json(ctx.system, ctx.user_payload, retry=0)
+            stats = ai.model_stats()[ai.MODEL]
+        first, second = (p["candidates"] for p in payloads)
+        self.assertNotEqual(payloads[0]["relevantIds"], payloads[1]["relevantIds"])
+        stable = len(first) - ai.FOCUS_EXTRA_LIMIT
+        self.assertEqual(first[:stable], second[:stable])
+        # 두 번째 요청은 system + 후보 앞 목록까지 캐시에 걸림
+        self.assertGreaterEqual(stats["cached_prompt_tokens"], 1024)
+        self.assertLess(stats["cached_prompt_tokens"], stats["prompt_tokens"])
+
+
+if __name__ == "__main__":
+    unittest.main()
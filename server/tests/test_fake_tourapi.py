@@ -0,0 +1,84 @@
+import socket
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+import uvicorn
+
+from app import tourapi
+from app.breaker import CircuitBreaker
+from stubs.fake_tourapi import FakeTourAPIConfig, create_app
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class FakeTourAPIEndToEndTests(unittest.TestCase):
+    """실제 클라이언트(requests 세션, 재시도, 파싱)를 로컬 가짜 서버에 붙여서 확인."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.config = FakeTourAPIConfig(synthetic_count=31, seed=1)
+        port = _free_port()
+        cls.server = uvicorn.Server(uvicorn.Config(create_app(cls.config), host="127.0.0.1", port=port, log_level="error"))
+        cls.thread = threading.Thread(target=cls.server.run, daemon=True)
+        cls.thread.start()
+        deadline = time.monotonic() + 10
+        while not cls.server.started and time.monotonic() < deadline:
+            time.sleep(0.02)
+        cls.base_url = f"http://127.0.0.1:{port}/B551011/KorService2"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.should_exit = True
+        cls.thread.join(timeout=5)
+
+    def setUp(self):
+        self.config.error_rate = 0.0
+        self.config.xml_error_rate = 0.0
+        patchers = [
+            patch.object(tourapi, "BASE_URL", self.base_url),
+            patch.object(tourapi, "TOURAPI_KEY", "fake"),
+            patch.object(tourapi, "CACHE_ENABLED", False),
+            patch.object(tourapi, "BACKOFF_BASE", 0.0),
+            patch.object(tourapi, "_breaker", CircuitBreaker("tourapi-fake-test", failure_threshold=100)),
+        ]
+        for p in patchers:
+            p.start()
+            self.addCleanup(p.stop)
+
+    def test_fixture_pages_and_drops_rows_without_coordinates(self):
+        places, total = tourapi.area_based_list2_page(area_code=6, content_type_id=12, num_of_rows=10, page_no=1)
+        self.assertEqual(total, 16)
+        self.assertEqual(len(places), 10)
+
+        pages = list(tourapi.iter_area_based_list2_pages(area_code=6, content_type_id=12, page_size=10, max_rows=80))
+        self.assertEqual(len(pages), 2)
+        # 픽스처 16건 중 좌표 없는 1건 제외
+        self.assertEqual(sum(len(p) for p in pages), 15)
+
+    def test_single_item_page_and_empty_page(self):
+        # 합성 데이터 31건 -> 30건씩이면 2페이지는 item이 객체 하나
+        places, total = tourapi.area_based_list2_page(area_code=1, content_type_id=14, num_of_rows=30, page_no=2)
+        self.assertEqual(total, 31)
+        self.assertEqual(len(places), 1)
+        self.assertTrue(places[0].title.startswith("테스트장소 1-14-"))
+
+        # 범위를 넘는 페이지는 items가 빈 문자열
+        places, total = tourapi.area_based_list2_page(area_code=1, content_type_id=14, num_of_rows=30, page_no=3)
+        self.assertEqual(places, [])
+        self.assertEqual(total, 31)
+
+    def test_xml_error_is_retried_then_gives_up(self):
+        self.config.xml_error_rate = 1.0
+        before = self.config.stats["xml_errors"]
+        self.assertEqual(tourapi.area_based_list2(area_code=1, content_type_id=12), [])
+        self.assertEqual(self.config.stats["xml_errors"] - before, tourapi.MAX_RETRIES + 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
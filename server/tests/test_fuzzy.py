@@ -0,0 +1,144 @@
+import math
+import random
+import unittest
+
+from app import ai
+from app.fuzzy import GAP_COST, MAX_COST_RATIO, MIN_QUERY_JAMO, MIN_SHARED_RATIO, JamoIndex, split_category, to_jamo
+from app.schemas import PlaceCandidate
+from app.title_index import PlaceTermIndex
+
+SYLLABLES = "해운대데광안리시장감천마을"
+
+
+# ---- 후보 추림/가지치기 없이 키마다 전부 계산 (결과 비교 기준) ----
+def _reference_cost(query, key):
+    q, s = to_jamo(query), to_jamo(key)
+    prev = [0.0] * (len(s) + 1)
+    for ch in q:
+        row = [prev[0] + 1]
+        for j in range(1, len(s) + 1):
+            row.append(min(prev[j - 1] + (s[j - 1] != ch), prev[j] + 1, row[j - 1] + GAP_COST))
+        prev = row
+    return min(prev)
+
+
+def _reference_matches(query, keys):
+    q = to_jamo(query)
+    if len(q) < MIN_QUERY_JAMO:
+        return []
+    grams = {q[i:i + 2] for i in range(len(q) - 1)}
+    need = max(1, math.ceil(len(grams) * MIN_SHARED_RATIO))
+    limit = max(1.0, len(q) * MAX_COST_RATIO)
+    found = []
+    for i, key in enumerate(keys):
+        s = to_jamo(key)
+        if sum(g in s for g in grams) < need:
+            continue
+        cost = _reference_cost(query, key)
+        if cost <= limit:
+            found.append((cost, i))
+    return sorted(found)
+
+
+def _place(title, i=0, image=""):
+    return PlaceCandidate(title=title, addr1="부산광역시", firstimage=image, mapy=35.1, mapx=129.0, contentid=str(i))
+
+
+class JamoIndexTests(unittest.TestCase):
+    def test_matches_reference(self):
+        rng = random.Random(17)
+        for _ in range(200):
+            keys = ["".join(rng.choice(SYLLABLES) for _ in range(rng.randint(1, 7))) for _ in range(rng.randint(1, 20))]
+            index = JamoIndex(keys)
+            for _ in range(10):
+                query = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(1, 5)))
+                self.assertEqual(index.matches(query), _reference_matches(query, keys), (keys, query))
+
+    def test_typos_and_partial_names(self):
+        index = JamoIndex(["광안리해수욕장", "해운대해수욕장", "감천문화마을", "부산시민공원"])
+        self.assertEqual(index.best("해운데")[1], 1)  # 모음 하나 오타
+        self.assertEqual(index.best("감천마을")[1], 2)  # 중간 생략
+        self.assertEqual(index.best("광안니해수욕장")[1], 0)
+        self.assertIsNone(index.best("자갈치시장"))
+        self.assertIsNone(index.best("해"))  # 너무 짧은 질의
+        self.assertIsNone(JamoIndex([]).best("해운데"))
+
+
+class ClosestPlaceTests(unittest.TestCase):
+    TITLES = ["해운대해수욕장", "송정해수욕장", "용두산공원", "감천문화마을", "광안리해수욕장", "해동용궁사"]
+
+    def _index(self):
+        return PlaceTermIndex([_place(t, i) for i, t in enumerate(self.TITLES)])
+
+    def test_category_suffix_is_split_off(self):
+        self.assertEqual(split_category("다대포해수욕장"), ("다대포", "해수욕장"))
+        self.assertEqual(split_category("감천마을"), ("감천", "마을"))
+        self.assertEqual(split_category("공원"), ("공원", ""))
+        self.assertEqual(split_category("해운데"), ("해운데", ""))
+
+    def test_different_places_sharing_a_suffix_do_not_match(self):
+        index = self._index()
+        for term in ("다대포해수욕장", "송도해수욕장", "송도", "부산공원"):
+            self.assertIsNone(index.closest(ai._term_variants(term)), term)
+
+    def test_typos_in_the_distinctive_part_still_match(self):
+        index = self._index()
+        for term, title in (
+            ("해운데해수욕장", "해운대해수욕장"),
+            ("광안니 해수욕장", "광안리해수욕장"),
+            ("감천마을", "감천문화마을"),
+            ("용두산 공원", "용두산공원"),
+            ("해동용궁", "해동용궁사"),
+        ):
+            self.assertEqual(index.closest(ai._term_variants(term)).title, title, term)
+
+    def test_closest_is_fallback_after_exact_tiers(self):
+        places = [_place("해운대시장", 0), _place("해운대해수욕장", 1, "x.jpg"), _place("감천문화마을", 2)]
+        index = PlaceTermIndex(places)
+        self.assertIsNone(index.best(ai._term_variants("해운데")))
+        self.assertIs(index.closest(ai._term_variants("해운데")), places[1])  # 같은 거리면 이미지 있는 장소
+        self.assertIs(ai._pick_candidate_for_term("감천 마을", places), places[2])
+        self.assertIs(ai._pick_candidate_for_term("해운대", places), places[1])
+        self.assertIsNone(ai._pick_candidate_for_term("자갈치시장", places))
+
+    def test_typo_add_is_applied_without_miss(self):
+        schedule = [
+            {
+                "day": "Day 1",
+                "date": "2026-03-01",
+                "plan": [{"order": 1, "place": "광안리해수욕장", "address": "부산 수영구", "latitude": 35.15, "longitude": 129.11}],
+            }
+        ]
+        result = ai.apply_schedule_edit_locally(
+            user_input="1일차에 감천마을 추가해줘",
+            current_schedule=schedule,
+            places=[_place("감천문화마을", 0, "x.jpg")],
+        )
+        self.assertNotIn("추가 후보를 찾지 못함", result.text)
+        self.assertIn("감천문화마을", [p.place for p in result.travelSchedule[0].plan])
+
+    def test_other_place_with_same_suffix_is_reported_missing(self):
+        schedule = [
+            {
+                "day": f"Day {d}",
+                "date": f"2026-03-0{d}",
+                "plan": [{"order": 1, "place": title, "address": "부산", "latitude": 35.1, "longitude": 129.1}],
+            }
+            for d, title in ((1, "해운대해수욕장"), (2, "용두산공원"))
+        ]
+        result = ai.apply_schedule_edit_locally(
+            user_input="2일차에 다대포해수욕장 추가해줘",
+            current_schedule=schedule,
+            places=[_place("해운대해수욕장", 0), _place("용두산공원", 1)],
+        )
+        self.assertIn("'다대포해수욕장' 추가 후보를 찾지 못함", result.text)
+        self.assertEqual([[p.place for p in d.plan] for d in result.travelSchedule], [["해운대해수욕장"], ["용두산공원"]])
+
+    def test_fuzzy_tier_can_be_turned_off(self):
+        places = [_place("감천문화마을", 0)]
+        self.assertIsNone(ai._pick_candidate_for_term("감천마을", places, fuzzy=False))
+        self.assertIs(ai._pick_candidate_for_term("감천마을", places), places[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
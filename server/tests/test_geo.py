@@ -0,0 +1,75 @@
+import random
+import unittest
+
+import numpy as np
+
+from app.geo import SpatialIndex, balanced_groups, haversine_km, haversine_matrix
+from app.schemas import PlaceCandidate
+
+
+def _random_places(n, seed=7):
+    rng = random.Random(seed)
+    return [
+        PlaceCandidate(title=f"p{i}", mapy=35.0 + rng.random() * 0.4, mapx=128.9 + rng.random() * 0.4)
+        for i in range(n)
+    ]
+
+
+class SpatialIndexTests(unittest.TestCase):
+    def test_haversine_known_distance(self):
+        # 해운대해수욕장 -> 광안리해수욕장 약 3.9km
+        self.assertAlmostEqual(haversine_km(35.1587, 129.1604, 35.1532, 129.1187), 3.83, delta=0.1)
+
+    def test_matrix_matches_scalar(self):
+        places = _random_places(20)
+        lats = np.array([p.mapy for p in places])
+        lngs = np.array([p.mapx for p in places])
+        matrix = haversine_matrix(lats, lngs)
+        self.assertEqual(matrix.shape, (20, 20))
+        self.assertAlmostEqual(matrix[3, 11], haversine_km(lats[3], lngs[3], lats[11], lngs[11]), places=6)
+        self.assertTrue(np.allclose(np.diag(matrix), 0.0))
+
+    def test_queries_match_brute_force(self):
+        places = _random_places(2000)
+        index = SpatialIndex(places, cell_km=1.0)
+        rng = random.Random(1)
+        for _ in range(25):
+            lat, lng = 35.0 + rng.random() * 0.5, 128.85 + rng.random() * 0.5
+            brute = sorted((haversine_km(lat, lng, p.mapy, p.mapx), p.title) for p in places)
+
+            within = index.within(lat, lng, 2.5)
+            self.assertEqual([p.title for p, _ in within], [t for d, t in brute if d <= 2.5])
+
+            nearest = index.nearest(lat, lng, k=7)
+            self.assertEqual([p.title for p, _ in nearest], [t for _, t in brute[:7]])
+
+    def test_nearest_from_far_away_point(self):
+        index = SpatialIndex(_random_places(50))
+        nearest = index.nearest(37.56, 126.97, k=3)  # 서울에서 부산권 후보 조회
+        self.assertEqual(len(nearest), 3)
+        self.assertGreater(nearest[0][1], 250)
+
+
+class BalancedGroupsTests(unittest.TestCase):
+    def test_groups_are_disjoint_balanced_and_keep_anchors_apart(self):
+        places = _random_places(53)
+        lats = [p.mapy for p in places]
+        lngs = [p.mapx for p in places]
+        groups = balanced_groups(lats, lngs, 5, anchors=[3, 40])
+
+        self.assertEqual(sorted(i for g in groups for i in g), list(range(53)))
+        self.assertTrue(all(len(g) <= 11 for g in groups))
+        self.assertNotEqual(
+            next(n for n, g in enumerate(groups) if 3 in g),
+            next(n for n, g in enumerate(groups) if 40 in g),
+        )
+
+    def test_separated_clusters_stay_together(self):
+        # 부산/서울 두 덩어리는 그대로 두 그룹이 되어야 함
+        lats = [35.1 + i * 0.001 for i in range(6)] + [37.5 + i * 0.001 for i in range(6)]
+        lngs = [129.0] * 6 + [127.0] * 6
+        self.assertEqual(balanced_groups(lats, lngs, 2), [list(range(6)), list(range(6, 12))])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from app import ai
+from app.llm_cache import LLMResponseCache, make_llm_cache_key
+
+
+class LLMCacheKeyTests(unittest.TestCase):
+    def test_key_ignores_dict_order_but_not_model_or_temperature(self):
+        a = make_llm_cache_key("sys", {"region": "부산", "pace": "보통"}, model="m", temperature=0.3)
+        b = make_llm_cache_key("sys", {"pace": "보통", "region": "부산"}, model="m", temperature=0.3)
+        self.assertEqual(a, b)
+        self.assertNotEqual(a, make_llm_cache_key("sys", {"region": "부산", "pace": "보통"}, model="m2", temperature=0.3))
+        self.assertNotEqual(a, make_llm_cache_key("sys", {"region": "부산", "pace": "보통"}, model="m", temperature=0.7))
+        self.assertNotEqual(a, make_llm_cache_key("sys2", {"region": "부산", "pace": "보통"}, model="m", temperature=0.3))
+
+
+class LLMResponseCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "llm.sqlite3")
+
+    def test_memory_then_disk_tier(self):
+        cache = LLMResponseCache(self.path, ttl=60, max_entries=1)
+        calls = []
+
+        def loader(v):
+            return lambda: calls.append(v) or {"travelSchedule": [v]}
+
+        self.assertEqual(cache.get_or_load("a", loader("a")), {"travelSchedule": ["a"]})
+        cache.get_or_load("b", loader("b"))  # 메모리에서 a 밀려남
+        self.assertEqual(cache.get_or_load("a", loader("a2")), {"travelSchedule": ["a"]})
+        self.assertEqual(calls, ["a", "b"])
+
+        stats = cache.stats()
+        self.assertEqual(stats["misses"], 2)
+        self.assertEqual(stats["disk_hits"], 1)
+        self.assertEqual(stats["memory_entries"], 1)
+
+        # 다른 프로세스(새 인스턴스)도 디스크 계층에서 재사용
+        other = LLMResponseCache(self.path, ttl=60)
+        self.assertEqual(other.get("b"), {"travelSchedule": ["b"]})
+
+    def test_bypass_skips_lookup_but_refreshes_entry(self):
+        cache = LLMResponseCache(self.path, ttl=60)
+        cache.get_or_load("k", lambda: {"v": 1})
+        self.assertEqual(cache.get_or_load("k", lambda: {"v": 2}, use_cache=False), {"v": 2})
+        self.assertEqual(cache.get_or_load("k", lambda: {"v": 3}), {"v": 2})
+        self.assertEqual(cache.stats()["bypassed"], 1)
+
+    def test_expired_and_failed_loads_are_not_served(self):
+        cache = LLMResponseCache(self.path, ttl=0)
+        cache.get_or_load("k", lambda: {"v": 1})
+        self.assertEqual(cache.get_or_load("k", lambda: {"v": 2}), {"v": 2})
+
+        with self.assertRaises(ValueError):
+            cache.get_or_load("err", lambda: (_ for _ in ()).throw(ValueError("bad json")))
+        self.assertIsNone(cache.get("err"))
+
+
+class CallModelJsonCacheTests(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        cache = LLMResponseCache(os.path.join(tmp.name, "llm.sqlite3"), ttl=60)
+        p = patch.object(ai, "get_llm_cache", return_value=cache)
+        p.start()
+        self.addCleanup(p.stop)
+
+    def test_identical_requests_call_model_once_and_no_cache_regenerates(self):
+        payload = {"region": "부산", "candidates": [{"title": "해운대"}]}
+        with patch.object(ai, "_request_model_json", return_value={"travelSchedule": []}) as request:
+            first = ai._call_model_json("sys", payload)
+            first["travelSchedule"].append("mutated")
+            self.assertEqual(ai._call_model_json("sys", dict(payload)), {"travelSchedule": []})
+            self.assertEqual(request.call_count, 1)
+
+            ai._call_model_json("sys", payload, use_cache=False)
+            self.assertEqual(request.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import json
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from fastapi.testclient import TestClient
+
+from app import ai, main
+from app.metrics import Counter, Histogram
+
+VALID = json.dumps({"text": "ok", "travelSchedule": [{"day": "Day 1", "date": "", "plan": []}]})
+
+
+def _completion(content, prompt_tokens=1200, completion_tokens=300):
+    message = SimpleNamespace(content=content, refusal=None)
+    usage = SimpleNamespace(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens)
+    return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=usage)
+
+
+class MetricTypesTests(unittest.TestCase):
+    def test_counter_and_histogram_text_format(self):
+        counter = Counter("test_requests_total", "요청 수", ["path"])
+        counter.inc(path='/a"b')
+        counter.inc(2, path='/a"b')
+        self.assertIn('test_requests_total{path="/a\\"b"} 3', counter.render())
+
+        hist = Histogram("test_latency_seconds", "지연", (0.1, 1.0), ["mode"])
+        for v in (0.05, 0.5, 5.0):
+            hist.observe(v, mode="new")
+        text = hist.render()
+        self.assertIn("# TYPE test_latency_seconds histogram", text)
+        self.assertIn('test_latency_seconds_bucket{mode="new",le="0.1"} 1', text)
+        self.assertIn('test_latency_seconds_bucket{mode="new",le="1"} 2', text)
+        self.assertIn('test_latency_seconds_bucket{mode="new",le="+Inf"} 3', text)
+        self.assertIn('test_latency_seconds_count{mode="new"} 3', text)
+        self.assertIn('test_latency_seconds_sum{mode="new"} 5.55', text)
+
+        with self.assertRaises(ValueError):
+            hist.observe(1.0, region="부산")
+
+
+class ModelCallMetricsTests(unittest.TestCase):
+    def test_request_records_outcomes_retries_latency_and_tokens(self):
+        client = MagicMock()
+        client.complete.side_effect = [_completion("not json"), _completion(VALID)]
+        payload = {"region": "부산 해운대", "pace": "보통", "candidates": [{"id": i} for i in range(30)]}
+        labels = {"mode": "new", "model": ai.MODEL, "region": "부산", "pace": "보통", "candidates": "<=50"}
+
+        before = {
+            "ok": ai._model_calls_total.value(outcome="ok", **labels),
+            "parse_failure": ai._model_calls_total.value(outcome="parse_failure", **labels),
+            "retries": ai._model_retries_total.value(**labels),
+            "tokens": ai._model_prompt_tokens.count(**labels),
+        }
+        with patch.object(ai, "client", client), patch.object(ai, "STRUCTURED_OUTPUT", True):
+            ai._request_model_json("sys", payload, retry=1)
+
+        self.assertEqual(ai._model_calls_total.value(outcome="ok", **labels), before["ok"] + 1)
+        self.assertEqual(ai._model_calls_total.value(outcome="parse_failure", **labels), before["parse_failure"] + 1)
+        self.assertEqual(ai._model_retries_total.value(**labels), before["retries"] + 1)
+        self.assertEqual(ai._model_prompt_tokens.count(**labels), before["tokens"] + 2)
+
+    def test_edit_and_day_modes_and_unknown_region(self):
+        self.assertEqual(ai._call_labels({"baseSchedule": [], "region": "어딘가"})["mode"], "edit")
+        self.assertEqual(ai._call_labels({"dayOfTrip": {}, "region": "어딘가"})["region"], "other")
+        self.assertEqual(ai._call_labels({"candidates": [0] * 250})["candidates"], ">200")
+
+
+class MetricsEndpointTests(unittest.TestCase):
+    def test_metrics_endpoint_exports_model_metrics_and_stats(self):
+        with TestClient(main.app) as client:
+            resp = client.get("/metrics")
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp.headers["content-type"].startswith("text/plain"))
+        self.assertIn("# TYPE plan_model_latency_seconds histogram", resp.text)
+        self.assertIn('app_stats{section="tourapiCache",', resp.text)
+        self.assertIn('app_stats{section="circuitBreakers",key="tourapi.state_value"}', resp.text)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+import asyncio
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+
+from app.model_client import ModelClient
+
+
+class FakeCompletions:
+    """호출 순서별 지연(초)을 받아 그만큼 기다렸다가 호출 번호를 돌려주는 가짜 chat.completions."""
+
+    def __init__(self, delays):
+        self.delays = list(delays)
+        self.calls = 0
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    async def create(self, stream=False, **kwargs):
+        with self.lock:
+            n = self.calls
+            self.calls += 1
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delays[min(n, len(self.delays) - 1)])
+        finally:
+            with self.lock:
+                self.active -= 1
+        if stream:
+            return self._chunks(n)
+        return n
+
+    async def _chunks(self, n):
+        for piece in ("a", "b", "c"):
+            yield f"{n}{piece}"
+
+
+def _client(name, delays, **kwargs):
+    client = ModelClient(name, api_key="x", **kwargs)
+    client._ensure_loop()
+    fake = FakeCompletions(delays)
+    client._client = SimpleNamespace(chat=SimpleNamespace(completions=fake))
+    return client, fake
+
+
+class ModelClientTests(unittest.TestCase):
+    def test_deadline_raises_timeout(self):
+        client, _ = _client("test-deadline", [1.0], deadline=0.1, hedge=False)
+        started = time.perf_counter()
+        with self.assertRaises(TimeoutError):
+            client.complete(model="m")
+        self.assertLess(time.perf_counter() - started, 0.5)
+        self.assertEqual(client.stats()["deadline_exceeded"], 1)
+
+    def test_call_deadline_cancels_request_early(self):
+        client, fake = _client("test-call-deadline", [1.0], deadline=5, hedge=False)
+        started = time.perf_counter()
+        with self.assertRaises(TimeoutError):
+            client.complete(model="m", deadline=0.1)
+        self.assertLess(time.perf_counter() - started, 0.5)
+        time.sleep(0.05)
+        # 요청도 취소되어 동시 호출 자리를 돌려줌
+        self.assertEqual((fake.active, client.stats()["in_flight"]), (0, 0))
+
+    def test_hedged_request_wins_when_first_is_slow(self):
+        client, fake = _client("test-hedge", [1.0, 0.01], deadline=5, hedge=True)
+        for _ in range(30):
+            client.call_latency.observe(0.05)
+        started = time.perf_counter()
+        self.assertEqual(client.complete(model="m"), 1)
+        self.assertLess(time.perf_counter() - started, 0.5)
+        stats = client.stats()
+        self.assertEqual((stats["hedged"], stats["hedge_wins"]), (1, 1))
+        self.assertEqual(fake.calls, 2)
+
+    def test_no_hedge_without_enough_samples(self):
+        client, fake = _client("test-nohedge", [0.1], deadline=5, hedge=True)
+        client.complete(model="m")
+        self.assertEqual((fake.calls, client.stats()["hedged"]), (1, 0))
+
+    def test_concurrency_cap_queues_calls(self):
+        client, fake = _client("test-cap", [0.1], deadline=5, max_concurrency=1, hedge=False)
+        threads = [threading.Thread(target=client.complete, kwargs={"model": "m"}) for _ in range(3)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(fake.max_active, 1)
+        self.assertGreater(client.queue_latency.stats()["p95_seconds"], 0.09)
+
+    def test_stream_yields_chunks_in_order(self):
+        client, _ = _client("test-stream", [0.0], deadline=5)
+        self.assertEqual(list(client.stream(model="m")), ["0a", "0b", "0c"])
+        self.assertEqual(client.stats()["in_flight"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+import json
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from app import ai
+from app.schemas import ModelPlanResponse, strict_json_schema
+
+
+def _completion(content, refusal=None):
+    message = SimpleNamespace(content=content, refusal=refusal)
+    return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+VALID = json.dumps({"text": "ok", "travelSchedule": [{"day": "Day 1", "date": "", "plan": [{"id": 1, "description": "", "activity": ""}]}]})
+
+
+class StrictSchemaTests(unittest.TestCase):
+    def test_every_object_is_closed_and_fully_required(self):
+        schema = strict_json_schema(ModelPlanResponse)
+        objects = [schema] + list(schema["$defs"].values())
+        for obj in objects:
+            self.assertFalse(obj["additionalProperties"])
+            self.assertEqual(sorted(obj["required"]), sorted(obj["properties"]))
+        self.assertNotIn("default", json.dumps(schema))
+        self.assertEqual(sorted(schema["$defs"]["ModelPlanItem"]["properties"]), ["activity", "description", "id"])
+
+
+class RequestModelJsonTests(unittest.TestCase):
+    def setUp(self):
+        self.client = MagicMock()
+        patchers = [patch.object(ai, "client", self.client), patch.object(ai, "_model_counts", {})]
+        for p in patchers:
+            p.start()
+            self.addCleanup(p.stop)
+
+    def test_structured_request_needs_no_retry(self):
+        self.client.complete.return_value = _completion(VALID)
+        with patch.object(ai, "STRUCTURED_OUTPUT", True):
+            data = ai._request_model_json("sys", {"candidates": []}, retry=1)
+
+        self.assertEqual(data["travelSchedule"][0]["plan"][0]["id"], 1)
+        kwargs = self.client.complete.call_args.kwargs
+        self.assertEqual(kwargs["response_format"]["type"], "json_schema")
+        self.assertTrue(kwargs["response_format"]["json_schema"]["strict"])
+        self.assertEqual(
+            ai.model_stats()[ai.MODEL],
+            {
+                "calls": 1,
+                "parse_failures": 0,
+                "refusals": 0,
+                "retries": 0,
+                "prompt_tokens": 0,
+                "cached_prompt_tokens": 0,
+                "retry_rate": 0.0,
+                "cached_prompt_ratio": 0.0,
+            },
+        )
+
+    def test_cached_prompt_tokens_are_counted(self):
+        resp = _completion(VALID)
+        resp.usage = SimpleNamespace(
+            prompt_tokens=2000, completion_tokens=50, prompt_tokens_details=SimpleNamespace(cached_tokens=1536)
+        )
+        self.client.complete.return_value = resp
+        labels = ai._call_labels({"region": "부산", "pace": "보통", "candidates": []})
+        before = ai._model_cached_prompt_tokens.count(**labels)
+        with patch.object(ai, "STRUCTURED_OUTPUT", True):
+            ai._request_model_json("sys", {"region": "부산", "pace": "보통", "candidates": []}, retry=0)
+
+        stats = ai.model_stats()[ai.MODEL]
+        self.assertEqual((stats["prompt_tokens"], stats["cached_prompt_tokens"]), (2000, 1536))
+        self.assertEqual(stats["cached_prompt_ratio"], 0.768)
+        self.assertEqual(ai._model_cached_prompt_tokens.count(**labels), before + 1)
+
+    def test_parse_failures_refusals_and_retries_are_counted(self):
+        self.client.complete.side_effect = [
+            _completion('{"text": "ok"}'),  # 스키마 불일치
+            _completion(None, refusal="can't help"),
+            _completion(VALID),
+        ]
+        with patch.object(ai, "STRUCTURED_OUTPUT", True):
+            ai._request_model_json("sys", {}, retry=2)
+
+        stats = ai.model_stats()[ai.MODEL]
+        self.assertEqual((stats["calls"], stats["parse_failures"], stats["refusals"], stats["retries"]), (3, 1, 1, 2))
+
+    def test_free_form_mode_keeps_prompt_schema_and_lenient_parsing(self):
+        self.client.complete.return_value = _completion("```json\n" + VALID + "\n```")
+        with patch.object(ai, "STRUCTURED_OUTPUT", False):
+            data = ai._request_model_json("sys", {}, retry=0)
+            ctx = ai._prepare_plan_context(
+                user_input="", date_str="", region="부산", travel_type="", transportation="", places=[]
+            )
+        self.assertEqual(data["text"], "ok")
+        self.assertNotIn("response_format", self.client.complete.call_args.kwargs)
+        self.assertNotIn("response_schema", ctx.user_payload)
+        self.assertIn("response_schema", ctx.system)
+
+
+class PromptPrefixTests(unittest.TestCase):
+    def _context(self, **kwargs):
+        params = dict(user_input="", date_str="2026-03-01~2026-03-02", region="부산", travel_type="", transportation="", places=[])
+        params.update(kwargs)
+        return ai._prepare_plan_context(**params)
+
+    def test_system_is_identical_across_requests(self):
+        a = self._context(user_input="바다", companions="커플", pace="여유롭게", transportation="대중교통")
+        b = self._context(user_input="시장", region="강릉", companions="가족", pace="알차게", transportation="자가용")
+        self.assertIs(a.system, b.system)
+        self.assertNotIn("rules", a.user_payload)
+        # 사용자 입력(과 그 관련 후보 id)은 payload 맨 뒤
+        self.assertEqual(list(a.user_payload)[-3:], ["candidates", "relevantIds", "userInput"])
+
+    def test_edit_and_structured_output_use_their_own_prefix(self):
+        schedule = [{"day": "Day 1", "date": "2026-03-01", "plan": [{"place": "기존장소"}]}]
+        with patch.object(ai, "STRUCTURED_OUTPUT", True):
+            new = self._context()
+            edit = self._context(user_input="빼줘", current_schedule=schedule)
+        self.assertNotEqual(new.system, edit.system)
+        self.assertEqual(list(edit.user_payload)[-1], "editRequest")
+        self.assertNotIn("response_schema", new.system)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,200 @@
+import os
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from app import ai
+from app.schemas import PlaceCandidate
+
+
+def _places(n=40, lodging=3):
+    places = []
+    for i in range(n):
+        places.append(
+            PlaceCandidate(
+                title=f"장소{i}",
+                firstimage="x.jpg",
+                mapy=35.0 + (i % 8) * 0.02,
+                mapx=129.0 + (i // 8) * 0.02,
+                contenttypeid="32" if i < lodging else "12",
+            )
+        )
+    return places
+
+
+class ParallelDayPlanTests(unittest.TestCase):
+    def setUp(self):
+        patchers = [
+            patch.dict(os.environ, {"OPENAI_API_KEY": "x"}),
+            patch.object(ai, "PARALLEL_DAYS_MIN", 3),
+        ]
+        for p in patchers:
+            p.start()
+            self.addCleanup(p.stop)
+        self.calls = []
+        self.lock = threading.Lock()
+        self.delay = 0.1
+
+    def _fake_model(self, system, user_payload, retry=1, use_cache=True, deadline=None):
+        time.sleep(self.delay)
+        with self.lock:
+            self.calls.append(user_payload)
+        ids = [c["id"] for c in user_payload["candidates"]]
+        # 그룹 밖 id(다른 날 후보)를 섞어도 버려져야 함
+        plan = [{"id": i, "description": "", "activity": ""} for i in ids[:3] + [1, 2, 3]]
+        return {"text": "하루 요약", "travelSchedule": [{"day": "Day 1", "date": "", "plan": plan}]}
+
+    def _build(self, days=5, **kwargs):
+        with patch.object(ai, "_call_model_json", side_effect=self._fake_model):
+            return ai.build_plan_from_front(
+                user_input="",
+                date_str=f"2026-03-01~2026-03-{days:02d}",
+                region="부산",
+                travel_type="관광지",
+                transportation="",
+                pace="보통",
+                places=_places(),
+                **kwargs,
+            )
+
+    def test_days_are_generated_concurrently_without_repeats(self):
+        started = time.perf_counter()
+        result = self._build(days=5)
+        elapsed = time.perf_counter() - started
+
+        self.assertEqual(len(self.calls), 5)
+        # 동시 실행(PLAN_DAY_CONCURRENCY=4) -> 0.1s x 2 라운드 정도
+        self.assertLess(elapsed, 0.45)
+        self.assertEqual([d.date for d in result.travelSchedule], [f"2026-03-0{i}" for i in range(1, 6)])
+
+        titles = [p.place for d in result.travelSchedule for p in d.plan]
+        self.assertEqual(len(titles), len(set(titles)))
+        self.assertTrue(all(3 <= len(d.plan) <= 4 for d in result.travelSchedule))
+
+        # 날짜별 후보 그룹은 서로 겹치지 않고, 숙소는 박 수(4) 이하 그룹에 하나씩만
+        groups = [{c["title"] for c in payload["candidates"]} for payload in self.calls]
+        self.assertEqual(sum(len(g) for g in groups), len(set().union(*groups)))
+        lodging_titles = {"장소0", "장소1", "장소2"}
+        self.assertTrue(all(len(g & lodging_titles) <= 1 for g in groups))
+        self.assertIn("Day 1: 하루 요약", result.text)
+
+    def test_concurrent_plans_do_not_queue_behind_each_other(self):
+        # 날짜별 동시 호출 상한은 요청마다: 서버 전체 상한이면 두 번째 일정의 날짜들이 마감 시간을 넘겨 빠짐
+        self.delay = 0.3
+        results = [None, None]
+
+        def run(i):
+            results[i] = ai.build_plan_from_front(
+                user_input="",
+                date_str="2026-03-01~2026-03-05",
+                region="부산",
+                travel_type="관광지",
+                transportation="",
+                pace="보통",
+                places=_places(),
+            )
+
+        with patch.object(ai, "_call_model_json", side_effect=self._fake_model), patch.object(
+            ai, "PLAN_DAY_CONCURRENCY", 5
+        ), patch.object(ai, "PLAN_MODEL_BUDGET_SECONDS", 0.45):
+            threads = [threading.Thread(target=run, args=(i,)) for i in range(2)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+        self.assertEqual(len(self.calls), 10)
+        for result in results:
+            for day in range(1, 6):
+                self.assertIn(f"Day {day}: 하루 요약", result.text)
+
+    def test_pending_day_calls_are_cancelled_after_budget(self):
+        self.delay = 0.2
+        with patch.object(ai, "PLAN_DAY_CONCURRENCY", 1), patch.object(ai, "PLAN_MODEL_BUDGET_SECONDS", 0.3):
+            self._build(days=5)
+            time.sleep(0.6)
+        # 마감 시간 전에 시작한 호출(최대 2개)만 끝나고 나머지 날짜는 시작하지 않음
+        self.assertLessEqual(len(self.calls), 2)
+
+    def test_stream_fills_days_missing_at_budget_locally(self):
+        # 2일차 호출이 멈춰도 예산 시간에 done을 보내고, 그 날은 그 날 후보 그룹으로 만든 로컬 일정
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        def model(system, user_payload, retry=1, use_cache=True, deadline=None):
+            if user_payload["dayOfTrip"]["day"] == 2:
+                release.wait(5)
+            return self._fake_model(system, user_payload)
+
+        started = time.perf_counter()
+        with patch.object(ai, "_call_model_json", side_effect=model), patch.object(ai, "PLAN_MODEL_BUDGET_SECONDS", 0.4):
+            events = list(
+                ai.stream_plan_from_front(
+                    user_input="",
+                    date_str="2026-03-01~2026-03-04",
+                    region="부산",
+                    travel_type="관광지",
+                    transportation="",
+                    places=_places(),
+                )
+            )
+        self.assertLess(time.perf_counter() - started, 1.0)
+        self.assertEqual(sorted(d["index"] for e, d in events if e == "day"), [0, 2, 3])
+        event, done = events[-1]
+        self.assertEqual(event, "done")
+        self.assertEqual(len(done["travelSchedule"]), 4)
+        self.assertNotIn("Day 2:", done["text"])
+        day2 = [p["place"] for p in done["travelSchedule"][1]["plan"]]
+        self.assertTrue(day2)
+        self.assertTrue(set(day2).isdisjoint(p["place"] for i, d in enumerate(done["travelSchedule"]) if i != 1 for p in d["plan"]))
+
+    def test_each_night_day_gets_a_lodging_and_departure_day_none(self):
+        # 숙소가 목록 끝(장소27~29)에 있어도 1~n-1일에 하나씩, 마지막 날(출발일)에는 없음
+        places = [
+            PlaceCandidate(
+                title=f"장소{i}",
+                firstimage="x.jpg",
+                mapy=35.0 + (i % 6) * 0.03,
+                mapx=129.0 + (i // 6) * 0.03,
+                contenttypeid="32" if i >= 27 else "12",
+            )
+            for i in range(30)
+        ]
+        ctx = ai._prepare_plan_context(
+            user_input="",
+            date_str="2026-03-01~2026-03-03",
+            region="부산",
+            travel_type="관광지",
+            transportation="",
+            places=places,
+        )
+        lodging_titles = {f"장소{i}" for i in range(27, 30)}
+        day_titles = [{c["title"] for c in payload["candidates"]} for payload, _ in ai._day_requests(ctx)]
+        self.assertEqual([len(titles & lodging_titles) for titles in day_titles], [1, 1, 0])
+
+    def test_short_trips_use_single_completion(self):
+        result = self._build(days=2)
+        self.assertEqual(len(self.calls), 1)
+        self.assertEqual(len(result.travelSchedule), 2)
+
+    def test_stream_emits_each_day_once(self):
+        with patch.object(ai, "_call_model_json", side_effect=self._fake_model):
+            events = list(
+                ai.stream_plan_from_front(
+                    user_input="",
+                    date_str="2026-03-01~2026-03-04",
+                    region="부산",
+                    travel_type="관광지",
+                    transportation="",
+                    places=_places(),
+                )
+            )
+        self.assertEqual(events[0], ("model_started", {"cached": False, "parallelDays": 4}))
+        self.assertEqual(sorted(d["index"] for e, d in events if e == "day"), [0, 1, 2, 3])
+        self.assertEqual(events[-1][0], "done")
+        self.assertEqual(len(events[-1][1]["travelSchedule"]), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
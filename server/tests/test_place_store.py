@@ -0,0 +1,103 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from app import main, sync_places
+from app.breaker import CircuitOpenError
+from app.place_store import PlaceStore
+
+
+def _row(i, modified="20260101000000"):
+    return {
+        "title": f"장소{i}",
+        "addr1": "부산",
+        "firstimage": "",
+        "mapy": 35.0 + i * 0.001,
+        "mapx": 129.0,
+        "contentid": str(i),
+        "contenttypeid": "12",
+        "modifiedtime": modified,
+    }
+
+
+class FakeTourAPI:
+    def __init__(self, rows, fail_on_page=None):
+        self.rows = rows
+        self.fail_on_page = fail_on_page
+        self.calls = []
+
+    def __call__(self, *, area_code, content_type_id=None, arrange="B", num_of_rows=100, page_no=1):
+        self.calls.append((arrange, page_no))
+        if page_no == self.fail_on_page:
+            raise RuntimeError("upstream down")
+        rows = self.rows
+        if arrange == "C":
+            rows = sorted(rows, key=lambda r: r["modifiedtime"], reverse=True)
+        start = (page_no - 1) * num_of_rows
+        return rows[start:start + num_of_rows], len(rows)
+
+
+class PlaceStoreSyncTests(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.store = PlaceStore(os.path.join(self.tmpdir.name, "places.sqlite3"))
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _sync(self, fake, **kwargs):
+        with patch.object(sync_places, "fetch_area_based_list2_rows", fake):
+            return sync_places.sync(self.store, [6], [12], page_size=2, force_full=False, **kwargs)
+
+    def test_full_sync_resumes_from_last_committed_page(self):
+        rows = [_row(i) for i in range(5)]
+        self.assertEqual(self._sync(FakeTourAPI(rows, fail_on_page=2)), 1)
+        self.assertEqual(self.store.get_state(6, 12)["next_page"], 2)
+        self.assertFalse(self.store.is_fresh(6, 12))
+
+        fake = FakeTourAPI(rows)
+        self.assertEqual(self._sync(fake), 0)
+        self.assertEqual(fake.calls, [("B", 2), ("B", 3)])
+        self.assertTrue(self.store.is_fresh(6, 12))
+        self.assertEqual([p.title for p in self.store.query(6, 12, limit=10)], [f"장소{i}" for i in range(5)])
+
+    def test_incremental_sync_stops_at_watermark_and_keeps_rank(self):
+        rows = [_row(i) for i in range(5)]
+        self._sync(FakeTourAPI(rows))
+
+        rows[3] = dict(_row(3, modified="20260301000000"), title="장소3-수정")
+        rows.append(_row(9, modified="20260302000000"))
+        fake = FakeTourAPI(rows)
+        self._sync(fake)
+
+        self.assertEqual(fake.calls, [("C", 1), ("C", 2)])
+        titles = [p.title for p in self.store.query(6, 12, limit=10)]
+        self.assertEqual(titles, ["장소0", "장소1", "장소2", "장소3-수정", "장소4", "장소9"])
+        self.assertEqual(self.store.get_state(6, 12)["watermark"], "20260302000000")
+
+    def test_collect_places_serves_from_fresh_store_without_live_calls(self):
+        self._sync(FakeTourAPI([_row(i) for i in range(20)]))
+
+        with patch.object(main, "get_place_store", return_value=self.store), patch(
+            "app.tourapi.area_based_list2_page"
+        ) as live:
+            places = main._collect_places(area_code=6, ctype_ids=[12])
+
+        live.assert_not_called()
+        self.assertEqual(len(places), 20)
+        self.assertEqual(self.store.freshness()[0]["areaCode"], 6)
+
+    def test_collect_places_falls_back_to_stale_store_when_circuit_is_open(self):
+        self._sync(FakeTourAPI([_row(i) for i in range(3)]))
+
+        with patch.object(main, "get_place_store", return_value=self.store), patch(
+            "app.place_store.PlaceStore.is_fresh", return_value=False
+        ), patch("app.tourapi.area_based_list2_page", side_effect=CircuitOpenError("open")):
+            places = main._collect_places(area_code=6, ctype_ids=[12])
+
+        self.assertEqual([p.title for p in places], ["장소0", "장소1", "장소2"])
+
+
+if __name__ == "__main__":
+    unittest.main()
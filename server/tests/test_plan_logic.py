@@ -1,3 +1,4 @@
+import time
 import unittest
 from unittest.mock import patch
 
@@ -115,6 +116,162 @@ class PlanLogicTests(unittest.TestCase):
         self.assertEqual(len(response.travelSchedule[0].plan), 0)
         self.assertIn("삭제", response.text)
 
+    def test_typo_of_a_scheduled_place_moves_it_without_refetch(self):
+        req = FrontPlanRequest(
+            userInput="2일차에 감천마을 추가해줘",
+            date="2026-03-01 ~ 2026-03-02",
+            region="부산",
+            travelType="관광",
+            transportation="자가용",
+            currentSchedule=[
+                TravelDay(
+                    day="Day 1",
+                    date="2026-03-01",
+                    plan=[Plan(order=1, place="감천문화마을", description="", activity="", address="부산 사하구", image="", latitude=35.1, longitude=129.0)],
+                ),
+                TravelDay(day="Day 2", date="2026-03-02", plan=[]),
+            ],
+        )
+
+        with patch("app.main._collect_places", side_effect=AssertionError("no refetch")) as mock_collect:
+            response = main.plan(req)
+
+        mock_collect.assert_not_called()
+        self.assertEqual([[p.place for p in d.plan] for d in response.travelSchedule], [[], ["감천문화마을"]])
+        self.assertNotIn("찾지 못함", response.text)
+
+    def test_fuzzy_hit_already_on_target_day_refetches(self):
+        req = FrontPlanRequest(
+            userInput="감천마을 추가해줘",
+            date="2026-03-01 ~ 2026-03-01",
+            region="부산",
+            travelType="관광",
+            transportation="자가용",
+            currentSchedule=[
+                TravelDay(
+                    day="Day 1",
+                    date="2026-03-01",
+                    plan=[Plan(order=1, place="감천문화마을", description="", activity="", address="부산 사하구", image="", latitude=35.1, longitude=129.0)],
+                )
+            ],
+        )
+        fetched = [PlaceCandidate(title="감천마을 전망대", addr1="부산 사하구", firstimage="x.jpg", mapy=35.1, mapx=129.0)]
+
+        with patch("app.main._collect_places", return_value=fetched) as mock_collect:
+            response = main.plan(req)
+
+        # 근사 검색으로 맞춘 장소가 이미 그 날 일정에 있으면 새 장소로 보고 다시 가져온 후보에서 찾음
+        mock_collect.assert_called_once()
+        self.assertEqual([p.place for p in response.travelSchedule[0].plan], ["감천문화마을", "감천마을 전망대"])
+
+    def _fake_page_fetch(self):
+        def fake_area_based_list2_page(*, area_code, content_type_id=None, num_of_rows=30, page_no=1, **_):
+            # 먼저 요청한 유형이 더 늦게 끝나도 결과 순서는 유형 순서를 따라야 함
+            time.sleep({12: 0.05}.get(content_type_id, 0.0))
+            places = [
+                PlaceCandidate(
+                    title=f"{content_type_id}-{page_no}-{i}",
+                    mapy=35.0,
+                    mapx=129.0,
+                    contentid=f"{content_type_id}-{page_no}-{i}",
+                )
+                for i in range(2)
+            ]
+            places.append(PlaceCandidate(title="공통", mapy=35.0, mapx=129.0, contentid="shared"))
+            return places, 70
+
+        return patch("app.tourapi.area_based_list2_page", side_effect=fake_area_based_list2_page)
+
+    def test_collect_places_walks_pages_in_serial_order_when_fetching_concurrently(self):
+        with self._fake_page_fetch() as mock_fetch:
+            places = main._collect_places(area_code=6, ctype_ids=[12, 39], min_candidates=20)
+
+        self.assertEqual(
+            [p.title for p in places],
+            [
+                "12-1-0", "12-1-1", "공통", "39-1-0", "39-1-1",
+                "12-2-0", "12-2-1", "12-3-0", "12-3-1",
+                "39-2-0", "39-2-1", "39-3-0", "39-3-1",
+            ],
+        )
+        # totalCount=70, 페이지당 30행 -> 유형별 3페이지까지만 요청
+        self.assertEqual(mock_fetch.call_count, 6)
+
+    def test_collect_places_stops_paging_once_enough_candidates(self):
+        with self._fake_page_fetch() as mock_fetch:
+            places = main._collect_places(area_code=6, ctype_ids=[12, 39], min_candidates=4)
+
+        # 유형별 첫 페이지 + 전체 유형 보강(5 < 6) 첫 페이지만 요청하고 다음 페이지는 요청하지 않음
+        self.assertEqual(len(places), 7)
+        self.assertEqual(
+            [(call.kwargs["content_type_id"], call.kwargs["page_no"]) for call in mock_fetch.call_args_list][-1],
+            (None, 1),
+        )
+        self.assertEqual(
+            sorted(call.kwargs["page_no"] for call in mock_fetch.call_args_list),
+            [1, 1, 1],
+        )
+
+    def test_compact_prompt_uses_ids_and_maps_them_back(self):
+        places = [
+            PlaceCandidate(
+                title=f"장소{i}",
+                addr1=f"부산광역시 해운대구 우동 {i}-1",
+                firstimage="http://tong.visitkorea.or.kr/cms/resource/00/0000000_image2_1.jpg" if i % 2 else "",
+                mapy=35.123456 + i / 1000,
+                mapx=129.123456,
+            )
+            for i in range(1, 101)
+        ]
+        kwargs = dict(
+            user_input="",
+            date_str="2026-03-01",
+            region="부산",
+            travel_type="관광지",
+            transportation="",
+            places=places,
+        )
+        ctx = ai._prepare_plan_context(**kwargs)
+        first = ctx.user_payload["candidates"][0]
+        self.assertEqual(first, {"id": 1, "title": "장소1", "addr": "부산광역시 해운대구", "img": 1, "pos": [35.124, 129.123]})
+
+        data = {"travelSchedule": [{"day": "Day 1", "plan": [{"id": 2, "description": "산책"}, {"id": 999}]}]}
+        result = ai._finalize_plan(ctx, data)
+        item = result.travelSchedule[0].plan[0]
+        # 이미지 있는 후보가 앞이라 id 2는 장소3
+        self.assertEqual(ctx.user_payload["candidates"][1]["title"], "장소3")
+        self.assertEqual((item.place, item.address, item.latitude), ("장소3", "부산광역시 해운대구 우동 3-1", places[2].mapy))
+        self.assertEqual(len(result.travelSchedule[0].plan), 1)
+
+        # 예산이 작으면 우선순위 낮은(뒤쪽) 후보부터 빠지고 프롬프트는 예산 근처에 머무름
+        with patch.object(ai, "PROMPT_TOKEN_BUDGET", 1500):
+            small = ai._prepare_plan_context(**kwargs)
+        self.assertLess(len(small.user_payload["candidates"]), len(ctx.user_payload["candidates"]))
+        prompt_tokens = ai.estimate_tokens(small.system) + ai.estimate_tokens(ai._payload_json(small.user_payload))
+        self.assertLessEqual(prompt_tokens, 1500)
+        # 빠진 후보는 모델이 볼 수 없으니 id/제목으로도 해석하지 않음
+        sent = small.user_payload["candidates"]
+        self.assertEqual(sorted(small.id_to_title), [c["id"] for c in sent])
+        dropped = ctx.user_payload["candidates"][len(sent)]
+        self.assertNotIn(dropped["title"], small.allowed_titles)
+        result = ai._finalize_plan(small, {"travelSchedule": [{"day": "Day 1", "plan": [{"id": dropped["id"]}, {"id": 1}]}]})
+        self.assertEqual([p.place for p in result.travelSchedule[0].plan], [sent[0]["title"]])
+
+    def test_edit_mode_base_schedule_gets_ids(self):
+        schedule = [{"day": "Day 1", "date": "2026-03-01", "plan": [{"place": "기존장소", "address": "부산 중구", "image": "x.jpg", "latitude": 35.1, "longitude": 129.0}]}]
+        ctx = ai._prepare_plan_context(
+            user_input="2일차에 장소1 추가",
+            date_str="2026-03-01",
+            region="부산",
+            travel_type="",
+            transportation="",
+            places=[PlaceCandidate(title="장소1", mapy=35.2, mapx=129.1)],
+            current_schedule=schedule,
+        )
+        self.assertEqual(ctx.user_payload["baseSchedule"][0]["plan"][0], {"id": 2, "title": "기존장소", "description": "", "activity": ""})
+        result = ai._finalize_plan(ctx, {"travelSchedule": [{"plan": [{"id": 2}, {"id": 1}]}]})
+        self.assertEqual([(p.place, p.image) for p in result.travelSchedule[0].plan], [("기존장소", "x.jpg"), ("장소1", "")])
+
 
 if __name__ == "__main__":
     unittest.main()
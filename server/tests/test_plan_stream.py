@@ -0,0 +1,165 @@
+import asyncio
+import json
+import os
+import tempfile
+import time
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from app import ai, main
+from app.json_stream import ArrayItemStreamParser
+from app.llm_cache import LLMResponseCache
+from app.model_client import ModelClient
+from app.schemas import PlaceCandidate
+
+MODEL_OUTPUT = json.dumps(
+    {
+        "text": "부산 일정 {완성}",
+        "travelSchedule": [
+            {"day": "Day 1", "date": "2026-03-01", "plan": [{"id": 1, "description": "바다 \"산책\" }", "activity": ""}]},
+            # 99는 후보에 없는 id
+            {"day": "Day 2", "date": "2026-03-02", "plan": [{"id": 2, "description": "", "activity": ""}, {"id": 99, "description": "", "activity": ""}]},
+        ],
+    },
+    ensure_ascii=False,
+)
+
+PLACES = [
+    PlaceCandidate(title="해운대해수욕장", mapy=35.15, mapx=129.16, firstimage="a.jpg"),
+    PlaceCandidate(title="감천문화마을", mapy=35.09, mapx=129.01, firstimage="b.jpg"),
+]
+
+
+def _chunks(text, size=7):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+class ArrayItemStreamParserTests(unittest.TestCase):
+    def test_items_are_emitted_as_soon_as_closed(self):
+        parser = ArrayItemStreamParser("travelSchedule")
+        emitted = []
+        day1_end = MODEL_OUTPUT.index('"Day 2"')
+        for i, chunk in enumerate(_chunks("```json\n" + MODEL_OUTPUT + "\n```", size=1)):
+            items = parser.feed(chunk)
+            if items:
+                emitted.append((i, items))
+
+        self.assertEqual([len(items) for _, items in emitted], [1, 1])
+        # 첫 day는 두 번째 day가 시작되기 전에 나와야 함
+        self.assertLess(emitted[0][0], day1_end + len("```json\n"))
+        self.assertEqual(emitted[0][1][0]["plan"][0]["description"], '바다 "산책" }')
+        self.assertTrue(parser.done)
+
+    def test_ignores_same_key_nested_or_in_strings(self):
+        parser = ArrayItemStreamParser("travelSchedule")
+        text = '{"text": "travelSchedule: [", "meta": {"travelSchedule": [{"x": 1}]}, "travelSchedule": [{"y": 2}]}'
+        self.assertEqual(parser.feed(text), [{"y": 2}])
+
+
+class StreamPlanTests(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.cache = LLMResponseCache(os.path.join(tmp.name, "llm.sqlite3"), ttl=60)
+        patchers = [
+            patch.object(ai, "get_llm_cache", return_value=self.cache),
+            patch.dict(os.environ, {"OPENAI_API_KEY": "x"}),
+        ]
+        for p in patchers:
+            p.start()
+            self.addCleanup(p.stop)
+
+    def _stream(self, **kwargs):
+        return list(
+            ai.stream_plan_from_front(
+                user_input="",
+                date_str="2026-03-01~2026-03-02",
+                region="부산",
+                travel_type="관광지",
+                transportation="",
+                places=PLACES,
+                **kwargs,
+            )
+        )
+
+    def test_days_are_cleaned_and_final_matches_non_streaming(self):
+        with patch.object(ai, "_stream_model_text", return_value=iter(_chunks(MODEL_OUTPUT))):
+            events = self._stream()
+
+        self.assertEqual([e for e, _ in events], ["model_started", "day", "day", "done"])
+        day2 = events[2][1]["day"]
+        self.assertEqual([p["place"] for p in day2["plan"]], ["감천문화마을"])
+        self.assertEqual(day2["plan"][0]["latitude"], 35.09)
+
+        with patch.object(ai, "_request_model_json", return_value=json.loads(MODEL_OUTPUT)):
+            expected = ai.build_plan_from_front(
+                user_input="",
+                date_str="2026-03-01~2026-03-02",
+                region="부산",
+                travel_type="관광지",
+                transportation="",
+                places=PLACES,
+                use_cache=False,
+            )
+        self.assertEqual(events[-1][1], expected.model_dump())
+
+        # 스트림 결과도 캐시되어 다음 요청은 모델 호출 없이 바로 응답
+        with patch.object(ai, "_stream_model_text", side_effect=AssertionError("should be cached")):
+            cached = self._stream()
+        self.assertEqual(cached[0], ("model_started", {"cached": True, "parallelDays": 0}))
+        self.assertEqual(cached[-1], events[-1])
+
+    def test_broken_stream_falls_back_to_single_request(self):
+        with patch.object(ai, "_stream_model_text", return_value=iter(["not json"])), patch.object(
+            ai, "_request_model_json", return_value=json.loads(MODEL_OUTPUT)
+        ) as request:
+            events = self._stream(use_cache=False)
+        request.assert_called_once()
+        self.assertEqual(events[-1][0], "done")
+        self.assertEqual(len(events[-1][1]["travelSchedule"]), 2)
+
+
+    def test_hung_stream_falls_back_to_local_plan_at_budget(self):
+        async def create(**kwargs):
+            await asyncio.sleep(5)
+
+        client = ModelClient("test-stream-budget", api_key="x", deadline=30, hedge=False)
+        client._ensure_loop()
+        client._client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+        started = time.perf_counter()
+        with patch.object(ai, "client", client), patch.object(ai, "PLAN_MODEL_BUDGET_SECONDS", 0.2), patch.object(
+            ai, "_request_model_json", side_effect=AssertionError("no retry after budget")
+        ):
+            events = self._stream(use_cache=False)
+        self.assertLess(time.perf_counter() - started, 1.0)
+        self.assertEqual(events[-1][0], "done")
+        self.assertIn("기본 일정", events[-1][1]["text"])
+        self.assertEqual(len(events[-1][1]["travelSchedule"]), 2)
+        self.assertEqual(client.stats()["in_flight"], 0)
+
+class PlanStreamEndpointTests(unittest.TestCase):
+    def test_sse_events_and_first_day_metric(self):
+        def fake_stream(**kwargs):
+            yield "model_started", {"cached": False}
+            yield "day", {"index": 0, "day": {"day": "Day 1", "date": "", "plan": []}}
+            yield "done", {"text": "ok", "travelSchedule": []}
+
+        before = main._stream_first_day_latency.stats()["count"]
+        with patch.object(main, "_collect_places", return_value=PLACES), patch.object(
+            main, "stream_plan_from_front", side_effect=fake_stream
+        ):
+            with TestClient(main.app) as client:
+                resp = client.post("/v1/plan/stream", json={"region": "부산", "date": "2026-03-01"})
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp.headers["content-type"].startswith("text/event-stream"))
+        events = [block.split("\n")[0].removeprefix("event: ") for block in resp.text.strip().split("\n\n")]
+        self.assertEqual(events, ["candidates", "model_started", "day", "done"])
+        self.assertEqual(main._stream_first_day_latency.stats()["count"], before + 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+import asyncio
+import os
+import time
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from app import ai
+from app.model_client import ModelClient
+from app.planner import local_planner_stats, plan_locally
+from app.schemas import PlaceCandidate
+
+
+def _places(n=40, lodging=4):
+    return [
+        PlaceCandidate(
+            title=f"장소{i}",
+            firstimage="" if i % 5 == 4 else "x.jpg",
+            mapy=35.0 + (i % 8) * 0.02,
+            mapx=129.0 + (i // 8) * 0.02,
+            contenttypeid="32" if i < lodging else ("39" if i % 3 == 0 else "12"),
+        )
+        for i in range(n)
+    ]
+
+
+DATES = ["2026-03-01", "2026-03-02", "2026-03-03"]
+
+
+class PlanLocallyTests(unittest.TestCase):
+    def test_days_follow_pace_with_a_lodging_per_night_and_no_repeats(self):
+        result = plan_locally(_places(), DATES, pace="보통", region="부산")
+
+        self.assertEqual([d.date for d in result.travelSchedule], DATES)
+        titles = [p.place for d in result.travelSchedule for p in d.plan]
+        self.assertEqual(len(titles), len(set(titles)))
+        for i, day in enumerate(result.travelSchedule):
+            self.assertEqual(len(day.plan), 4)
+            self.assertEqual([p.order for p in day.plan], [1, 2, 3, 4])
+            lodging = [p for p in day.plan if p.activity == "숙박"]
+            if i < len(DATES) - 1:
+                self.assertEqual(len(lodging), 1)
+                self.assertIs(day.plan[-1], lodging[0])
+            else:
+                self.assertEqual(lodging, [])
+        first = result.travelSchedule[0].plan[0]
+        self.assertTrue(first.description.startswith(first.place))
+        self.assertIn("부산", result.text)
+
+    def test_route_visits_nearest_next(self):
+        places = [
+            PlaceCandidate(title=t, firstimage="x.jpg", mapy=35.0, mapx=129.0 + x, contenttypeid="12")
+            for t, x in [("A", 0.0), ("C", 0.2), ("B", 0.1)]
+        ]
+        result = plan_locally(places, [""], pace="여유롭게")
+        self.assertEqual([p.place for p in result.travelSchedule[0].plan], ["A", "B", "C"])
+
+    def test_handles_few_or_no_candidates(self):
+        self.assertEqual(len(plan_locally([], DATES).travelSchedule), 3)
+        result = plan_locally(_places(n=2, lodging=0), DATES)
+        self.assertEqual(sum(len(d.plan) for d in result.travelSchedule), 2)
+
+
+class PlanFallbackTests(unittest.TestCase):
+    def setUp(self):
+        p = patch.dict(os.environ, {"OPENAI_API_KEY": "x"})
+        p.start()
+        self.addCleanup(p.stop)
+
+    def _build(self, **kwargs):
+        kwargs.setdefault("places", _places())
+        return ai.build_plan_from_front(
+            user_input="",
+            date_str="2026-03-01~2026-03-02",
+            region="부산",
+            travel_type="관광지",
+            transportation="",
+            pace="보통",
+            use_cache=False,
+            **kwargs,
+        )
+
+    def test_model_failure_returns_local_plan(self):
+        before = local_planner_stats().get("fallback", 0)
+        with patch.object(ai, "_call_model_json", side_effect=RuntimeError("rate limited")):
+            result = self._build()
+        self.assertEqual(len(result.travelSchedule), 2)
+        self.assertTrue(all(d.plan for d in result.travelSchedule))
+        self.assertEqual(local_planner_stats()["fallback"], before + 1)
+
+    def test_slow_model_is_cut_off_by_budget(self):
+        def slow(*args, **kwargs):
+            time.sleep(0.5)
+            return {"text": "", "travelSchedule": []}
+
+        started = time.perf_counter()
+        with patch.object(ai, "_call_model_json", side_effect=slow), patch.object(ai, "PLAN_MODEL_BUDGET_SECONDS", 0.05):
+            result = self._build()
+        self.assertLess(time.perf_counter() - started, 0.4)
+        self.assertTrue(result.travelSchedule[0].plan)
+
+    def test_model_call_is_cancelled_when_budget_runs_out(self):
+        # 예산이 지나 로컬 일정으로 응답하면 모델 호출도 같이 끝남 (스레드/동시 호출 자리를 계속 잡지 않음)
+        active = []
+
+        async def create(**kwargs):
+            active.append(1)
+            try:
+                await asyncio.sleep(2)
+            finally:
+                active.pop()
+
+        client = ModelClient("test-plan-budget", api_key="x", deadline=5, hedge=False)
+        client._ensure_loop()
+        client._client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+        started = time.perf_counter()
+        with patch.object(ai, "client", client), patch.object(ai, "PLAN_MODEL_BUDGET_SECONDS", 0.1):
+            result = self._build()
+        self.assertLess(time.perf_counter() - started, 0.5)
+        self.assertTrue(result.travelSchedule[0].plan)
+        time.sleep(0.1)
+        self.assertEqual((active, client.stats()["in_flight"]), ([], 0))
+        self.assertEqual(client.stats()["deadline_exceeded"], 1)
+
+    def test_fast_mode_skips_model_and_api_key(self):
+        with patch.object(ai, "_call_model_json", side_effect=AssertionError("no model call")), patch.dict(
+            os.environ, {"OPENAI_API_KEY": ""}
+        ):
+            result = self._build(fast=True)
+        self.assertEqual(len(result.travelSchedule), 2)
+
+    def test_edit_mode_failure_keeps_current_schedule(self):
+        current = [{"day": "Day 1", "date": "2026-03-01", "plan": [{"order": 1, "place": "장소10"}]}]
+        with patch.object(ai, "_call_model_json", side_effect=RuntimeError("down")):
+            result = self._build(current_schedule=current)
+        self.assertEqual(result.travelSchedule[0].plan[0].place, "장소10")
+
+
+if __name__ == "__main__":
+    unittest.main()
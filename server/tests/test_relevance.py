@@ -0,0 +1,83 @@
+import unittest
+from unittest.mock import patch
+
+from app import ai, relevance
+from app.relevance import RelevanceIndex, get_index, relevance_query, terms
+from app.schemas import PlaceCandidate
+
+
+def _place(title, addr="", ctid="12", image="x.jpg", i=0):
+    return PlaceCandidate(title=title, addr1=addr, contenttypeid=ctid, firstimage=image, mapy=35.1, mapx=129.0 + i * 0.001, contentid=title)
+
+
+PLACES = [
+    _place("국제시장", "부산광역시 중구 신창동", "38", i=0),
+    _place("해운대해수욕장", "부산광역시 해운대구 우동", i=1),
+    _place("부산시립미술관", "부산광역시 해운대구 APEC로", "14", i=2),
+    _place("광안리해수욕장", "부산광역시 수영구 광안해변로", i=3),
+    _place("해운대 그랜드호텔", "부산광역시 해운대구 해운대해변로", "32", i=4),
+]
+
+
+class TermsTests(unittest.TestCase):
+    def test_bigrams_survive_particles_and_spacing(self):
+        self.assertIn("바다", terms("바다가 보이는 카페"))
+        self.assertEqual(terms("A 해변"), ["a", "해변"])
+
+
+class RelevanceIndexTests(unittest.TestCase):
+    def test_ranks_matching_titles_first(self):
+        index = RelevanceIndex(PLACES)
+        top = [PLACES[i].title for i in index.top_k("해수욕장에서 놀고 싶어", 2)]
+        self.assertEqual(top, ["해운대해수욕장", "광안리해수욕장"])
+        # 유형 이름(travelType)으로도 맞음
+        self.assertEqual(PLACES[index.top_k("문화시설", 1)[0]].title, "부산시립미술관")
+
+    def test_no_match_keeps_original_order(self):
+        index = RelevanceIndex(PLACES)
+        self.assertEqual(index.top_k("zzz", 5), [0, 1, 2, 3, 4])
+
+    def test_index_is_reused_for_the_same_candidate_set(self):
+        before = relevance.relevance_stats()
+        first = get_index(list(PLACES))
+        again = get_index(list(PLACES))
+        other = get_index(PLACES[:3])
+        self.assertIs(first, again)
+        self.assertIsNot(first, other)
+        after = relevance.relevance_stats()
+        self.assertEqual(after["hits"] - before["hits"], 1)
+
+    def test_companion_terms_expand_query(self):
+        self.assertIn("야경", relevance_query(["관광지"], "커플"))
+
+
+class BuildCandidatesTests(unittest.TestCase):
+    def test_relevant_candidates_come_first_and_limit_applies(self):
+        out = ai._build_candidates(PLACES, limit=2, query="미술관 전시")
+        self.assertEqual([c["title"] for c in out][0], "부산시립미술관")
+        self.assertEqual(len(out), 2)
+
+    def test_lodging_is_reserved_for_nights(self):
+        out = ai._build_candidates(PLACES, limit=3, query="해수욕장", min_lodging=1)
+        self.assertEqual(len(out), 3)
+        self.assertEqual(sum(c["lodging"] for c in out), 1)
+        self.assertEqual([c["title"] for c in out][:2], ["해운대해수욕장", "광안리해수욕장"])
+
+    def test_focus_does_not_reorder_the_list_and_fills_extra_slots(self):
+        places = PLACES + [_place(f"공원{i}", i=5 + i) for i in range(3)]
+        plain = ai._build_candidates(places, limit=4, query="해수욕장")
+        focused = ai._build_candidates(places, limit=4, query="해수욕장", focus="미술관 전시")
+        # limit의 1/4(1자리)은 focus 자리라 앞 목록은 3개, focus는 앞 목록을 바꾸지 않음
+        self.assertEqual([c["title"] for c in focused][:3], [c["title"] for c in plain][:3])
+        self.assertEqual(len(plain), 3)
+        self.assertEqual([c["title"] for c in focused][3], "부산시립미술관")
+        self.assertEqual(ai._relevant_ids(focused), [4])
+
+    def test_ranking_can_be_disabled(self):
+        with patch.object(ai, "RELEVANCE_RANKING", False):
+            out = ai._build_candidates(PLACES, limit=5, query="미술관")
+        self.assertEqual([c["title"] for c in out], [p.title for p in PLACES])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import itertools
+import random
+import unittest
+
+import numpy as np
+
+from app import ai
+from app.geo import haversine_matrix
+from app.route import insertion_costs, optimize_day_routes, path_length, route_order
+
+
+def _item(place, lat, lng):
+    return {"order": 0, "place": place, "latitude": lat, "longitude": lng}
+
+
+def _matrix(points):
+    return haversine_matrix(np.array([p[0] for p in points]), np.array([p[1] for p in points]))
+
+
+class RouteOrderTests(unittest.TestCase):
+    def test_points_on_a_line_are_visited_in_line_order(self):
+        points = [(35.0, 129.0 + x) for x in (0.3, 0.0, 0.2, 0.1)]
+        order = route_order(_matrix(points))
+        self.assertIn(order, ([1, 3, 2, 0], [0, 2, 3, 1]))
+
+    def test_matches_brute_force_on_small_days(self):
+        rng = random.Random(7)
+        for _ in range(20):
+            points = [(35.0 + rng.random() * 0.2, 129.0 + rng.random() * 0.2) for _ in range(6)]
+            dist = _matrix(points)
+            best = min(path_length(dist, p) for p in itertools.permutations(range(6)))
+            self.assertLessEqual(path_length(dist, route_order(dist)), best * 1.1)
+
+    def test_fixed_end_stays_last(self):
+        points = [(35.0, 129.0), (35.0, 129.2), (35.0, 129.1), (35.0, 129.05)]
+        order = route_order(_matrix(points), end=0)
+        self.assertEqual(order[-1], 0)
+        self.assertEqual(order, [1, 2, 3, 0])
+
+    def test_insertion_cost_is_zero_on_the_route(self):
+        costs = insertion_costs([35.0, 35.0], [129.0, 129.2], np.array([35.0, 35.0]), np.array([129.1, 129.4]))
+        self.assertAlmostEqual(costs[0], 0.0, places=3)
+        self.assertGreater(costs[1], 15)
+
+
+class OptimizeDayRoutesTests(unittest.TestCase):
+    def test_lodging_last_unlocated_before_it_and_distance_reported(self):
+        day = {
+            "plan": [
+                _item("숙소", 35.0, 129.05),
+                _item("C", 35.0, 129.2),
+                _item("좌표없음", 0.0, 0.0),
+                _item("A", 35.0, 129.0),
+                _item("B", 35.0, 129.1),
+            ]
+        }
+        optimize_day_routes([day], lodging_titles={"숙소"})
+        # C -> B -> A로 돌면 숙소(A와 B 사이)까지 가장 짧음
+        self.assertEqual([p["place"] for p in day["plan"]], ["C", "B", "A", "좌표없음", "숙소"])
+        self.assertAlmostEqual(day["distanceKm"], 9.1 * 2 + 4.6, delta=0.3)
+
+    def test_reorder_false_only_measures(self):
+        day = {"plan": [_item("C", 35.0, 129.2), _item("A", 35.0, 129.0), _item("B", 35.0, 129.1)]}
+        optimize_day_routes([day], reorder=False)
+        self.assertEqual([p["place"] for p in day["plan"]], ["C", "A", "B"])
+        self.assertGreater(day["distanceKm"], 27)
+
+    def test_budget_drops_outliers_down_to_min_stops(self):
+        plans = [_item("A", 35.0, 129.0), _item("B", 35.0, 129.01), _item("C", 35.0, 129.02), _item("먼곳", 35.5, 129.5)]
+        day = {"plan": list(plans)}
+        optimize_day_routes([day], budget_km=15.0, min_stops=3)
+        self.assertEqual(sorted(p["place"] for p in day["plan"]), ["A", "B", "C"])
+
+        day = {"plan": list(plans)}
+        optimize_day_routes([day], budget_km=0.5, min_stops=3)
+        self.assertEqual(len(day["plan"]), 3)
+
+
+class PaceFillTests(unittest.TestCase):
+    def test_fill_ins_prefer_places_near_the_day(self):
+        candidates = [
+            {"title": title, "latitude": 35.0, "longitude": lng}
+            for title, lng in [("먼곳", 129.9), ("기존", 129.0), ("가까운곳", 129.01), ("중간", 129.3)]
+        ]
+        place_map = {c["title"]: {"latitude": c["latitude"], "longitude": c["longitude"]} for c in candidates}
+        schedule = [{"day": "Day 1", "date": "", "plan": [_item("기존", 35.0, 129.0)]}]
+        result = ai._enforce_pace_target(schedule=schedule, pace="보통", candidates=candidates, place_map=place_map)
+        self.assertEqual([p["place"] for p in result[0]["plan"]], ["기존", "가까운곳", "중간"])
+
+
+if __name__ == "__main__":
+    unittest.main()
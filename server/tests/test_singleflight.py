@@ -0,0 +1,48 @@
+import threading
+import time
+import unittest
+
+from app.singleflight import SingleFlight
+
+
+class SingleFlightTests(unittest.TestCase):
+    def test_concurrent_callers_share_one_execution(self):
+        flight = SingleFlight("test-share")
+        calls = []
+        started = threading.Event()
+
+        def slow():
+            calls.append(1)
+            started.set()
+            time.sleep(0.2)
+            return {"items": [1, 2]}
+
+        results = []
+        leader = threading.Thread(target=lambda: results.append(flight.do("k", slow)))
+        leader.start()
+        started.wait()
+        followers = [threading.Thread(target=lambda: results.append(flight.do("k", slow))) for _ in range(4)]
+        for t in followers:
+            t.start()
+        for t in [leader] + followers:
+            t.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [{"items": [1, 2]}] * 5)
+        self.assertEqual(flight.stats()["shared"], 4)
+        self.assertEqual(flight.stats()["in_flight"], 0)
+
+    def test_error_is_propagated_and_next_call_runs_again(self):
+        flight = SingleFlight("test-error")
+
+        def boom():
+            raise RuntimeError("upstream")
+
+        with self.assertRaises(RuntimeError):
+            flight.do("k", boom)
+        self.assertEqual(flight.do("k", lambda: 1), 1)
+        self.assertEqual(flight.stats()["executed"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,148 @@
+import random
+import re
+import unittest
+
+from app import ai
+from app.schemas import PlaceCandidate
+from app.title_index import PlaceTermIndex, SubstringIndex, TitleResolver, get_index
+
+SYLLABLES = "해운대광안리시장 "
+
+
+def _random_text(rng, max_len):
+    return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(0, max_len)))
+
+
+# ---- 색인 도입 전 선형 탐색 (결과 비교 기준) ----
+def _normalize(s):
+    return re.sub(r"\s+", "", (s or "").lower())
+
+
+def _linear_resolve(raw_title, allowed_titles):
+    title = (raw_title or "").strip()
+    if not title:
+        return ""
+    if title in allowed_titles:
+        return title
+    normalized = title.replace(" ", "")
+    for t in allowed_titles:
+        tn = t.replace(" ", "")
+        if normalized == tn or normalized in tn or tn in normalized:
+            return t
+    return ""
+
+
+def _linear_variants(term):
+    term_n = _normalize(term)
+    variants = [term_n]
+    if term_n.endswith("지역") and len(term_n) > 2:
+        variants.append(term_n[:-2])
+    return variants
+
+
+def _linear_match(term, place, address):
+    place_n, addr_n = _normalize(place), _normalize(address)
+    for v in _linear_variants(term):
+        if v and (v in place_n or place_n in v or (addr_n and v in addr_n)):
+            return True
+    return False
+
+
+def _linear_pick(term, places):
+    ranked = []
+    for p in places:
+        if not (p.title or "").strip():
+            continue
+        title_n, addr_n = p.title_key, _normalize(p.addr1)
+        score = 0
+        for v in _linear_variants(term):
+            if not v:
+                continue
+            if v == title_n:
+                score = max(score, 100)
+            elif v in title_n or title_n in v:
+                score = max(score, 80)
+            elif addr_n and v in addr_n:
+                score = max(score, 60)
+        if score > 0:
+            ranked.append((score, 1 if p.firstimage else 0, p))
+    ranked.sort(key=lambda x: (x[0], x[1]), reverse=True)
+    return ranked[0][2] if ranked else None
+
+
+class SubstringIndexTests(unittest.TestCase):
+    def test_matches_brute_force(self):
+        rng = random.Random(7)
+        for _ in range(300):
+            keys = [_random_text(rng, 6).replace(" ", "") for _ in range(rng.randint(0, 12))]
+            if rng.random() < 0.3:
+                keys += keys  # 같은 키 반복
+            index = SubstringIndex(keys)
+            for _ in range(20):
+                q = _random_text(rng, 8).replace(" ", "")
+                containing = [i for i, k in enumerate(keys) if q in k]
+                within = [i for i, k in enumerate(keys) if k in q]
+                self.assertEqual(index.all_containing(q), containing, (keys, q))
+                self.assertEqual(index.first_containing(q), containing[0] if containing else None)
+                self.assertEqual(index.all_within(q), within, (keys, q))
+                self.assertEqual(index.first_within(q), within[0] if within else None)
+                self.assertEqual(index.first_equal(q), keys.index(q) if q in keys else None)
+
+    def test_index_is_reused_for_the_same_keys(self):
+        self.assertIs(get_index(["가나", "다라"]), get_index(("가나", "다라")))
+
+
+class TitleResolverTests(unittest.TestCase):
+    def test_same_result_as_linear_scan(self):
+        rng = random.Random(11)
+        for _ in range(200):
+            titles = list(dict.fromkeys(_random_text(rng, 7).strip() or "해" for _ in range(rng.randint(1, 10))))
+            resolver = TitleResolver(titles)
+            for _ in range(20):
+                raw = _random_text(rng, 9)
+                self.assertEqual(resolver.resolve(raw), _linear_resolve(raw, titles), (titles, raw))
+
+    def test_prefers_earlier_title(self):
+        resolver = TitleResolver(["해운대 해수욕장", "해운대시장"])
+        self.assertEqual(resolver.resolve("해운대"), "해운대 해수욕장")
+        self.assertEqual(resolver.resolve("부산 해운대시장 먹거리"), "해운대시장")
+        self.assertEqual(resolver.resolve("광안리"), "")
+
+
+class TermMatchingTests(unittest.TestCase):
+    def _places(self, rng, n):
+        return [
+            PlaceCandidate(
+                title=_random_text(rng, 6) or " ",
+                addr1=_random_text(rng, 10),
+                firstimage=rng.choice(["", "x.jpg"]),
+                mapy=35.1,
+                mapx=129.0,
+                contentid=str(i),
+            )
+            for i in range(n)
+        ]
+
+    def test_pick_same_as_linear_scan(self):
+        rng = random.Random(5)
+        for _ in range(150):
+            places = self._places(rng, rng.randint(1, 12))
+            index = PlaceTermIndex(places)
+            for _ in range(10):
+                term = _random_text(rng, 5) + rng.choice(["", "지역"])
+                self.assertIs(index.best(ai._term_variants(term)), _linear_pick(term, places), term)
+
+    def test_remove_same_as_linear_scan(self):
+        rng = random.Random(13)
+        for _ in range(150):
+            items = [{"place": _random_text(rng, 6), "address": _random_text(rng, 10)} for _ in range(rng.randint(1, 8))]
+            places = SubstringIndex([_normalize(item["place"]) for item in items])
+            addresses = SubstringIndex([_normalize(item["address"]) for item in items])
+            for _ in range(10):
+                term = _random_text(rng, 4) + rng.choice(["", "지역"])
+                expected = {i for i, item in enumerate(items) if _linear_match(term, item["place"], item["address"])}
+                self.assertEqual(ai._items_matching_term(term, places, addresses), expected, (items, term))
+
+
+if __name__ == "__main__":
+    unittest.main()
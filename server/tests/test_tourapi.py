@@ -0,0 +1,146 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from app import tourapi
+from app.breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+from app.cache import SQLiteTTLCache
+
+
+def _response(status=200, payload=None, text=""):
+    r = MagicMock()
+    r.status_code = status
+    r.headers = {"content-type": "application/json" if payload is not None else "text/xml"}
+    r.text = text
+    r.content = (json.dumps(payload) if payload is not None else text).encode("utf-8")
+    return r
+
+
+def _payload(*items):
+    return {"response": {"body": {"items": {"item": list(items)}, "totalCount": len(items)}}}
+
+
+class TourAPIClientTests(unittest.TestCase):
+    def setUp(self):
+        patchers = [
+            patch.object(tourapi, "TOURAPI_KEY", "test-key"),
+            patch.object(tourapi, "CACHE_ENABLED", False),
+            patch("app.tourapi.time.sleep"),
+            patch.object(tourapi, "_breaker", CircuitBreaker("tourapi-test", failure_threshold=100)),
+        ]
+        for p in patchers:
+            p.start()
+            self.addCleanup(p.stop)
+        self.session = MagicMock()
+        session_patch = patch.object(tourapi, "_get_session", return_value=self.session)
+        session_patch.start()
+        self.addCleanup(session_patch.stop)
+
+    def test_retries_5xx_and_xml_error_page_then_succeeds(self):
+        item = {"title": "해운대해수욕장", "mapy": "35.15", "mapx": "129.16", "contentid": 1}
+        self.session.get.side_effect = [
+            _response(status=503, text="Service Unavailable"),
+            _response(text="<OpenAPI_ServiceResponse>SERVICE ERROR</OpenAPI_ServiceResponse>"),
+            _response(payload=_payload(item)),
+        ]
+
+        places = tourapi.area_based_list2(area_code=6, content_type_id=12)
+
+        self.assertEqual([p.title for p in places], ["해운대해수욕장"])
+        self.assertEqual(self.session.get.call_count, 3)
+        _, kwargs = self.session.get.call_args
+        self.assertEqual(kwargs["timeout"], (tourapi.CONNECT_TIMEOUT, tourapi.READ_TIMEOUT))
+
+    def test_persistent_xml_error_returns_empty_list(self):
+        self.session.get.return_value = _response(text="<xml>LIMITED_NUMBER_OF_SERVICE_REQUESTS</xml>")
+        self.assertEqual(tourapi.area_based_list2(area_code=6), [])
+        self.assertEqual(self.session.get.call_count, tourapi.MAX_RETRIES + 1)
+
+    def test_persistent_5xx_raises(self):
+        self.session.get.return_value = _response(status=502, text="Bad Gateway")
+        with self.assertRaises(tourapi.requests.HTTPError):
+            tourapi.area_based_list2(area_code=6)
+
+
+class CircuitBreakerTests(unittest.TestCase):
+    def test_trips_on_consecutive_failures_and_recovers_through_half_open_probe(self):
+        breaker = CircuitBreaker("test-trip", failure_threshold=2, recovery_timeout=0.0)
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CLOSED)
+        breaker.record_success(0.01)
+        breaker.record_failure()
+        breaker.record_failure()
+        self.assertEqual(breaker.state, OPEN)
+
+        breaker.before_call()  # recovery_timeout 경과 -> half-open 시험 호출 1개 허용
+        self.assertEqual(breaker.state, HALF_OPEN)
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_call()
+        breaker.record_success(0.01)
+        self.assertEqual(breaker.state, CLOSED)
+        self.assertEqual(breaker.stats()["transitions"], {"closed->open": 1, "open->half_open": 1, "half_open->closed": 1})
+
+    def test_other_request_errors_release_half_open_probe(self):
+        breaker = CircuitBreaker("test-probe", failure_threshold=1, recovery_timeout=0.0)
+        breaker.record_failure()
+        item = {"title": "해운대해수욕장", "mapy": "35.15", "mapx": "129.16", "contentid": 1}
+        session = MagicMock()
+        session.get.side_effect = [tourapi.requests.TooManyRedirects("loop"), _response(payload=_payload(item))]
+        with patch.object(tourapi, "TOURAPI_KEY", "k"), patch.object(tourapi, "CACHE_ENABLED", False), patch(
+            "app.tourapi.time.sleep"
+        ), patch.object(tourapi, "_breaker", breaker), patch.object(tourapi, "_get_session", return_value=session):
+            places = tourapi.area_based_list2(area_code=6)
+
+        self.assertEqual([p.title for p in places], ["해운대해수욕장"])
+        self.assertEqual(breaker.state, CLOSED)
+        self.assertEqual(breaker.stats()["state_value"], 0)
+
+    def test_slow_responses_count_as_failures(self):
+        breaker = CircuitBreaker("test-slow", failure_threshold=2, slow_call_seconds=1.0, recovery_timeout=60)
+        breaker.record_success(2.0)
+        breaker.record_success(3.0)
+        self.assertEqual(breaker.state, OPEN)
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_call()
+
+    def test_open_circuit_serves_expired_cache_entry(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = SQLiteTTLCache(os.path.join(tmpdir, "c.sqlite3"), namespace="t", ttl=0, stale_ttl=0)
+            open_breaker = CircuitBreaker("test-open", failure_threshold=1, recovery_timeout=60)
+            open_breaker.record_failure()
+            row = {"title": "해운대", "mapy": 35.1, "mapx": 129.1}
+
+            with patch.object(tourapi, "TOURAPI_KEY", "k"), patch.object(tourapi, "_get_cache", return_value=cache), patch.object(
+                tourapi, "_breaker", open_breaker
+            ), patch.object(tourapi, "_get_session") as session:
+                key = tourapi._page_cache_key(tourapi._build_params(area_code=6))
+                cache.set(key, {"items": [row], "totalCount": 1})
+                places, total = tourapi.area_based_list2_page(area_code=6)
+
+            session.return_value.get.assert_not_called()
+            self.assertEqual([p.title for p in places], ["해운대"])
+            self.assertEqual(total, 1)
+
+    def test_entries_in_the_old_page_format_are_not_read(self):
+        # 형식 1(행 list) 항목이 남아 있어도 빈 목록으로 읽지 않고 새로 받음
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = SQLiteTTLCache(os.path.join(tmpdir, "c.sqlite3"), namespace="t", ttl=3600)
+            with patch.object(tourapi, "TOURAPI_KEY", "k"):
+                params = tourapi._build_params(area_code=6)
+            old_key = tourapi.make_cache_key({k: v for k, v in params.items() if k != "serviceKey"})
+            cache.set(old_key, [{"title": "예전", "mapy": 35.1, "mapx": 129.1}])
+            page = {"items": [{"title": "해운대", "mapy": 35.1, "mapx": 129.1}], "totalCount": 1}
+
+            with patch.object(tourapi, "TOURAPI_KEY", "k"), patch.object(tourapi, "_get_cache", return_value=cache), patch.object(
+                tourapi, "_fetch_page", return_value=page
+            ) as fetch:
+                places, total = tourapi.area_based_list2_page(area_code=6)
+
+            fetch.assert_called_once()
+            self.assertEqual(([p.title for p in places], total), (["해운대"], 1))
+
+
+if __name__ == "__main__":
+    unittest.main()